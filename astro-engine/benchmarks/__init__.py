@@ -0,0 +1,3 @@
+"""
+Benchmark suite for the astro-engine hot paths (see benchmarks/run.py)
+"""
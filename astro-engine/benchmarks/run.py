@@ -0,0 +1,501 @@
+"""
+Benchmark suite for the astro-engine hot paths
+
+Every benchmark runs over the same seeded corpus of birth data, so two runs
+of the same code measure the same work. Each benchmark makes `repeats`
+timed passes over its inputs (after one untimed warm-up pass) and records
+the per-call time of every pass; the median pass is what gets compared.
+
+Results are written as JSON and can be checked against a stored baseline:
+any benchmark whose median is more than `threshold` slower than the
+baseline counts as a regression and the run exits with status 1.
+
+Usage (from astro-engine/):
+    python -m benchmarks.run --output benchmarks/results/latest.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --threshold 0.15
+    python -m benchmarks.run --only calc_lagna,post_chart --repeats 10
+
+POST /chart goes through the real app via an in-process ASGI client, worker
+pool included; set POOL_KIND=thread to leave out process hand-off. Baselines
+are only comparable between runs on the same machine and settings.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from contextlib import ExitStack
+from datetime import date, datetime, time as dtime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from schemas.birth_data import BirthData, ChartData
+from core import calculator
+from core.ashtakavarga import calc_ashtakavarga
+from core.chart_builder import birth_julian_day, build_chart
+from core.dasha import calc_dasha_balance, get_current_dasha, get_dasha_sequence
+from core.dasha_engine import current_periods, vimshottari_timeline
+from core.nakshatra import get_nakshatra, nakshatra_at, pada_indices
+from core.yoga_rules import detect_yogas
+
+BENCHMARK_SEED = 1994
+CORPUS_SIZE = 200
+DEFAULT_REPEATS = 5
+DEFAULT_THRESHOLD = 0.20
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results', 'latest.json')
+
+# Whole PDF renders are slow; only this many corpus charts get one
+PDF_REPORTS = 10
+
+# Longitudes per call of the vectorized nakshatra lookup
+VECTOR_LONGITUDES = 1_000_000
+
+# Sections in the long Markdown report (about 100 A4 pages)
+LONG_REPORT_SECTIONS = 95
+
+CORPUS_TIMEZONES = (
+    'Asia/Kolkata', 'UTC', 'America/New_York', 'Europe/London',
+    'Australia/Sydney', 'Asia/Tokyo', 'America/Los_Angeles', 'Africa/Nairobi',
+)
+
+
+def make_corpus(size: int = CORPUS_SIZE, seed: int = BENCHMARK_SEED) -> List[BirthData]:
+    """
+    Deterministic birth data spread over 1900-2099 and populated latitudes
+
+    Args:
+        size: Number of profiles
+        seed: Random seed
+
+    Returns:
+        List of BirthData (same list for the same size and seed)
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(size):
+        corpus.append(BirthData(
+            name=f"Benchmark {index}",
+            birth_date=date(rng.randint(1900, 2099), rng.randint(1, 12), rng.randint(1, 28)),
+            birth_time=dtime(rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59)),
+            latitude=round(rng.uniform(-55.0, 65.0), 4),
+            longitude=round(rng.uniform(-180.0, 180.0), 4),
+            timezone=rng.choice(CORPUS_TIMEZONES),
+        ))
+    return corpus
+
+
+def _report_markdown(chart: ChartData) -> str:
+    """Report text in the markdown subset the PDF renderer understands"""
+    lines = [f"# Chart of {chart.birth_info.name}", ""]
+    lines.append(f"Lagna in {chart.lagna.sign}, nakshatra {chart.lagna.nakshatra}.")
+    lines += ["", "## Planets"]
+    for planet in chart.planets:
+        lines.append(f"- {planet.name} in {planet.sign} (house {planet.house}, {planet.dignity})")
+    lines += ["", "## Yogas"]
+    for yoga in chart.yogas:
+        lines += [f"## {yoga.name} ({yoga.strength})", yoga.description, ""]
+    return "\n".join(lines)
+
+
+def _long_report_markdown(charts: List[ChartData]) -> str:
+    """LLM-style annual report: emphasis, tables, nested lists, quotes and code"""
+    lines = ["# Annual Forecast", ""]
+    for chart in charts:
+        lines += [
+            f"## {chart.birth_info.name}: **{chart.lagna.sign}** rising", "",
+            f"The lagna falls in *{chart.lagna.nakshatra}*, ruled by **{chart.lagna.nakshatra_lord}**. "
+            f"Ayanamsha is `{chart.ayanamsha:.4f}` and the chart key uses snake_case fields. " * 3, "",
+            "| Planet | Sign | House | Dignity |", "|:--|:--:|--:|:--|",
+        ]
+        lines += [f"| {p.name} | {p.sign} | {p.house} | {p.dignity} |" for p in chart.planets]
+        lines += ["", "### Yogas", ""]
+        for yoga in chart.yogas:
+            lines += [f"- **{yoga.name}** ({yoga.strength})", f"  - {yoga.description}"]
+        lines += ["", "> Results unfold through the dasha periods.", "", "```", *(
+            f"{d.planet:<8} {d.start_date:%Y-%m-%d} {d.end_date:%Y-%m-%d}"
+            for d in chart.dasha_at_birth.periods[:9]
+        ), "```", "", "---", ""]
+    return "\n".join(lines)
+
+
+class BenchmarkContext:
+    """Corpus plus derived inputs shared by several benchmarks, built on first use"""
+
+    def __init__(self, corpus: List[BirthData]):
+        self.corpus = corpus
+        self._stack = ExitStack()
+        self._births: Optional[List[Tuple[datetime, float]]] = None
+        self._charts: Optional[List[ChartData]] = None
+        self._client = None
+
+    @property
+    def births(self) -> List[Tuple[datetime, float]]:
+        """(local birth datetime, Julian Day) per profile"""
+        if self._births is None:
+            self._births = [birth_julian_day(birth_data) for birth_data in self.corpus]
+        return self._births
+
+    @property
+    def charts(self) -> List[ChartData]:
+        """Full chart per profile"""
+        if self._charts is None:
+            self._charts = [build_chart(birth_data) for birth_data in self.corpus]
+        return self._charts
+
+    @property
+    def client(self):
+        """In-process ASGI client with the app's lifespan started"""
+        if self._client is None:
+            from fastapi.testclient import TestClient
+            from main import app
+            self._client = self._stack.enter_context(TestClient(app))
+        return self._client
+
+    def close(self) -> None:
+        self._stack.close()
+
+
+class Benchmark(NamedTuple):
+    name: str
+    # prepare(context) -> (fn, inputs); each timed call is fn(input)
+    prepare: Callable[[BenchmarkContext], Tuple[Callable[[Any], Any], Sequence[Any]]]
+
+
+def _positions(context):
+    return calculator.calc_planetary_positions, [jd for _, jd in context.births]
+
+
+def _lagna(context):
+    inputs = [(jd, b.latitude, b.longitude) for (_, jd), b in zip(context.births, context.corpus)]
+    return lambda args: calculator.calc_lagna(*args), inputs
+
+
+def _nakshatra(context):
+    return get_nakshatra, [p.longitude for chart in context.charts for p in chart.planets]
+
+
+def _nakshatra_at(context):
+    return nakshatra_at, [p.longitude for chart in context.charts for p in chart.planets]
+
+
+def _pada_indices(context):
+    rng = random.Random(BENCHMARK_SEED)
+    longitudes = [rng.uniform(0.0, 360.0) for _ in range(VECTOR_LONGITUDES)]
+    return pada_indices, [np.array(longitudes)]
+
+
+def _dignity(context):
+    inputs = [(p.name, p.longitude) for chart in context.charts for p in chart.planets]
+    return lambda args: calculator.get_planet_dignity(*args), inputs
+
+
+def _moon_balances(context):
+    inputs = []
+    for (birth_datetime, _), chart in zip(context.births, context.charts):
+        moon = next(p for p in chart.planets if p.name == 'Moon')
+        inputs.append((birth_datetime, calc_dasha_balance(moon.longitude, birth_datetime)))
+    return inputs
+
+
+def _dasha_sequence(context):
+    return lambda args: get_dasha_sequence(*args), _moon_balances(context)
+
+
+def _current_dasha(context):
+    rng = random.Random(BENCHMARK_SEED)
+    inputs = []
+    for birth_datetime, balance in _moon_balances(context):
+        sequence = get_dasha_sequence(birth_datetime, balance)
+        inputs.append((sequence, birth_datetime + timedelta(days=rng.uniform(0, 100 * 365.25))))
+    return lambda args: get_current_dasha(*args), inputs
+
+
+def _moon_births(context):
+    return [(next(p.longitude for p in chart.planets if p.name == 'Moon'), birth_datetime)
+            for (birth_datetime, _), chart in zip(context.births, context.charts)]
+
+
+def _dasha_timeline(context):
+    return lambda args: vimshottari_timeline(*args), _moon_births(context)
+
+
+def _dasha_active(context):
+    rng = random.Random(BENCHMARK_SEED)
+    inputs = []
+    for moon_longitude, birth_datetime in _moon_births(context):
+        timeline = vimshottari_timeline(moon_longitude, birth_datetime)
+        inputs.append((timeline, rng.uniform(0, 100 * 365.25)))
+    return lambda args: args[0].active(args[1]), inputs
+
+
+def _dasha_current_periods(context):
+    rng = random.Random(BENCHMARK_SEED)
+    inputs = [(moon_longitude, birth_datetime, birth_datetime + timedelta(days=rng.uniform(0, 100 * 365.25)))
+              for moon_longitude, birth_datetime in _moon_births(context)]
+    return lambda args: current_periods(*args), inputs
+
+
+def _yogas(context):
+    return detect_yogas, context.charts
+
+
+def _ashtakavarga(context):
+    return calc_ashtakavarga, context.charts
+
+
+def _build_chart(context):
+    return build_chart, context.corpus
+
+
+def _pdf_report(context):
+    from routers.pdf import ReportRequest, create_pdf_report
+    inputs = [
+        ReportRequest(title=f"Benchmark report {index}", content=_report_markdown(chart))
+        for index, chart in enumerate(context.charts[:PDF_REPORTS])
+    ]
+    return create_pdf_report, inputs
+
+
+def _markdown(context):
+    from reportlab.lib.pagesizes import A4
+    from core.markdown_pdf import markdown_to_flowables
+    from core.report_theme import get_theme
+    theme = get_theme('classic')
+    text = _long_report_markdown(context.charts[:LONG_REPORT_SECTIONS])
+    width = A4[0] - theme.margins[0] - theme.margins[1]
+    return lambda source: markdown_to_flowables(source, theme, width), [text]
+
+
+def _birth_json(context):
+    return [birth_data.model_dump(mode='json') for birth_data in context.corpus]
+
+
+def _post_chart(context):
+    """Every request misses the chart cache (memory tier cleared first)"""
+    from core.chart_cache import chart_cache
+    client = context.client
+
+    def post(payload):
+        chart_cache.memory.clear()
+        response = client.post("/chart", json=payload)
+        response.raise_for_status()
+
+    return post, _birth_json(context)
+
+
+def _post_chart_cached(context):
+    """Every request hits the chart cache (filled by the warm-up pass)"""
+    client = context.client
+
+    def post(payload):
+        response = client.post("/chart", json=payload)
+        response.raise_for_status()
+
+    return post, _birth_json(context)
+
+
+BENCHMARKS = [
+    Benchmark('calc_planetary_positions', _positions),
+    Benchmark('calc_lagna', _lagna),
+    Benchmark('get_nakshatra', _nakshatra),
+    Benchmark('nakshatra_at', _nakshatra_at),
+    Benchmark('pada_indices', _pada_indices),
+    Benchmark('get_planet_dignity', _dignity),
+    Benchmark('get_dasha_sequence', _dasha_sequence),
+    Benchmark('get_current_dasha', _current_dasha),
+    Benchmark('dasha_timeline', _dasha_timeline),
+    Benchmark('dasha_active', _dasha_active),
+    Benchmark('dasha_current_periods', _dasha_current_periods),
+    Benchmark('detect_yogas', _yogas),
+    Benchmark('calc_ashtakavarga', _ashtakavarga),
+    Benchmark('build_chart', _build_chart),
+    Benchmark('create_pdf_report', _pdf_report),
+    Benchmark('markdown_to_flowables', _markdown),
+    Benchmark('post_chart', _post_chart),
+    Benchmark('post_chart_cached', _post_chart_cached),
+]
+
+
+def time_benchmark(fn: Callable[[Any], Any], inputs: Sequence[Any], repeats: int) -> Dict:
+    """
+    Time fn over every input, repeats times
+
+    Args:
+        fn: Callable taking one input
+        inputs: Inputs for one pass
+        repeats: Number of timed passes
+
+    Returns:
+        Dict with calls per pass and min/median/max/stdev of the
+        per-call time in microseconds
+    """
+    for item in inputs:
+        fn(item)
+
+    per_call = []
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        for item in inputs:
+            fn(item)
+        per_call.append((time.perf_counter() - started) / len(inputs) * 1e6)
+
+    return {
+        'calls': len(inputs),
+        'repeats': repeats,
+        'min_us': min(per_call),
+        'median_us': statistics.median(per_call),
+        'max_us': max(per_call),
+        'stdev_us': statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None, corpus_size: int = CORPUS_SIZE,
+                   repeats: int = DEFAULT_REPEATS, seed: int = BENCHMARK_SEED) -> Dict:
+    """
+    Run the selected benchmarks
+
+    Args:
+        names: Benchmark names (default: all of BENCHMARKS)
+        corpus_size: Profiles in the seeded corpus
+        repeats: Timed passes per benchmark
+        seed: Corpus seed
+
+    Returns:
+        Dict with run metadata and per-benchmark timings
+    """
+    known = {benchmark.name: benchmark for benchmark in BENCHMARKS}
+    names = names or list(known)
+    unknown = set(names) - set(known)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+
+    context = BenchmarkContext(make_corpus(corpus_size, seed))
+    results = {}
+    try:
+        for name in names:
+            fn, inputs = known[name].prepare(context)
+            results[name] = time_benchmark(fn, inputs, repeats)
+    finally:
+        context.close()
+
+    return {
+        'meta': {
+            'engine_version': calculator.ENGINE_VERSION,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'pool_kind': os.getenv("POOL_KIND", "process"),
+            'seed': seed,
+            'corpus_size': corpus_size,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+    """
+    Compare median per-call times against a baseline run
+
+    Args:
+        current: Output of run_benchmarks
+        baseline: Stored output of an earlier run_benchmarks
+        threshold: Allowed slowdown as a fraction (0.2 = 20% slower)
+
+    Returns:
+        One row per benchmark in either run with baseline_us, current_us,
+        change (fractional) and status: ok, regression, improved, new or
+        missing
+    """
+    rows = []
+    current_results = current['results']
+    baseline_results = baseline['results']
+    for name in list(current_results) + [n for n in baseline_results if n not in current_results]:
+        now = current_results.get(name, {}).get('median_us')
+        before = baseline_results.get(name, {}).get('median_us')
+        if before is None or now is None:
+            rows.append({'name': name, 'baseline_us': before, 'current_us': now, 'change': None,
+                         'status': 'new' if before is None else 'missing'})
+            continue
+
+        change = now / before - 1.0
+        if change > threshold:
+            status = 'regression'
+        elif change < -threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append({'name': name, 'baseline_us': before, 'current_us': now,
+                     'change': change, 'status': status})
+    return rows
+
+
+def _format_us(value: Optional[float]) -> str:
+    return '-' if value is None else f"{value:,.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the astro-engine hot paths")
+    parser.add_argument('--only', help="Comma-separated benchmark names (default: all)")
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--corpus-size', type=int, default=CORPUS_SIZE)
+    parser.add_argument('--seed', type=int, default=BENCHMARK_SEED)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Where to write the results JSON")
+    parser.add_argument('--save-baseline', metavar='PATH', help="Also write the results here as the new baseline")
+    parser.add_argument('--baseline', metavar='PATH', help="Compare against this results JSON")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed median slowdown before failing (fraction)")
+    parser.add_argument('--list', action='store_true', help="List benchmark names and exit")
+    args = parser.parse_args()
+
+    if args.list:
+        for benchmark in BENCHMARKS:
+            print(benchmark.name)
+        return 0
+
+    names = args.only.split(',') if args.only else None
+    results = run_benchmarks(names, args.corpus_size, args.repeats, args.seed)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if not args.baseline:
+        print(f"{'benchmark':26} {'calls':>6} {'median us':>12} {'min us':>12}")
+        for name, result in results['results'].items():
+            print(f"{name:26} {result['calls']:>6} {_format_us(result['median_us']):>12} "
+                  f"{_format_us(result['min_us']):>12}")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if names:
+        baseline['results'] = {name: baseline['results'][name] for name in names if name in baseline['results']}
+    rows = compare_results(results, baseline, args.threshold)
+
+    print(f"{'benchmark':26} {'baseline us':>12} {'current us':>12} {'change':>8}  status")
+    for row in rows:
+        change = '-' if row['change'] is None else f"{row['change']:+.1%}"
+        print(f"{row['name']:26} {_format_us(row['baseline_us']):>12} "
+              f"{_format_us(row['current_us']):>12} {change:>8}  {row['status']}")
+
+    regressions = [row['name'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
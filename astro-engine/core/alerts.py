@@ -0,0 +1,220 @@
+"""
+Transit-vs-natal aspects: single-chart snapshot and bulk alert scan
+
+Transit positions are sampled once for the window; every profile's natal
+longitudes are then compared against them as one array operation:
+
+    separation[sample, profile, point, planet]  (folded to 0..180°)
+    distance to the nearest aspect angle        -> orb
+    minimum over samples                        -> closest approach
+
+A (profile, natal point, transit planet) triple is a hit when its closest
+approach is within that profile's orb. Profiles are processed in chunks so
+memory stays bounded regardless of how many are sent.
+
+calc_transit_aspects is the plain per-pair version behind the single-chart
+endpoints.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core import calculator
+from core.ephemeris_table import ephemeris_series
+from core.transit_events import ASPECT_ANGLES
+
+# Array elements per chunk of the (profiles, points, planets, samples) tensor
+ALERT_CHUNK_ELEMENTS = 1_000_000
+
+# Orbs for the single-chart snapshot (/chart/transits/natal and /aspects)
+DEFAULT_ORB = 5.0
+EXACT_ORB = 1.0
+
+# Slow movers whose conjunctions and oppositions are called out
+SIGNIFICANT_PLANETS = ('Saturn', 'Jupiter', 'Rahu', 'Ketu')
+SIGNIFICANT_ASPECTS = ('conjunction', 'opposition')
+
+
+def calc_transit_aspects(
+    transit_longitudes: Dict[str, float],
+    natal_longitudes: Dict[str, float],
+    orb: float = DEFAULT_ORB,
+) -> Tuple[List[Dict], List[str]]:
+    """
+    Aspects between transiting and natal positions at one instant
+
+    Each pair gets the first aspect (conjunction, sextile, square, trine,
+    opposition) whose angle is within orb.
+
+    Args:
+        transit_longitudes: Transiting planet name -> longitude
+        natal_longitudes: Natal point name -> longitude
+        orb: Maximum orb in degrees
+
+    Returns:
+        Tuple of (aspect dicts with transit_planet, natal_planet,
+        aspect_type, orb, is_exact; human-readable significant transits)
+    """
+    angles = [(name, ASPECT_ANGLES[name][0]) for name in ASPECT_ANGLES]
+
+    aspects = []
+    significant_transits = []
+    for transit_name, transit_longitude in transit_longitudes.items():
+        for natal_name, natal_longitude in natal_longitudes.items():
+            diff = abs(transit_longitude - natal_longitude)
+            if diff > 180:
+                diff = 360 - diff
+
+            aspect_type = next((name for name, angle in angles if abs(diff - angle) <= orb), None)
+            if aspect_type is None:
+                continue
+
+            aspects.append({
+                'transit_planet': transit_name,
+                'natal_planet': natal_name,
+                'aspect_type': aspect_type,
+                'orb': diff,
+                'is_exact': any(abs(diff - angle) <= EXACT_ORB for _, angle in angles),
+            })
+
+            if transit_name in SIGNIFICANT_PLANETS and aspect_type in SIGNIFICANT_ASPECTS:
+                significant_transits.append(
+                    f"Transiting {transit_name} {aspect_type} natal {natal_name} (orb: {diff:.2f}°)"
+                )
+
+    return aspects, significant_transits
+
+
+def find_aspect_hits(
+    transit_longitudes: np.ndarray,
+    natal_longitudes: np.ndarray,
+    orbs: np.ndarray,
+    aspects: List[str],
+) -> Dict[str, np.ndarray]:
+    """
+    Closest aspect between every natal point and every transiting planet
+
+    Args:
+        transit_longitudes: Array (planets, samples) of transit longitudes
+        natal_longitudes: Array (profiles, points); NaN marks a missing point
+        orbs: Array (profiles,) of maximum orb per profile
+        aspects: Aspect names (keys of ASPECT_ANGLES) to look for
+
+    Returns:
+        Dict of equal-length hit arrays: profile, point, planet, sample and
+        aspect (indices) plus orb (degrees from exact)
+    """
+    # Single precision keeps the tensor small; its 2e-5° resolution is far below any orb
+    angles = np.array([ASPECT_ANGLES[name][0] for name in aspects], dtype=np.float32)
+    transit = np.mod(transit_longitudes, 360.0).astype(np.float32).T
+    natal_longitudes = np.mod(natal_longitudes, 360.0).astype(np.float32)
+    profiles, points = natal_longitudes.shape
+    planets, samples = transit_longitudes.shape
+
+    per_profile = max(1, points * planets * samples)
+    chunk = max(1, ALERT_CHUNK_ELEMENTS // per_profile)
+
+    found = {key: [] for key in ('profile', 'point', 'planet', 'sample', 'aspect', 'orb')}
+    for offset in range(0, profiles, chunk):
+        natal = natal_longitudes[offset:offset + chunk]
+
+        # (samples, n, points, planets), folded so 0 = conjunction, 180 = opposition.
+        # Both inputs lie in [0, 360), so 180 - ||d| - 180| folds without a modulo
+        separation = transit[:, None, None, :] - natal[None, :, :, None]
+        np.abs(separation, out=separation)
+        separation -= 180.0
+        np.abs(separation, out=separation)
+        np.subtract(180.0, separation, out=separation)
+
+        orb = np.abs(separation - angles[0])
+        scratch = np.empty_like(orb)
+        for angle in angles[1:]:
+            np.subtract(separation, angle, out=scratch)
+            np.abs(scratch, out=scratch)
+            np.minimum(orb, scratch, out=orb)
+
+        closest = orb.min(axis=0)
+        hit = closest <= orbs[offset:offset + chunk, None, None]
+        profile, point, planet = np.nonzero(hit)
+
+        # Only the (usually few) hits need their sample and aspect resolved
+        sample = orb[:, profile, point, planet].argmin(axis=0)
+        hit_separation = separation[sample, profile, point, planet]
+
+        found['profile'].append(profile + offset)
+        found['point'].append(point)
+        found['planet'].append(planet)
+        found['sample'].append(sample)
+        found['aspect'].append(np.abs(hit_separation[:, None] - angles).argmin(axis=-1))
+        found['orb'].append(closest[profile, point, planet].astype(np.float64))
+
+    return {
+        key: np.concatenate(parts) if parts else np.empty(0, dtype=np.float64 if key == 'orb' else np.intp)
+        for key, parts in found.items()
+    }
+
+
+def scan_transit_alerts(
+    start_jd: float,
+    end_jd: float,
+    natal_points: List[str],
+    natal_longitudes: List[List[Optional[float]]],
+    orbs: List[float],
+    profile_ids: List[str],
+    planets: Optional[List[str]] = None,
+    aspects: Optional[List[str]] = None,
+    step: float = 1.0,
+) -> Dict:
+    """
+    Transit aspect hits for many profiles over one window
+
+    Args:
+        start_jd: Start of the window (UT)
+        end_jd: End of the window (UT); sampled every step days
+        natal_points: Names of the natal longitude columns (e.g. Moon, Lagna)
+        natal_longitudes: One row per profile, aligned with natal_points
+        orbs: Maximum orb per profile in degrees
+        profile_ids: Caller's identifier per profile
+        planets: Transiting planets (default: all nine grahas)
+        aspects: Aspect names (default: all of ASPECT_ANGLES)
+        step: Sampling step in days
+
+    Returns:
+        Dict with window info and columnar hit lists (profile_id,
+        transit_planet, natal_point, aspect_type, orb, jd)
+    """
+    planets = planets or list(calculator.PLANETS)
+    aspects = aspects or list(ASPECT_ANGLES)
+
+    unknown = set(planets) - set(calculator.PLANETS)
+    if unknown:
+        raise ValueError(f"Unknown planets: {sorted(unknown)}")
+    unknown = set(aspects) - set(ASPECT_ANGLES)
+    if unknown:
+        raise ValueError(f"Unknown aspects: {sorted(unknown)}")
+
+    natal = np.array(natal_longitudes, dtype=np.float64).reshape(len(profile_ids), len(natal_points))
+    orbs = np.asarray(orbs, dtype=np.float64)
+    if orbs.shape != (len(profile_ids),):
+        raise ValueError("orbs must have one entry per profile")
+
+    series, source = ephemeris_series(start_jd, end_jd, step)
+    rows = [series['planets'].index(name) for name in planets]
+    hits = find_aspect_hits(series['longitude'][rows], natal, orbs, aspects)
+
+    return {
+        'start_jd': start_jd,
+        'end_jd': end_jd,
+        'samples': len(series['jd']),
+        'profiles': len(profile_ids),
+        'source': source,
+        'hits': {
+            'profile_id': np.asarray(profile_ids, dtype=object)[hits['profile']].tolist(),
+            'transit_planet': np.asarray(planets, dtype=object)[hits['planet']].tolist(),
+            'natal_point': np.asarray(natal_points, dtype=object)[hits['point']].tolist(),
+            'aspect_type': np.asarray(aspects, dtype=object)[hits['aspect']].tolist(),
+            'orb': hits['orb'].tolist(),
+            'jd': series['jd'][hits['sample']].tolist(),
+        }
+    }
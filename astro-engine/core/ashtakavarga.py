@@ -1,5 +1,6 @@
-from typing import Dict, List
+from typing import Dict, List, Union
 from schemas.birth_data import ChartData, Ashtakavarga
+from core.compact_chart import CompactChart, PLANET_INDEX, PLANET_NAMES
 
 
 # Ashtakavarga benefic points (simplified version)
@@ -71,57 +72,66 @@ ASHTAKAVARGA_POINTS = {
 }
 
 
-def calc_ashtakavarga(chart_data: ChartData) -> List[Ashtakavarga]:
+ASHTAKAVARGA_PLANETS = ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']
+
+# ASHTAKAVARGA_POINTS as planet indices: (planet, ((reference planet, offsets), ...))
+_POINT_TABLE = tuple(
+    (PLANET_INDEX[planet_name], tuple(
+        (PLANET_INDEX[from_planet.replace('from_', '')], tuple(offsets))
+        for from_planet, offsets in ASHTAKAVARGA_POINTS[planet_name].items()
+    ))
+    for planet_name in ASHTAKAVARGA_PLANETS
+)
+
+
+def calc_ashtakavarga(chart: Union[ChartData, CompactChart]) -> List[Ashtakavarga]:
     """
     Calculate Ashtakavarga (benefic points) for each planet
 
     Args:
-        chart_data: Complete chart data
+        chart: Complete chart data, or the pipeline's CompactChart
 
     Returns:
         List of Ashtakavarga objects with scores for each house
     """
-    planets_dict = {p.name: p for p in chart_data.planets}
+    # House per planet index; 0 marks a planet missing from the chart
+    if isinstance(chart, CompactChart):
+        planet_houses = chart.house.tolist()
+    else:
+        planet_houses = [0] * len(PLANET_INDEX)
+        for planet in chart.planets:
+            if planet.name in PLANET_INDEX:
+                planet_houses[PLANET_INDEX[planet.name]] = planet.house
+
     results = []
+    sarva_scores = [0] * 12
 
-    for planet_name in ['Sun', 'Moon', 'Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn']:
-        if planet_name not in planets_dict:
+    for planet_index, references in _POINT_TABLE:
+        if not planet_houses[planet_index]:
             continue
 
         house_scores = [0] * 12  # 12 houses
 
         # Get benefic points from each planet
-        points_config = ASHTAKAVARGA_POINTS.get(planet_name, {})
-
-        for from_planet, benefic_houses in points_config.items():
-            reference_planet_name = from_planet.replace('from_', '')
-
-            if reference_planet_name not in planets_dict:
+        for reference_index, benefic_houses in references:
+            reference_house = planet_houses[reference_index]
+            if not reference_house:
                 continue
 
-            # Get house of reference planet
-            reference_house = planets_dict[reference_planet_name].house
-
             # Add points to benefic houses counted from reference planet
             for benefic_house_offset in benefic_houses:
-                # Calculate which house gets the point
-                target_house = ((reference_house - 1 + benefic_house_offset - 1) % 12) + 1
-                house_scores[target_house - 1] += 1
+                house_scores[(reference_house + benefic_house_offset - 2) % 12] += 1
 
-        total_score = sum(house_scores)
+        for i in range(12):
+            sarva_scores[i] += house_scores[i]
 
         results.append(Ashtakavarga(
-            planet=planet_name,
+            planet=PLANET_NAMES[planet_index],
             house_scores=house_scores,
-            total=total_score
+            total=sum(house_scores)
         ))
 
-    # Calculate Sarvashtakavarga (combined scores)
-    sarva_scores = [0] * 12
-    for result in results:
-        for i in range(12):
-            sarva_scores[i] += result.house_scores[i]
-
+    # Sarvashtakavarga (combined scores)
     results.append(Ashtakavarga(
         planet='Sarvashtakavarga',
         house_scores=sarva_scores,
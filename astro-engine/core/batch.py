@@ -0,0 +1,127 @@
+import asyncio
+import json
+import os
+from collections import deque
+from typing import AsyncIterator, Dict, List, Tuple
+
+from schemas.birth_data import BirthData, ChartData
+from core.chart_builder import build_chart
+from core.chart_cache import chart_cache, chart_cache_key
+from core.executor import compute_pool, PoolSaturatedError
+
+# Most profiles accepted in one batch request
+BATCH_MAX_PROFILES = int(os.getenv("BATCH_MAX_PROFILES", "1000"))
+
+# Profiles sent to a worker per task; amortizes pickling and IPC overhead
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "32"))
+
+# Chunks in flight per worker; bounds memory when the client reads slowly
+BATCH_PREFETCH = 2
+
+
+def calculate_chart_chunk(chunk: List[Tuple[int, BirthData]]) -> List[str]:
+    """
+    Calculate charts for a chunk of profiles inside a worker process
+
+    Charts are serialized to JSON in the worker so encoding is spread
+    across cores too. A failing profile produces an error line instead
+    of aborting the chunk.
+
+    Args:
+        chunk: List of (input index, birth data) pairs
+
+    Returns:
+        List of NDJSON lines (without trailing newline), one per profile
+    """
+    lines = []
+    for index, birth_data in chunk:
+        try:
+            chart_json = build_chart(birth_data).model_dump_json()
+            lines.append(_chart_line(index, chart_json))
+        except Exception as e:
+            lines.append(_error_line(index, f"Chart calculation error: {str(e)}"))
+    return lines
+
+
+def _chart_line(index: int, chart_json: str) -> str:
+    return f'{{"index": {index}, "status": "ok", "chart": {chart_json}}}'
+
+
+def _error_line(index: int, error: str) -> str:
+    return json.dumps({'index': index, 'status': 'error', 'error': error})
+
+
+async def cached_charts(profiles: List[BirthData]) -> Dict[int, ChartData]:
+    """
+    Look up every profile in the chart cache without computing anything
+
+    Args:
+        profiles: Birth data for every profile in the batch
+
+    Returns:
+        Dict of input index -> cached ChartData for the profiles that hit
+    """
+    cached = {}
+    for index, birth_data in enumerate(profiles):
+        chart = await chart_cache.get_cached(chart_cache_key(birth_data))
+        if chart is not None:
+            cached[index] = chart.model_copy(update={'birth_info': birth_data})
+    return cached
+
+
+async def iter_batch_results(profiles: List[BirthData], cached: Dict[int, ChartData]) -> AsyncIterator[str]:
+    """
+    Fan uncached profiles out over the compute pool and yield NDJSON lines in input order
+
+    Chunks go through compute_pool, so they count against its worker and
+    queue limits like any other request. While the pool is full the batch
+    waits on the chunks it already has running; a chunk that cannot start
+    even then gets an error line per profile.
+
+    Args:
+        profiles: Birth data for every profile in the batch
+        cached: Charts already in the cache, from cached_charts
+
+    Yields:
+        One NDJSON line per profile, newline-terminated
+    """
+    missing = [(index, birth_data) for index, birth_data in enumerate(profiles) if index not in cached]
+    chunks = [
+        missing[i:i + BATCH_CHUNK_SIZE]
+        for i in range(0, len(missing), BATCH_CHUNK_SIZE)
+    ]
+
+    max_in_flight = compute_pool.max_workers * BATCH_PREFETCH
+    capacity = compute_pool.max_workers + compute_pool.max_queue
+    loop = asyncio.get_running_loop()
+    pending = deque()
+    computed = deque()
+    next_chunk = 0
+
+    try:
+        for index in range(len(profiles)):
+            chart = cached.get(index)
+            if chart is not None:
+                yield _chart_line(index, chart.model_dump_json()) + "\n"
+                continue
+
+            # Keep every worker busy while results drain in order, leaving
+            # the pool's last slots to other requests once this one has work
+            while next_chunk < len(chunks) and len(pending) < max_in_flight:
+                if pending and compute_pool.in_flight >= capacity:
+                    break
+                try:
+                    future = compute_pool.start(calculate_chart_chunk, chunks[next_chunk])
+                except PoolSaturatedError as e:
+                    future = loop.create_future()
+                    future.set_result([_error_line(i, str(e)) for i, _ in chunks[next_chunk]])
+                pending.append(future)
+                next_chunk += 1
+
+            if not computed:
+                computed.extend(await pending.popleft())
+            yield computed.popleft() + "\n"
+    finally:
+        # Client went away: drop work that has not started yet
+        for future in pending:
+            future.cancel()
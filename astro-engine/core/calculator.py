@@ -1,14 +1,34 @@
 import swisseph as swe
+import numpy as np
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Tuple, List
 import os
+import threading
+
+from core import metrics
+
+# Bump whenever a change alters calculated output; cached charts keyed on
+# an older version are then ignored.
+ENGINE_VERSION = "1.0.1"
 
 # Initialize Swiss Ephemeris
 EPHE_PATH = os.path.join(os.path.dirname(__file__), '..', 'ephe')
-swe.set_ephe_path(EPHE_PATH)
 
-# Set sidereal mode to Lahiri (Chitrapaksha) ayanamsha
-swe.set_sid_mode(swe.SIDM_LAHIRI)
+# Swiss Ephemeris keeps its settings in thread-local storage, so every
+# thread that calls into it (request threads, worker pools) must set the
+# ephemeris path and sidereal mode itself.
+_thread_state = threading.local()
+
+
+def ensure_swe_configured():
+    """Apply ephemeris path and Lahiri (Chitrapaksha) ayanamsha for this thread"""
+    if not getattr(_thread_state, 'configured', False):
+        swe.set_ephe_path(EPHE_PATH)
+        swe.set_sid_mode(swe.SIDM_LAHIRI)
+        _thread_state.configured = True
+
+
+ensure_swe_configured()
 
 # Planet constants
 PLANETS = {
@@ -86,13 +106,29 @@ def calc_julian_day(dt: datetime, utc_offset_hours: float = 5.5) -> float:
     return jd
 
 
+def utc_julian_day(dt: datetime) -> float:
+    """Julian Day for a datetime; naive values are taken as UTC"""
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return calc_julian_day(dt, utc_offset_hours=0)
+
+
+def julian_day_to_datetime(jd: float) -> datetime:
+    """Convert a Julian Day (UT) to a naive UTC datetime"""
+    year, month, day, hour = swe.revjul(jd)
+    return datetime(year, month, day) + timedelta(milliseconds=round(hour * 3600000.0))
+
+
 def get_ayanamsha(jd: float) -> float:
     """Get Lahiri ayanamsha for given Julian Day"""
+    ensure_swe_configured()
+    metrics.count('swisseph_calls')
     return swe.get_ayanamsa_ut(jd)
 
 
 def calc_planetary_positions(jd: float) -> Dict[str, Dict]:
     """Calculate positions for all planets"""
+    ensure_swe_configured()
     positions = {}
 
     for planet_name, planet_id in PLANETS.items():
@@ -110,6 +146,7 @@ def calc_planetary_positions(jd: float) -> Dict[str, Dict]:
 
         # Calculate sidereal position
         result, flags = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+        metrics.count('swisseph_calls')
 
         longitude = result[0]
         latitude = result[1]
@@ -129,11 +166,100 @@ def calc_planetary_positions(jd: float) -> Dict[str, Dict]:
     return positions
 
 
+def calc_moon_longitude(jd: float) -> float:
+    """
+    Sidereal Moon longitude, the only position the dasha depends on
+
+    Uses the same flags as calc_planetary_positions, so the value equals
+    the chart's Moon.
+    """
+    ensure_swe_configured()
+    metrics.count('swisseph_calls')
+    return swe.calc_ut(jd, swe.MOON, swe.FLG_SIDEREAL | swe.FLG_SPEED)[0][0]
+
+
+def calc_ephemeris_series(start_jd: float, end_jd: float, step: float = 1.0) -> Dict:
+    """
+    Calculate planetary positions for every step between two Julian Days
+
+    Bodies are sampled with one Swiss Ephemeris call per instant (time in
+    the outer loop, so Swiss Ephemeris can reuse the Earth/Sun state it
+    caches per instant) and the results land in preallocated arrays; Ketu
+    is derived from Rahu with array arithmetic.
+
+    Args:
+        start_jd: First Julian Day (UT)
+        end_jd: Last Julian Day (UT), included if it falls on a step
+        step: Spacing in days
+
+    Returns:
+        Dict with 'planets' (names, row order), 'jd' (n,), and
+        'longitude', 'latitude', 'speed' float64 arrays plus an
+        'is_retrograde' bool array, each shaped (len(planets), n) with one
+        C-contiguous row per planet
+    """
+    if step <= 0:
+        raise ValueError("step must be positive")
+    if end_jd < start_jd:
+        raise ValueError("end_jd must not be before start_jd")
+
+    ensure_swe_configured()
+
+    planet_names = list(PLANETS)
+    count = int(np.floor((end_jd - start_jd) / step + 1e-9)) + 1
+    jds = start_jd + step * np.arange(count, dtype=np.float64)
+
+    # Every body except Ketu comes from Swiss Ephemeris
+    computed = [name for name in planet_names if name != 'Ketu']
+    planet_ids = [PLANETS[name] for name in computed]
+    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
+    calc_ut = swe.calc_ut
+
+    samples = np.array(
+        [calc_ut(jd, planet_id, flags)[0] for jd in jds.tolist() for planet_id in planet_ids],
+        dtype=np.float64
+    ).reshape(count, len(computed), 6)
+    metrics.count('swisseph_calls', count * len(computed))
+
+    longitude = np.empty((len(planet_names), count), dtype=np.float64)
+    latitude = np.empty_like(longitude)
+    speed = np.empty_like(longitude)
+    for column, planet_name in enumerate(computed):
+        row = planet_names.index(planet_name)
+        longitude[row] = samples[:, column, 0]
+        latitude[row] = samples[:, column, 1]
+        speed[row] = samples[:, column, 3]
+
+    # Ketu is 180° opposite to Rahu
+    rahu = planet_names.index('Rahu')
+    ketu = planet_names.index('Ketu')
+    np.add(longitude[rahu], 180.0, out=longitude[ketu])
+    np.mod(longitude[ketu], 360.0, out=longitude[ketu])
+    np.negative(latitude[rahu], out=latitude[ketu])
+    np.negative(speed[rahu], out=speed[ketu])
+
+    # Same rule as calc_planetary_positions: nodes are always retrograde
+    is_retrograde = speed < 0
+    is_retrograde[rahu] = True
+    is_retrograde[ketu] = True
+
+    return {
+        'planets': planet_names,
+        'jd': jds,
+        'longitude': longitude,
+        'latitude': latitude,
+        'speed': speed,
+        'is_retrograde': is_retrograde,
+    }
+
+
 def calc_lagna(jd: float, lat: float, lon: float) -> float:
     """Calculate Ascendant (Lagna) degree"""
+    ensure_swe_configured()
     # Calculate houses using Placidus (to get ascendant)
     # Then we'll use whole sign houses separately
     cusps, ascmc = swe.houses_ex(jd, lat, lon, b'P')  # Placidus
+    metrics.count('swisseph_calls')
 
     ascendant_tropical = ascmc[0]
 
@@ -250,8 +376,10 @@ def is_retrograde(planet_name: str, jd: float) -> bool:
     if planet_name in ['Rahu', 'Ketu']:
         return True  # Always retrograde in mean node calculation
 
+    ensure_swe_configured()
     planet_id = PLANETS[planet_name]
     result, flags = swe.calc_ut(jd, planet_id, swe.FLG_SIDEREAL | swe.FLG_SPEED)
+    metrics.count('swisseph_calls')
     speed = result[3]
 
     return speed < 0
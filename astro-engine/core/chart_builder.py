@@ -0,0 +1,165 @@
+from datetime import datetime
+from typing import Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from backports.zoneinfo import ZoneInfo
+
+from schemas.birth_data import (
+    BirthData, ChartData, Planet, House, DashaPeriod, DashaSequence
+)
+from core import calculator
+from core.metrics import span
+from core.compact_chart import DIGNITIES, PLANET_INDEX, PLANET_NAMES, calc_compact_chart
+from core.nakshatra import DASHA_ORDER, NAKSHATRA_DATA, nakshatra_at
+from core.dasha import calc_dasha_balance
+from core.dasha_engine import vimshottari_timeline
+from core.yoga_rules import detect_yogas
+from core.ashtakavarga import calc_ashtakavarga
+
+
+def birth_julian_day(birth_data: BirthData) -> Tuple[datetime, float]:
+    """
+    Resolve birth data to a naive local datetime and its Julian Day
+
+    Args:
+        birth_data: Birth information (date, time, timezone)
+
+    Returns:
+        Tuple of (local birth datetime, Julian Day in UT)
+    """
+    # Combine date and time
+    birth_datetime = datetime.combine(birth_data.birth_date, birth_data.birth_time)
+
+    # Calculate Julian Day using actual timezone from birth data
+    tz = ZoneInfo(birth_data.timezone)
+    birth_dt_aware = birth_datetime.replace(tzinfo=tz)
+    utc_offset_hours = birth_dt_aware.utcoffset().total_seconds() / 3600
+    jd = calculator.calc_julian_day(birth_datetime, utc_offset_hours)
+
+    return birth_datetime, jd
+
+
+def build_chart(birth_data: BirthData) -> ChartData:
+    """
+    Calculate complete birth chart from birth data
+
+    This is the synchronous pipeline behind POST /chart. It is a plain
+    module-level function so it can also run inside worker processes.
+
+    Args:
+        birth_data: Birth information (date, time, location)
+
+    Returns:
+        Complete ChartData with planets, houses, dashas, yogas
+    """
+    birth_datetime, jd = birth_julian_day(birth_data)
+
+    # Positions, lagna and per-planet facts in one array-backed chart; the
+    # pipeline runs on it and the Pydantic models are only built at the end
+    compact = calc_compact_chart(jd, birth_data.latitude, birth_data.longitude)
+    lagna_degree = compact.lagna
+
+    with span('yogas'):
+        yogas = detect_yogas(compact)
+    with span('ashtakavarga'):
+        ashtakavarga = calc_ashtakavarga(compact)
+
+    with span('dasha'):
+        moon_longitude = compact.longitude[PLANET_INDEX['Moon']]
+        balance_info = calc_dasha_balance(moon_longitude, birth_datetime)
+        timeline = vimshottari_timeline(moon_longitude, birth_datetime, depth=1)
+
+    # Pydantic models for the API, built once from the arrays
+    with span('models'):
+        # Build Planet objects
+        planets = []
+        planets_by_house = [[] for _ in range(12)]
+        for index, planet_name in enumerate(PLANET_NAMES):
+            longitude = compact.longitude[index]
+            sign = calculator.SIGNS[compact.sign[index]]
+            nakshatra = NAKSHATRA_DATA[compact.nakshatra[index]]
+            house = compact.house[index]
+
+            planet = Planet(
+                name=planet_name,
+                longitude=longitude,
+                latitude=compact.latitude[index],
+                speed=compact.speed[index],
+                sign=sign,
+                sign_lord=calculator.SIGN_LORDS[sign],
+                degree_in_sign=calculator.get_degree_in_sign(longitude),
+                house=house,
+                nakshatra=nakshatra['name'],
+                nakshatra_lord=nakshatra['lord'],
+                pada=compact.pada[index],
+                is_retrograde=bool(compact.retrograde[index]),
+                dignity=DIGNITIES[compact.dignity[index]]
+            )
+            planets.append(planet)
+            planets_by_house[house - 1].append(planet_name)
+
+        # Add planets to houses (Whole Sign)
+        houses = [
+            House(
+                number=house_data['number'],
+                sign=house_data['sign'],
+                lord=house_data['lord'],
+                cusp=house_data['cusp'],
+                planets=planets_by_house[house_data['number'] - 1]
+            )
+            for house_data in calculator.calc_houses(lagna_degree)
+        ]
+
+        # Create lagna as Planet object
+        lagna_sign = calculator.SIGNS[compact.lagna_sign]
+        lagna_nakshatra = nakshatra_at(lagna_degree)
+
+        lagna = Planet(
+            name='Lagna',
+            longitude=lagna_degree,
+            latitude=0.0,
+            speed=0.0,
+            sign=lagna_sign,
+            sign_lord=calculator.SIGN_LORDS[lagna_sign],
+            degree_in_sign=calculator.get_degree_in_sign(lagna_degree),
+            house=1,
+            nakshatra=lagna_nakshatra.name,
+            nakshatra_lord=lagna_nakshatra.lord,
+            pada=lagna_nakshatra.pada,
+            is_retrograde=False,
+            dignity='neutral'
+        )
+
+        dasha_periods = [
+            DashaPeriod(
+                planet=DASHA_ORDER[lord],
+                start_date=timeline.to_datetime(start),
+                end_date=timeline.to_datetime(end),
+                level='mahadasha'
+            )
+            for lord, start, end in timeline.periods(0)
+        ]
+
+        dasha_at_birth = DashaSequence(
+            birth_date=birth_datetime,
+            balance_at_birth={
+                'nakshatra_lord': balance_info['nakshatra_lord'],
+                'balance_years': balance_info['balance_years'],
+                'nakshatra_name': balance_info['nakshatra_name']
+            },
+            periods=dasha_periods
+        )
+
+        return ChartData(
+            birth_info=birth_data,
+            julian_day=jd,
+            ayanamsha=compact.ayanamsha,
+            lagna=lagna,
+            planets=planets,
+            houses=houses,
+            dasha_at_birth=dasha_at_birth,
+            yogas=yogas,
+            ashtakavarga=ashtakavarga
+        )
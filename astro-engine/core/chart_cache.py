@@ -0,0 +1,279 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import swisseph as swe
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from schemas.birth_data import BirthData, ChartData
+from core.calculator import ENGINE_VERSION
+from core.chart_builder import build_chart
+from core.executor import compute_pool
+
+# In-process tier limits
+CHART_CACHE_SIZE = int(os.getenv("CHART_CACHE_SIZE", "10000"))
+CHART_CACHE_TTL = float(os.getenv("CHART_CACHE_TTL", "86400"))
+
+# Optional shared tier: "redis", "sqlite" or "" (disabled)
+CHART_CACHE_BACKEND = os.getenv("CHART_CACHE_BACKEND", "")
+CHART_CACHE_PATH = os.getenv(
+    "CHART_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), '..', 'cache', 'charts.sqlite3')
+)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+
+def chart_cache_key(birth_data: BirthData) -> str:
+    """
+    Content-addressed key for a chart
+
+    Only the fields that affect the calculation are hashed (the profile
+    name is not), together with the engine and Swiss Ephemeris versions so
+    an upgrade never serves charts computed by older code.
+
+    Args:
+        birth_data: Birth information
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    normalized = {
+        'date': birth_data.birth_date.isoformat(),
+        'time': birth_data.birth_time.replace(microsecond=0).isoformat(),
+        'lat': round(birth_data.latitude, 6),
+        'lon': round(birth_data.longitude, 6),
+        'tz': birth_data.timezone.strip(),
+        'ayanamsha': birth_data.ayanamsha.strip().lower(),
+        'engine': ENGINE_VERSION,
+        'ephemeris': swe.version,
+    }
+    payload = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LRUTier:
+    """In-process LRU with a per-entry TTL"""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class SQLiteTier:
+    """Shared tier backed by a local SQLite file (stand-in for Redis)"""
+
+    def __init__(self, path: str, ttl: float):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS charts "
+            "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM charts WHERE key = ? AND expires_at >= ?",
+                (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO charts (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl)
+            )
+            self._conn.commit()
+
+
+class RedisTier:
+    """Shared tier backed by Redis (requires the redis package)"""
+
+    def __init__(self, url: str, ttl: float):
+        if redis is None:
+            raise RuntimeError("CHART_CACHE_BACKEND=redis requires the 'redis' package")
+        self.ttl = int(ttl)
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(f"chart:{key}")
+
+    def set(self, key: str, value: bytes) -> None:
+        self._client.set(f"chart:{key}", value, ex=self.ttl)
+
+
+class ChartCache:
+    """
+    Two-tier chart cache in front of build_chart
+
+    The memory tier holds ChartData objects; the optional shared tier holds
+    their JSON so other workers and containers can reuse them.
+    """
+
+    def __init__(self, memory: LRUTier, shared=None):
+        self.memory = memory
+        self.shared = shared
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.shared_errors = 0
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def get_chart(self, birth_data: BirthData) -> ChartData:
+        """
+        Return the chart for birth_data, computing it at most once per key
+
+        Args:
+            birth_data: Birth information
+
+        Returns:
+            ChartData whose birth_info is the caller's birth_data
+        """
+        key = chart_cache_key(birth_data)
+
+        chart = self.memory.get(key)
+        if chart is not None:
+            self.hits += 1
+            return chart.model_copy(update={'birth_info': birth_data})
+
+        # Concurrent misses for the same profile share one computation. It
+        # runs as its own task, so a caller that is cancelled (client gone)
+        # stops waiting without cancelling it for the others.
+        pending = self._pending.get(key)
+        if pending is not None:
+            self.hits += 1
+        else:
+            pending = asyncio.ensure_future(self._load_or_compute(key, birth_data))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda task: self._computed(key, task))
+
+        chart = await asyncio.shield(pending)
+        return chart.model_copy(update={'birth_info': birth_data})
+
+    def _computed(self, key: str, task: asyncio.Task):
+        del self._pending[key]
+        # Every waiter may be gone; don't warn about an unretrieved exception
+        if not task.cancelled():
+            task.exception()
+
+    async def get_cached(self, key: str) -> Optional[ChartData]:
+        """
+        Look up a chart by its cache key without computing it
+
+        Args:
+            key: Value of chart_cache_key (returned as X-Chart-Key by POST /chart)
+
+        Returns:
+            Cached ChartData, or None if no tier holds it
+        """
+        chart = self.memory.get(key)
+        if chart is not None:
+            self.hits += 1
+            return chart
+        return await self._load_shared(key)
+
+    async def _load_shared(self, key: str) -> Optional[ChartData]:
+        if self.shared is None:
+            return None
+        try:
+            data = await asyncio.to_thread(self.shared.get, key)
+        except Exception:
+            self.shared_errors += 1
+            return None
+        if data is None:
+            return None
+        chart = ChartData.model_validate_json(data)
+        self.shared_hits += 1
+        self.memory.set(key, chart)
+        return chart
+
+    async def _load_or_compute(self, key: str, birth_data: BirthData) -> ChartData:
+        chart = await self._load_shared(key)
+        if chart is not None:
+            return chart
+
+        self.misses += 1
+        chart = await compute_pool.run(build_chart, birth_data)
+        self.memory.set(key, chart)
+
+        if self.shared is not None:
+            try:
+                await asyncio.to_thread(self.shared.set, key, chart.model_dump_json().encode())
+            except Exception:
+                self.shared_errors += 1
+
+        return chart
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes"""
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            'engine_version': ENGINE_VERSION,
+            'memory_entries': len(self.memory),
+            'memory_max_entries': self.memory.max_size,
+            'memory_hits': self.hits,
+            'shared_backend': CHART_CACHE_BACKEND or None,
+            'shared_hits': self.shared_hits,
+            'shared_errors': self.shared_errors,
+            'misses': self.misses,
+            'evictions': self.memory.evictions,
+            'hit_ratio': (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+        }
+
+
+def _create_shared_tier():
+    if CHART_CACHE_BACKEND == "redis":
+        return RedisTier(REDIS_URL, CHART_CACHE_TTL)
+    if CHART_CACHE_BACKEND == "sqlite":
+        return SQLiteTier(CHART_CACHE_PATH, CHART_CACHE_TTL)
+    return None
+
+
+chart_cache = ChartCache(LRUTier(CHART_CACHE_SIZE, CHART_CACHE_TTL), _create_shared_tier())
@@ -0,0 +1,198 @@
+"""
+Chart reports: a birth chart laid out as PDF flowables
+
+The report is built from ChartData alone: birth details, vector kundli
+diagrams (core/kundli_drawing.py), the planet table, Vimshottari dashas
+with the antardashas of the running mahadasha, yogas and the
+ashtakavarga grid. Everything is drawn with ReportLab, so the web tier no
+longer rasterizes charts and uploads them as images.
+"""
+
+from datetime import datetime, timezone
+from html import escape
+from typing import List, Optional, Sequence
+
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.platypus import Flowable, Paragraph, Spacer, Table, TableStyle
+
+from schemas.birth_data import ChartData
+from core.dasha_engine import LEVEL_NAMES, timeline_from_balance
+from core.dasha_queries import to_birth_clock
+from core.kundli_drawing import CHART_STYLES, kundli_drawing
+from core.nakshatra import DASHA_ORDER
+from core.report_theme import ReportTheme
+
+# chart_style values accepted by chart_report_flowables
+REPORT_CHART_STYLES = CHART_STYLES + ('both',)
+
+# Highlight of the running dasha rows
+_CURRENT_ROW = colors.HexColor('#fbf3d5')
+
+
+def _date(value: datetime) -> str:
+    return value.strftime('%d %b %Y')
+
+
+def _table(theme: ReportTheme, header: Sequence[str], rows: List[Sequence], widths: List[float],
+           align: str = '', highlight: Optional[int] = None) -> Table:
+    """
+    Themed table of escaped text
+
+    Args:
+        theme: Report theme
+        header: Column titles
+        rows: Cell values (converted with str())
+        widths: Column widths in points
+        align: Per-column alignment, one character per column: l, c or r
+        highlight: Index of a body row to highlight
+
+    Returns:
+        Table with a repeating header row
+    """
+    suffixes = [{'c': '-center', 'r': '-right'}.get(a, '') for a in align.ljust(len(header), 'l')]
+    data = [[Paragraph(escape(str(text), quote=False), theme.styles['TableHeader' + suffix])
+             for text, suffix in zip(header, suffixes)]]
+    for row in rows:
+        data.append([Paragraph(escape(str(text), quote=False), theme.styles['TableCell' + suffix])
+                     for text, suffix in zip(row, suffixes)])
+
+    table = Table(data, colWidths=widths, repeatRows=1, hAlign='LEFT')
+    table.setStyle(theme.table_style)
+    if highlight is not None:
+        table.setStyle(TableStyle([('BACKGROUND', (0, highlight + 1), (-1, highlight + 1), _CURRENT_ROW)]))
+    return table
+
+
+def _birth_details(chart: ChartData, theme: ReportTheme, width: float) -> Table:
+    birth = chart.birth_info
+    moon = next((p for p in chart.planets if p.name == 'Moon'), None)
+    rows = [
+        ('Name', birth.name or ''),
+        ('Date of birth', birth.birth_date.strftime('%d %B %Y')),
+        ('Time of birth', f"{birth.birth_time.strftime('%H:%M:%S')} ({birth.timezone})"),
+        ('Coordinates', f"{birth.latitude:.4f}, {birth.longitude:.4f}"),
+        ('Ayanamsha', f"{birth.ayanamsha.title()} ({chart.ayanamsha:.4f}°)"),
+        ('Lagna', f"{chart.lagna.sign} {chart.lagna.degree_in_sign:.2f}°, {chart.lagna.nakshatra}"),
+    ]
+    if moon is not None:
+        rows.append(('Moon nakshatra', f"{moon.nakshatra} pada {moon.pada} (lord {moon.nakshatra_lord})"))
+    return _table(theme, ('Birth details', ''), rows, [width * 0.3, width * 0.7])
+
+
+def _charts(chart: ChartData, theme: ReportTheme, width: float, chart_style: str) -> Table:
+    styles = CHART_STYLES if chart_style == 'both' else (chart_style,)
+    size = min(width / len(styles) - 12, 230)
+    drawings = [kundli_drawing(chart, style, size, stroke=theme.primary, text_color=theme.text,
+                               font=theme.font, bold_font=theme.bold_font)
+                for style in styles]
+    captions = [Paragraph(f"{style.title()} Indian", theme.styles['TableCell-center']) for style in styles]
+    table = Table([drawings, captions], colWidths=[width / len(styles)] * len(styles))
+    table.setStyle(TableStyle([('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                               ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')]))
+    return table
+
+
+def _planets(chart: ChartData, theme: ReportTheme, width: float) -> Table:
+    rows = [(planet.name + (' (R)' if planet.is_retrograde else ''), planet.sign,
+             f"{planet.degree_in_sign:.2f}°", planet.house, planet.nakshatra, planet.pada,
+             planet.dignity.replace('_', ' '))
+            for planet in [chart.lagna] + chart.planets]
+    fractions = [0.15, 0.14, 0.11, 0.1, 0.22, 0.08, 0.2]
+    return _table(theme, ('Planet', 'Sign', 'Degree', 'House', 'Nakshatra', 'Pada', 'Dignity'),
+                  rows, [width * f for f in fractions], align='llrclcl')
+
+
+def _dashas(chart: ChartData, theme: ReportTheme, width: float, as_of: datetime) -> List[Flowable]:
+    balance = chart.dasha_at_birth.balance_at_birth
+    timeline = timeline_from_balance(chart.dasha_at_birth.birth_date, balance['nakshatra_lord'],
+                                     balance['balance_years'], depth=2)
+    active = timeline.active(timeline.offset(as_of))
+    fractions = [0.3, 0.27, 0.27, 0.16]
+
+    def table(title: str, level: int, rows: range) -> List[Flowable]:
+        data = []
+        for row in rows:
+            start, end = timeline.span(level, row)
+            data.append((' / '.join(timeline.lord_path(level, row)), _date(timeline.to_datetime(start)),
+                         _date(timeline.to_datetime(end)), f"{(end - start) / 365.25:.{level + 1}f}"))
+        highlight = active[level] - rows.start if active is not None else None
+        return [
+            Paragraph(title, theme.styles['Subheading']),
+            _table(theme, (LEVEL_NAMES[level].title(), 'Start', 'End', 'Years'), data,
+                   [width * f for f in fractions], align='lllr', highlight=highlight),
+        ]
+
+    story = table('Vimshottari Mahadashas', 0, timeline.rows(0))
+    if active is not None:
+        maha = DASHA_ORDER[timeline.levels[0].lords[active[0]]]
+        story += table(f"Antardashas of the {maha} mahadasha", 1, timeline.rows(1, *timeline.span(0, active[0])))
+    return story
+
+
+def _yogas(chart: ChartData, theme: ReportTheme, width: float) -> List[Flowable]:
+    if not chart.yogas:
+        return [Paragraph('No classical yogas were detected in this chart.', theme.styles['Body'])]
+    rows = [(yoga.name, yoga.type.replace('_', ' '), yoga.strength, ', '.join(yoga.planets_involved),
+             yoga.description)
+            for yoga in chart.yogas]
+    fractions = [0.2, 0.14, 0.12, 0.18, 0.36]
+    return [_table(theme, ('Yoga', 'Type', 'Strength', 'Planets', 'Description'), rows,
+                   [width * f for f in fractions])]
+
+
+def _ashtakavarga(chart: ChartData, theme: ReportTheme, width: float) -> Table:
+    first = width * 0.14
+    cell = (width - first) / 13
+    rows = [[('SAV' if a.planet == 'Sarvashtakavarga' else a.planet)] + list(a.house_scores) + [a.total]
+            for a in chart.ashtakavarga]
+    table = _table(theme, ['Planet'] + [f"H{house}" for house in range(1, 13)] + ['Total'], rows,
+                   [first] + [cell] * 13, align='l' + 'c' * 13)
+    # Thirteen narrow score columns
+    table.setStyle(TableStyle([('LEFTPADDING', (1, 0), (-1, -1), 2),
+                               ('RIGHTPADDING', (1, 0), (-1, -1), 2)]))
+    if rows and rows[-1][0] == 'SAV':
+        table.setStyle(TableStyle([('LINEABOVE', (0, -1), (-1, -1), 1, theme.primary)]))
+    return table
+
+
+def chart_report_flowables(chart: ChartData, theme: ReportTheme, width: float,
+                           chart_style: str = 'both', as_of: Optional[datetime] = None) -> List[Flowable]:
+    """
+    Story of a chart report
+
+    Args:
+        chart: Birth chart
+        theme: Report theme
+        width: Frame width in points (doc.width)
+        chart_style: 'north', 'south' or 'both'
+        as_of: Date that picks the running dasha; naive values are on the
+            birth clock, aware ones are converted to it (default: now)
+
+    Returns:
+        List of flowables, starting with the birth details
+
+    Raises:
+        ValueError: If chart_style is unknown
+    """
+    if chart_style not in REPORT_CHART_STYLES:
+        raise ValueError(f"Unknown chart style '{chart_style}'. Use one of: {', '.join(REPORT_CHART_STYLES)}")
+
+    # Dasha dates are naive local birth time, as in /dasha/current
+    as_of = to_birth_clock(as_of or datetime.now(timezone.utc), chart.birth_info.timezone)
+    heading = theme.styles['Heading']
+
+    story: List[Flowable] = [
+        _birth_details(chart, theme, width),
+        Spacer(1, 0.2 * inch),
+        _charts(chart, theme, width, chart_style),
+        Paragraph('Planetary Positions', heading),
+        _planets(chart, theme, width),
+        Paragraph('Dasha Periods', heading),
+    ]
+    story += _dashas(chart, theme, width, as_of)
+    story.append(Paragraph('Yogas', heading))
+    story += _yogas(chart, theme, width)
+    if chart.ashtakavarga:
+        story += [Paragraph('Ashtakavarga', heading), _ashtakavarga(chart, theme, width)]
+    return story
@@ -0,0 +1,143 @@
+"""
+Compact, array-backed chart used inside the calculation pipeline
+
+Planets live at fixed indices (PLANET_NAMES, the order of
+calculator.PLANETS); positions are float64 arrays and the categorical
+facts (sign, house, nakshatra, pada, dignity) are small-int arrays. The
+pipeline (yogas, ashtakavarga, dasha balance) runs on this type and the
+Pydantic models are only built at the API edge (chart_builder.build_chart).
+"""
+
+from array import array
+from typing import List
+
+import swisseph as swe
+
+from core import calculator
+from core import metrics
+from core.nakshatra import pada_index
+
+PLANET_NAMES = tuple(calculator.PLANETS)
+PLANET_INDEX = {name: index for index, name in enumerate(PLANET_NAMES)}
+
+DIGNITIES = ('exalted', 'debilitated', 'own_sign', 'friend', 'enemy', 'neutral')
+
+# Dignity depends only on (planet, sign): DIGNITY_TABLE[planet][sign] -> DIGNITIES index
+DIGNITY_TABLE = tuple(
+    bytes(DIGNITIES.index(calculator.get_planet_dignity(name, sign * 30.0)) for sign in range(12))
+    for name in PLANET_NAMES
+)
+
+# Lord of each sign as a planet index
+SIGN_LORD_INDEX = tuple(PLANET_INDEX[calculator.SIGN_LORDS[sign]] for sign in calculator.SIGNS)
+
+_RAHU = PLANET_INDEX['Rahu']
+_KETU = PLANET_INDEX['Ketu']
+_COMPUTED = tuple(
+    (index, calculator.PLANETS[name]) for index, name in enumerate(PLANET_NAMES) if name != 'Ketu'
+)
+
+
+class CompactChart:
+    """
+    Positions and per-planet facts in parallel arrays
+
+    Attributes:
+        jd: Julian Day (UT)
+        ayanamsha: Lahiri ayanamsha at jd
+        lagna: Sidereal ascendant longitude
+        longitude, latitude, speed: array('d') indexed like PLANET_NAMES
+        retrograde: array('b') of 0/1
+        sign: array('b') sign index 0-11
+        house: array('b') whole-sign house 1-12
+        nakshatra: array('b') nakshatra index 0-26
+        pada: array('b') pada 1-4
+        dignity: array('b') index into DIGNITIES
+    """
+
+    __slots__ = ('jd', 'ayanamsha', 'lagna', 'longitude', 'latitude', 'speed',
+                 'retrograde', 'sign', 'house', 'nakshatra', 'pada', 'dignity')
+
+    def __init__(self, jd: float, ayanamsha: float, lagna: float,
+                 longitude: array, latitude: array, speed: array, retrograde: array):
+        self.jd = jd
+        self.ayanamsha = ayanamsha
+        self.lagna = lagna
+        self.longitude = longitude
+        self.latitude = latitude
+        self.speed = speed
+        self.retrograde = retrograde
+
+        lagna_sign = int(lagna / 30.0)
+        count = len(longitude)
+        self.sign = array('b', bytes(count))
+        self.house = array('b', bytes(count))
+        self.nakshatra = array('b', bytes(count))
+        self.pada = array('b', bytes(count))
+        self.dignity = array('b', bytes(count))
+
+        for index in range(count):
+            planet_longitude = longitude[index]
+            sign = int(planet_longitude / 30.0)
+            pada = pada_index(planet_longitude)
+            self.sign[index] = sign
+            self.house[index] = (sign - lagna_sign) % 12 + 1
+            self.nakshatra[index] = pada >> 2
+            self.pada[index] = (pada & 3) + 1
+            self.dignity[index] = DIGNITY_TABLE[index][sign]
+
+    @property
+    def lagna_sign(self) -> int:
+        """Sign index of the ascendant"""
+        return int(self.lagna / 30.0)
+
+    def house_lords(self) -> List[int]:
+        """Planet index of the lord of houses 1-12 (list index 0-11)"""
+        lagna_sign = self.lagna_sign
+        return [SIGN_LORD_INDEX[(lagna_sign + offset) % 12] for offset in range(12)]
+
+
+def calc_compact_chart(jd: float, latitude: float, longitude: float) -> CompactChart:
+    """
+    Compute a chart straight into arrays (no per-planet dicts)
+
+    Same values as calculator.calc_planetary_positions and calc_lagna.
+
+    Args:
+        jd: Julian Day (UT)
+        latitude: Geographic latitude
+        longitude: Geographic longitude
+
+    Returns:
+        CompactChart
+    """
+    calculator.ensure_swe_configured()
+    count = len(PLANET_NAMES)
+    longitudes = array('d', bytes(8 * count))
+    latitudes = array('d', bytes(8 * count))
+    speeds = array('d', bytes(8 * count))
+    retrograde = array('b', bytes(count))
+
+    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
+    with metrics.span('ephemeris'):
+        for index, planet_id in _COMPUTED:
+            result = swe.calc_ut(jd, planet_id, flags)[0]
+            longitudes[index] = result[0]
+            latitudes[index] = result[1]
+            speeds[index] = result[3]
+            retrograde[index] = result[3] < 0
+    metrics.count('swisseph_calls', len(_COMPUTED))
+
+    # Ketu is 180° opposite to Rahu; the nodes are always retrograde
+    longitudes[_KETU] = (longitudes[_RAHU] + 180.0) % 360.0
+    latitudes[_KETU] = -latitudes[_RAHU]
+    speeds[_KETU] = -speeds[_RAHU]
+    retrograde[_RAHU] = retrograde[_KETU] = 1
+
+    with metrics.span('lagna'):
+        ayanamsha = calculator.get_ayanamsha(jd)
+        ascendant_tropical = swe.houses_ex(jd, latitude, longitude, b'P')[1][0]
+        lagna = (ascendant_tropical - ayanamsha) % 360.0
+    metrics.count('swisseph_calls')
+
+    return CompactChart(jd, ayanamsha, lagna, longitudes, latitudes, speeds, retrograde)
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from typing import List, Dict
-from .nakshatra import DASHA_YEARS, DASHA_ORDER, get_nakshatra, get_next_dasha_lord
+from .nakshatra import DASHA_YEARS, DASHA_ORDER, NAKSHATRA_SPAN, nakshatra_at, get_next_dasha_lord
 
 
 def calc_dasha_balance(moon_longitude: float, birth_datetime: datetime) -> Dict[str, float]:
@@ -14,17 +14,14 @@ def calc_dasha_balance(moon_longitude: float, birth_datetime: datetime) -> Dict[
     Returns:
         Dict with nakshatra_lord and balance_years
     """
-    nakshatra_info = get_nakshatra(moon_longitude)
-    nakshatra_lord = nakshatra_info['lord']
+    nakshatra_info = nakshatra_at(moon_longitude)
+    nakshatra_lord = nakshatra_info.lord
 
-    # Each nakshatra spans 13°20' (13.333333°)
-    nakshatra_span = 13.333333
-
-    # How far into the nakshatra is the Moon?
-    position_in_nakshatra = moon_longitude - nakshatra_info['degree_range_start']
+    # How far into the nakshatra (13°20' exactly) is the Moon?
+    position_in_nakshatra = moon_longitude % 360.0 - nakshatra_info.degree_range_start
 
     # Fraction of nakshatra completed
-    fraction_completed = position_in_nakshatra / nakshatra_span
+    fraction_completed = position_in_nakshatra / NAKSHATRA_SPAN
 
     # Total years for this nakshatra's lord
     total_years = DASHA_YEARS[nakshatra_lord]
@@ -35,7 +32,7 @@ def calc_dasha_balance(moon_longitude: float, birth_datetime: datetime) -> Dict[
     return {
         'nakshatra_lord': nakshatra_lord,
         'balance_years': balance_years,
-        'nakshatra_name': nakshatra_info['name']
+        'nakshatra_name': nakshatra_info.name
     }
 
 
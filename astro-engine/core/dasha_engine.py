@@ -0,0 +1,516 @@
+"""
+Dasha periods as numeric arrays, for any system in core/dasha_systems.py
+
+Times are float days since the birth instant (0.0 = birth). Datetimes are
+only made at the API edge with DashaTimeline.to_datetime().
+
+Every level is one contiguous pair of arrays:
+
+    bounds: float64, n + 1 period boundaries (period i is bounds[i] to bounds[i + 1])
+    lords:  int8, n lord indices into the system's lords
+
+A period at one level splits into one period per lord below it (nine in
+Vimshottari), in cycle order starting with its own lord, with lengths
+proportional to the lords' years. Level k + 1 therefore holds exactly
+size rows per row of level k: in Vimshottari the children of row i are
+rows 9i to 9i + 8, and the parent of row j is j // 9. No parent pointers
+are stored.
+
+The first mahadasha is only the balance left at birth. Its periods are
+laid out over the whole mahadasha, which starts before birth (a negative
+time); periods that end before birth are skipped and the one running at
+birth is reported from 0.0. (get_current_dasha() lays the sub-periods of
+the first mahadasha out from the birth date instead, which shifts them.)
+
+Lookup of the periods running at time t is one bisect on the deepest
+level's boundaries; the ancestors follow by integer division. A single
+lookup without a timeline (active_periods) bisects one level at a time,
+splitting only the period found.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from core.dasha_systems import VIMSHOTTARI, DashaSystem
+
+LEVEL_NAMES = ('mahadasha', 'antardasha', 'pratyantardasha', 'sookshma', 'prana')
+MAX_DEPTH = len(LEVEL_NAMES)
+
+DAYS_PER_YEAR = 365.25
+
+# Years every timeline covers from birth (one Vimshottari cycle; shorter
+# cycles repeat)
+SPAN_YEARS = 120
+
+
+def vimshottari_start(moon_longitude: float) -> Tuple[int, float]:
+    """
+    Vimshottari dasha running at birth from the Moon's longitude
+
+    Args:
+        moon_longitude: Sidereal longitude of the Moon
+
+    Returns:
+        (lord index into DASHA_ORDER, fraction of its mahadasha already elapsed)
+    """
+    return VIMSHOTTARI.start(moon_longitude)
+
+
+def _mahadashas(system: DashaSystem, lord: int, elapsed: float) -> Tuple[List[float], List[int]]:
+    """
+    Mahadasha boundaries (days since birth) and lords
+
+    The balance, then whole periods until SPAN_YEARS are covered (the same
+    count as get_dasha_sequence). The first boundary is the start of the
+    whole first mahadasha, before birth.
+    """
+    year_list = system.year_list
+    years = year_list[lord]
+    balance = years * (1.0 - elapsed)
+    bounds = [-elapsed * years * DAYS_PER_YEAR]
+    lords = []
+    covered = 0.0
+    while not lords or covered < SPAN_YEARS:
+        current = (lord + len(lords)) % system.size
+        covered += balance if not lords else year_list[current]
+        bounds.append(bounds[-1] + year_list[current] * DAYS_PER_YEAR)
+        lords.append(current)
+    return bounds, lords
+
+
+def _subdivide(system: DashaSystem, bounds: np.ndarray, lords: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Next level down for consecutive periods
+
+    Args:
+        system: Dasha system of the periods
+        bounds: n + 1 boundaries of the parent periods
+        lords: n parent lords
+
+    Returns:
+        (size * n + 1 child boundaries, size * n child lords)
+    """
+    starts = bounds[:-1]
+    grid = starts[:, None] + (bounds[1:] - starts)[:, None] * system.sub_fractions[lords]
+    # Children end exactly where their parent does
+    grid[:, -1] = bounds[1:]
+    child_bounds = np.empty(grid.shape[0] * system.size + 1)
+    child_bounds[:-1] = grid[:, :-1].ravel()
+    child_bounds[-1] = bounds[-1]
+    return child_bounds, system.sub_lords[lords].ravel()
+
+
+def _split(system: DashaSystem, lord: int, low: float, high: float) -> List[float]:
+    """Sub-period boundaries of one period, without NumPy"""
+    span = high - low
+    bounds = [low + span * fraction for fraction in system.sub_fraction_rows[lord]]
+    bounds[-1] = high
+    return bounds
+
+
+class DashaLevel:
+    """
+    One level of the dasha tree
+
+    Attributes:
+        bounds: float64 array of n + 1 boundaries (days since birth)
+        lords: int8 array of n lord indices into the system's lords
+        starts: bounds as a list, for bisect
+    """
+
+    __slots__ = ('bounds', 'lords', 'starts')
+
+    def __init__(self, bounds: np.ndarray, lords: np.ndarray):
+        self.bounds = bounds
+        self.lords = lords
+        self.starts = bounds.tolist()
+
+    def __len__(self) -> int:
+        return len(self.lords)
+
+
+class DashaTimeline:
+    """
+    Dasha periods of one birth, down to a fixed depth
+
+    Attributes:
+        birth: Birth datetime (naive local time, the clock of the API dates)
+        lord: Lord index of the mahadasha running at birth
+        elapsed: Fraction of that mahadasha elapsed at birth
+        system: DashaSystem the periods follow
+        levels: DashaLevel per depth, mahadasha first
+        end: End of the last mahadasha (days since birth)
+    """
+
+    __slots__ = ('birth', 'lord', 'elapsed', 'system', 'levels', 'end', '_deepest', '_divisors')
+
+    def __init__(self, birth: datetime, lord: int, elapsed: float, depth: int = 3,
+                 system: DashaSystem = VIMSHOTTARI):
+        """
+        Args:
+            birth: Birth datetime
+            lord: Lord index of the mahadasha running at birth (system.start)
+            elapsed: Fraction of it elapsed at birth (0 <= elapsed < 1)
+            depth: Levels to generate (1 = mahadashas only, at most MAX_DEPTH)
+            system: Dasha system (default Vimshottari)
+
+        Raises:
+            ValueError: If depth is out of range
+        """
+        if not 1 <= depth <= MAX_DEPTH:
+            raise ValueError(f"depth must be between 1 and {MAX_DEPTH}")
+
+        self.birth = birth
+        self.lord = lord
+        self.elapsed = elapsed
+        self.system = system
+
+        bounds, lords = _mahadashas(system, lord, elapsed)
+        bounds = np.array(bounds)
+        lords = np.array(lords, dtype=np.int8)
+
+        self.levels: List[DashaLevel] = [DashaLevel(bounds, lords)]
+        for _ in range(depth - 1):
+            bounds, lords = _subdivide(system, bounds, lords)
+            self.levels.append(DashaLevel(bounds, lords))
+
+        self.end = self.levels[0].starts[-1]
+        # For active(): rows of every level from a row of the deepest one
+        self._deepest = self.levels[-1].starts
+        self._divisors = tuple(system.size ** (depth - 1 - level) for level in range(depth))
+
+    @property
+    def depth(self) -> int:
+        return len(self.levels)
+
+    @property
+    def balance_years(self) -> float:
+        """Years of the first mahadasha left at birth"""
+        return float(self.system.year_array[self.lord] * (1.0 - self.elapsed))
+
+    def offset(self, moment: datetime) -> float:
+        """Days from birth to moment (naive, same clock as birth)"""
+        return (moment - self.birth) / timedelta(days=1)
+
+    def to_datetime(self, t: float) -> datetime:
+        """Datetime of a time in days since birth"""
+        return self.birth + timedelta(days=t)
+
+    def active(self, t: float) -> Optional[Tuple[int, ...]]:
+        """
+        Rows running at time t, one per level
+
+        Args:
+            t: Days since birth
+
+        Returns:
+            Row index per level (mahadasha first), or None outside 0 <= t < end
+        """
+        if not 0.0 <= t < self.end:
+            return None
+        row = bisect_right(self._deepest, t) - 1
+        rows = []
+        for divisor in self._divisors:
+            rows.append(row // divisor)
+        return tuple(rows)
+
+    def active_rows(self, times) -> np.ndarray:
+        """
+        Vectorized active(): rows running at many times
+
+        Args:
+            times: Array-like of days since birth
+
+        Returns:
+            int array shaped (len(times), depth); rows are -1 where a time
+            is outside the timeline
+        """
+        times = np.asarray(times, dtype=np.float64)
+        deepest = self.levels[-1].bounds
+        rows = np.empty((len(times), len(self.levels)), dtype=np.int64)
+        rows[:, -1] = np.searchsorted(deepest, times, side='right') - 1
+        for level in range(len(self.levels) - 2, -1, -1):
+            rows[:, level] = rows[:, level + 1] // self.system.size
+        rows[(times < 0.0) | (times >= self.end)] = -1
+        return rows
+
+    def tree(self, depth: int, start: float = 0.0, end: Optional[float] = None,
+             digits: int = 5, max_nodes: Optional[int] = None) -> List[List]:
+        """
+        Nested periods down to depth, expanded only inside a window
+
+        Every mahadasha is listed. The sub-periods of a period are listed
+        only when the period overlaps [start, end), so a timeline zoomed
+        to a few years gets the deep levels for those years only. Levels
+        below the timeline's own depth are computed on demand here.
+
+        Args:
+            depth: Levels to return (1-MAX_DEPTH)
+            start / end: Window in days since birth (default: the whole timeline)
+            digits: Decimals of the day offsets (5 = under a second)
+            max_nodes: Raise instead of returning more periods than this
+
+        Returns:
+            List of [lord, start, end] nodes; an expanded node has its
+            children as a fourth element. Lords index the system's lords,
+            times are days since birth.
+
+        Raises:
+            ValueError: If depth or the window is invalid, or max_nodes is exceeded
+        """
+        if not 1 <= depth <= MAX_DEPTH:
+            raise ValueError(f"depth must be between 1 and {MAX_DEPTH}")
+        end = self.end if end is None else end
+        if end <= start:
+            raise ValueError("window end must be after its start")
+
+        system = self.system
+        count = 0
+
+        def expand(bounds: List[float], lords: List[int], level: int) -> List[List]:
+            nonlocal count
+            nodes = []
+            for index, lord in enumerate(lords):
+                low, high = bounds[index], bounds[index + 1]
+                if high <= 0.0:
+                    continue  # ended before birth
+                node = [lord, round(max(low, 0.0), digits), round(high, digits)]
+                if level + 1 < depth and low < end and high > start:
+                    node.append(expand(_split(system, lord, low, high), system.sub_lord_rows[lord], level + 1))
+                nodes.append(node)
+            count += len(nodes)
+            if max_nodes is not None and count > max_nodes:
+                raise ValueError(f"Dasha tree has more than {max_nodes} periods; narrow the window or depth")
+            return nodes
+
+        mahadashas = self.levels[0]
+        return expand(mahadashas.starts, mahadashas.lords.tolist(), 0)
+
+    def span(self, level: int, row: int) -> Tuple[float, float]:
+        """(start, end) of a period in days since birth, clipped to birth"""
+        starts = self.levels[level].starts
+        return max(starts[row], 0.0), starts[row + 1]
+
+    def rows(self, level: int, start: float = 0.0, end: Optional[float] = None) -> range:
+        """
+        Rows of a level that overlap [start, end)
+
+        Args:
+            level: Level index (0 = mahadasha)
+            start / end: Window in days since birth (default: birth to the end)
+
+        Returns:
+            range of row indices
+        """
+        starts = self.levels[level].starts
+        count = len(starts) - 1
+        first = bisect_right(starts, max(start, 0.0)) - 1
+        last = count if end is None else min(bisect_left(starts, end), count)
+        return range(first, max(first, last))
+
+    def periods(self, level: int) -> Iterator[Tuple[int, float, float]]:
+        """(lord index, start, end) of every period of a level after birth"""
+        lords = self.levels[level].lords
+        for row in self.rows(level):
+            start, end = self.span(level, row)
+            yield int(lords[row]), start, end
+
+    def lord_path(self, level: int, row: int) -> List[str]:
+        """Lord names from the mahadasha down to (level, row)"""
+        names, size = self.system.lords, self.system.size
+        path = []
+        for depth in range(level, -1, -1):
+            path.append(names[self.levels[depth].lords[row]])
+            row //= size
+        path.reverse()
+        return path
+
+    def period_dict(self, level: int, row: int) -> Dict:
+        """
+        One period in the dict format of core/dasha.py (ISO date strings)
+
+        Args:
+            level: Level index (0 = mahadasha)
+            row: Row within the level
+
+        Returns:
+            Dict with planet (the lord), start_date, end_date, years, level
+            and, below the mahadasha, parent_planet ("Maha" or "Maha-Antar")
+        """
+        start, end = self.span(level, row)
+        return _period_dict(self.birth, level, self.lord_path(level, row), start, end)
+
+
+def _period_dict(birth: datetime, level: int, path: List[str], start: float, end: float) -> Dict:
+    period = {
+        'planet': path[-1],
+        'start_date': (birth + timedelta(days=start)).isoformat(),
+        'end_date': (birth + timedelta(days=end)).isoformat(),
+        'years': (end - start) / DAYS_PER_YEAR,
+        'level': LEVEL_NAMES[level],
+    }
+    if level:
+        period['parent_planet'] = '-'.join(path[:-1])
+    return period
+
+
+def dasha_timeline(moon_longitude: float, birth: datetime, depth: int = 3,
+                   system: DashaSystem = VIMSHOTTARI) -> DashaTimeline:
+    """
+    Timeline of a birth in any dasha system
+
+    Args:
+        moon_longitude: Sidereal longitude of the Moon at birth
+        birth: Birth datetime (naive local time)
+        depth: Levels to generate (3 = down to pratyantardasha)
+        system: Dasha system (default Vimshottari)
+
+    Returns:
+        DashaTimeline
+    """
+    lord, elapsed = system.start(moon_longitude)
+    return DashaTimeline(birth, lord, elapsed, depth, system)
+
+
+def vimshottari_timeline(moon_longitude: float, birth: datetime, depth: int = 3) -> DashaTimeline:
+    """
+    Vimshottari timeline of a birth
+
+    Args:
+        moon_longitude: Sidereal longitude of the Moon at birth
+        birth: Birth datetime (naive local time)
+        depth: Levels to generate (3 = down to pratyantardasha)
+
+    Returns:
+        DashaTimeline
+    """
+    return dasha_timeline(moon_longitude, birth, depth)
+
+
+def active_periods(lord: int, elapsed: float, t: float, depth: int = 3,
+                   system: DashaSystem = VIMSHOTTARI) -> Optional[List[Tuple[int, float, float]]]:
+    """
+    Periods running at one time, without building a timeline
+
+    Bisects the mahadashas, then splits only the period found at each
+    level: about ten boundaries per level instead of size**level.
+
+    Args:
+        lord: Lord index of the mahadasha running at birth (system.start)
+        elapsed: Fraction of it elapsed at birth
+        t: Days since birth
+        depth: Levels to return (3 = down to pratyantardasha)
+        system: Dasha system (default Vimshottari)
+
+    Returns:
+        (lord index, start, end) per level, mahadasha first, with start
+        clipped to birth; None outside the timeline
+    """
+    bounds, lords = _mahadashas(system, lord, elapsed)
+    if not 0.0 <= t < bounds[-1]:
+        return None
+
+    periods = []
+    for _ in range(depth):
+        index = bisect_right(bounds, t) - 1
+        low, high = bounds[index], bounds[index + 1]
+        current = lords[index]
+        periods.append((current, max(low, 0.0), high))
+
+        bounds = _split(system, current, low, high)
+        lords = system.sub_lord_rows[current]
+    return periods
+
+
+def current_periods(moon_longitude: float, birth: datetime, moment: datetime, depth: int = 3,
+                    system: DashaSystem = VIMSHOTTARI) -> Optional[List[Dict]]:
+    """
+    Periods running at a moment, in the dict format of core/dasha.py
+
+    Args:
+        moon_longitude: Sidereal longitude of the Moon at birth
+        birth: Birth datetime (naive local time)
+        moment: Moment to look up (naive, same clock as birth)
+        depth: Levels to return (3 = down to pratyantardasha)
+        system: Dasha system (default Vimshottari)
+
+    Returns:
+        One period dict per level (mahadasha first), or None outside the
+        timeline
+    """
+    lord, elapsed = system.start(moon_longitude)
+    periods = active_periods(lord, elapsed, (moment - birth) / timedelta(days=1), depth, system)
+    if periods is None:
+        return None
+
+    path = [system.lords[period_lord] for period_lord, _, _ in periods]
+    return [
+        _period_dict(birth, level, path[:level + 1], start, end)
+        for level, (_, start, end) in enumerate(periods)
+    ]
+
+
+def _walk_transitions(system: DashaSystem, bounds: List[float], lords: List[int], level: int,
+                      path: Tuple[int, ...], start: float, end: float,
+                      depth: int) -> Iterator[Tuple[float, int, Tuple[int, ...]]]:
+    for index, lord in enumerate(lords):
+        low, high = bounds[index], bounds[index + 1]
+        if high <= start:
+            continue
+        if low >= end:
+            return
+        lord_path = path + (lord,)
+        # A first sub-period starts with its parent and is reported at the parent's level
+        if index and start <= low and low > 0.0:
+            # The new period's first sub-periods share its lord
+            yield low, level, lord_path + (lord,) * (depth - level - 1)
+        if level + 1 < depth:
+            yield from _walk_transitions(system, _split(system, lord, low, high), system.sub_lord_rows[lord],
+                                         level + 1, lord_path, start, end, depth)
+
+
+def period_transitions(lord: int, elapsed: float, start: float, end: float, depth: int = 3,
+                       system: DashaSystem = VIMSHOTTARI) -> Iterator[Tuple[float, int, Tuple[int, ...]]]:
+    """
+    Period changes of one birth inside a window, in time order
+
+    Only the periods overlapping the window are expanded, so a short
+    window costs a handful of boundary computations per level.
+
+    Args:
+        lord: Lord index of the mahadasha running at birth (system.start)
+        elapsed: Fraction of it elapsed at birth
+        start / end: Window [start, end) in days since birth
+        depth: Deepest level whose changes count (3 = pratyantardasha)
+        system: Dasha system (default Vimshottari)
+
+    Yields:
+        (time, level, lords): time in days since birth; level is the
+        highest level that changes (a new mahadasha also starts a new
+        antardasha and pratyantardasha); lords are the system.lords indices
+        of the new periods from the mahadasha down to depth
+    """
+    bounds, lords = _mahadashas(system, lord, elapsed)
+    return _walk_transitions(system, bounds, lords, 0, (), start, end, depth)
+
+
+def timeline_from_balance(birth: datetime, nakshatra_lord: str, balance_years: float, depth: int = 3,
+                          system: DashaSystem = VIMSHOTTARI) -> DashaTimeline:
+    """
+    Timeline from a stored balance (DashaSequence.balance_at_birth)
+
+    Args:
+        birth: Birth datetime (DashaSequence.birth_date)
+        nakshatra_lord: Lord of the mahadasha running at birth
+        balance_years: Years of it left at birth
+        depth: Levels to generate
+        system: Dasha system the balance belongs to (default Vimshottari)
+
+    Returns:
+        DashaTimeline
+    """
+    lord = system.lords.index(nakshatra_lord)
+    return DashaTimeline(birth, lord, 1.0 - balance_years / system.years[lord], depth, system)
@@ -0,0 +1,169 @@
+"""
+Dasha answers computed from the Moon at birth alone
+
+No chart is built: one Swiss Ephemeris call gives the Moon, and every
+dasha system follows from it (core/dasha_systems.py). The functions take
+and return plain data so the routers can run them on the worker pools.
+
+Query datetimes are naive on the birth clock (the clock of the birth
+data); aware ones are converted to it.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from backports.zoneinfo import ZoneInfo
+
+from schemas.birth_data import BirthData
+from core import calculator
+from core.chart_builder import birth_julian_day
+from core.dasha_engine import LEVEL_NAMES, current_periods, dasha_timeline
+from core.nakshatra import DASHA_ORDER
+from core.dasha_systems import DASHA_SYSTEMS
+
+
+def to_birth_clock(moment: datetime, timezone: str) -> datetime:
+    """
+    Naive datetime on the birth clock
+
+    Args:
+        moment: Naive (already on the birth clock) or aware datetime
+        timezone: IANA time zone of the birth data
+
+    Returns:
+        moment as naive local time in timezone
+    """
+    if moment.tzinfo is not None:
+        return moment.astimezone(ZoneInfo(timezone)).replace(tzinfo=None)
+    return moment
+
+
+def birth_moon(birth_data: BirthData) -> Tuple[datetime, float]:
+    """
+    Naive local birth datetime and sidereal Moon longitude
+
+    Args:
+        birth_data: Birth information
+
+    Returns:
+        Tuple of (birth datetime, Moon longitude)
+    """
+    birth, jd = birth_julian_day(birth_data)
+    return birth, calculator.calc_moon_longitude(jd)
+
+
+def current_dasha_periods(birth_data: BirthData, moments: List[datetime],
+                          system: str = 'vimshottari') -> List[Dict]:
+    """
+    Mahadasha, antardasha and pratyantardasha running at each moment
+
+    Args:
+        birth_data: Birth information
+        moments: Datetimes to look up
+        system: Key in DASHA_SYSTEMS
+
+    Returns:
+        One dict per moment with date (birth clock, ISO) and a period dict
+        (core/dasha.py format) per level; levels are None outside the timeline
+    """
+    birth, moon_longitude = birth_moon(birth_data)
+
+    results = []
+    for moment in moments:
+        moment = to_birth_clock(moment, birth_data.timezone)
+        periods = current_periods(moon_longitude, birth, moment, system=DASHA_SYSTEMS[system])
+        result = {'date': moment.isoformat()}
+        for level, name in enumerate(LEVEL_NAMES[:3]):
+            result[name] = periods[level] if periods else None
+        results.append(result)
+    return results
+
+
+def dasha_tree(birth_data: BirthData, depth: int, start: Optional[datetime] = None,
+               end: Optional[datetime] = None, max_nodes: Optional[int] = None) -> Dict:
+    """
+    Vimshottari periods down to depth, expanded only inside a window
+
+    Args:
+        birth_data: Birth information
+        depth: Levels (1 = mahadasha ... 5 = prana)
+        start / end: Window to expand (default: the whole timeline)
+        max_nodes: Most periods in the tree
+
+    Returns:
+        Dict with birth (ISO), depth, window (days since birth), levels,
+        lords and periods (DashaTimeline.tree)
+
+    Raises:
+        ValueError: If the window is empty or the tree exceeds max_nodes
+    """
+    birth, moon_longitude = birth_moon(birth_data)
+    timeline = dasha_timeline(moon_longitude, birth, depth=1)
+
+    window_start = timeline.offset(to_birth_clock(start, birth_data.timezone)) if start else 0.0
+    window_end = timeline.offset(to_birth_clock(end, birth_data.timezone)) if end else timeline.end
+    periods = timeline.tree(depth, window_start, window_end, max_nodes=max_nodes)
+
+    return {
+        'birth': birth.isoformat(),
+        'depth': depth,
+        'window': [round(max(window_start, 0.0), 5), round(window_end, 5)],
+        'levels': LEVEL_NAMES[:depth],
+        'lords': DASHA_ORDER,
+        'periods': periods
+    }
+
+
+def dasha_systems(birth_data: BirthData, systems: List[str], depth: int,
+                  start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  date: Optional[datetime] = None, max_nodes: Optional[int] = None) -> Dict:
+    """
+    Several dasha systems from one Moon computation
+
+    Args:
+        birth_data: Birth information
+        systems: Keys in DASHA_SYSTEMS (duplicates are ignored)
+        depth: Levels of the trees and current periods
+        start / end: Window to expand in each tree (default: the whole timeline)
+        date: Moment of the current periods (default: now)
+        max_nodes: Most periods per tree
+
+    Returns:
+        Dict with birth (ISO), moon_longitude, date, depth, levels and per
+        system: lords, rulers, years, balance at birth, current periods
+        (None outside the timeline) and periods (DashaTimeline.tree)
+
+    Raises:
+        ValueError: If the window is empty or a tree exceeds max_nodes
+    """
+    birth, moon_longitude = birth_moon(birth_data)
+    timezone = birth_data.timezone
+    moment = to_birth_clock(date or datetime.now(), timezone)
+
+    results = {}
+    for name in dict.fromkeys(systems):
+        system = DASHA_SYSTEMS[name]
+        timeline = dasha_timeline(moon_longitude, birth, depth=1, system=system)
+
+        window_start = timeline.offset(to_birth_clock(start, timezone)) if start else 0.0
+        window_end = timeline.offset(to_birth_clock(end, timezone)) if end else timeline.end
+        results[name] = {
+            'lords': system.lords,
+            'rulers': system.rulers,
+            'years': system.years,
+            'balance': {'lord': system.lords[timeline.lord], 'years': timeline.balance_years},
+            'current': current_periods(moon_longitude, birth, moment, depth, system),
+            'periods': timeline.tree(depth, window_start, window_end, max_nodes=max_nodes)
+        }
+
+    return {
+        'birth': birth.isoformat(),
+        'moon_longitude': moon_longitude,
+        'date': moment.isoformat(),
+        'depth': depth,
+        'levels': LEVEL_NAMES[:depth],
+        'systems': results
+    }
@@ -0,0 +1,149 @@
+"""
+Nakshatra dasha systems as data
+
+A system is fully described by three tables:
+
+    lords:            period lords in cycle order
+    years:            each lord's mahadasha length
+    nakshatra_lords:  per Moon nakshatra, the lord whose mahadasha runs at birth
+
+Everything else is derived. Sub-periods start with the parent's own lord
+and follow the cycle, each proportional to its lord's years. The part of
+the birth mahadasha already elapsed is the Moon's progress through the run
+of consecutive nakshatras sharing that lord: one nakshatra in Vimshottari
+and Yogini, three or four in Ashtottari (Saturn's three include Abhijit).
+
+core/dasha_engine.py generates and looks up periods for any DashaSystem;
+DASHA_SYSTEMS holds them under the names used by user_preferences.dasha_system.
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.nakshatra import DASHA_ORDER, DASHA_YEARS, NAKSHATRA_NAMES
+
+
+class DashaSystem:
+    """
+    One dasha system and its precomputed period tables
+
+    Attributes:
+        name: Key in DASHA_SYSTEMS
+        lords: Period lord names in cycle order
+        years: Mahadasha years per lord (same order)
+        rulers: Planet ruling each lord (the lords themselves for planetary systems)
+        nakshatra_lords: Lord index running at birth, per nakshatra (27)
+        size: Number of lords (sub-periods per period)
+        cycle_years: Length of one full cycle
+    """
+
+    __slots__ = (
+        'name', 'lords', 'years', 'rulers', 'nakshatra_lords', 'size', 'cycle_years',
+        'year_array', 'sub_lords', 'sub_fractions', 'year_list', 'sub_lord_rows', 'sub_fraction_rows',
+        '_run_starts', '_run_lengths'
+    )
+
+    def __init__(self, name: str, lords: Sequence[str], years: Sequence[int],
+                 nakshatra_lords: Sequence[int], rulers: Optional[Sequence[str]] = None):
+        """
+        Args:
+            name: Key in DASHA_SYSTEMS
+            lords: Period lord names in cycle order
+            years: Whole mahadasha years per lord
+            nakshatra_lords: Lord index running at birth for each of the 27 nakshatras
+            rulers: Planet ruling each lord (default: the lords)
+
+        Raises:
+            ValueError: If the tables do not fit together
+        """
+        if len(years) != len(lords) or len(nakshatra_lords) != len(NAKSHATRA_NAMES):
+            raise ValueError(f"{name}: one year count per lord and one lord per nakshatra required")
+
+        self.name = name
+        self.lords = tuple(lords)
+        self.years = tuple(years)
+        self.rulers = tuple(rulers or lords)
+        self.nakshatra_lords = tuple(nakshatra_lords)
+        self.size = size = len(lords)
+        self.cycle_years = sum(years)
+
+        self.year_array = np.array(years, dtype=np.float64)
+        # sub_lords[lord]: the sub-period lords of a period of lord, in order
+        self.sub_lords = np.array([[(lord + offset) % size for offset in range(size)] for lord in range(size)],
+                                  dtype=np.int8)
+        # sub_fractions[lord]: the size + 1 sub-period boundaries as fractions
+        # of the period (cumulative whole years / cycle, so the last is exactly 1.0)
+        self.sub_fractions = np.array(
+            [[sum(years[(lord + offset) % size] for offset in range(count)) / self.cycle_years
+              for count in range(size + 1)]
+             for lord in range(size)]
+        )
+        # The same tables as lists, for expanding single periods without NumPy
+        self.year_list = self.year_array.tolist()
+        self.sub_lord_rows = self.sub_lords.tolist()
+        self.sub_fraction_rows = self.sub_fractions.tolist()
+
+        # First nakshatra and length of the run each nakshatra belongs to
+        count = len(nakshatra_lords)
+        self._run_starts = []
+        self._run_lengths = []
+        for nakshatra, lord in enumerate(nakshatra_lords):
+            start = nakshatra
+            while nakshatra_lords[(start - 1) % count] == lord and (start - 1) % count != nakshatra:
+                start -= 1
+            length = 1
+            while nakshatra_lords[(start + length) % count] == lord and length < count:
+                length += 1
+            self._run_starts.append(start % count)
+            self._run_lengths.append(length)
+
+    def __repr__(self) -> str:
+        return f"DashaSystem({self.name!r})"
+
+    def start(self, moon_longitude: float) -> Tuple[int, float]:
+        """
+        Dasha running at birth from the Moon's longitude
+
+        Args:
+            moon_longitude: Sidereal longitude of the Moon
+
+        Returns:
+            (lord index into lords, fraction of its mahadasha already elapsed)
+        """
+        # Nakshatras are exactly 40/3° wide; see core/nakshatra.py
+        position = moon_longitude % 360.0 * 3.0 / 40.0
+        nakshatra = min(int(position), 26)
+        elapsed = (position - self._run_starts[nakshatra]) % 27 / self._run_lengths[nakshatra]
+        return self.nakshatra_lords[nakshatra], elapsed
+
+
+VIMSHOTTARI = DashaSystem(
+    'vimshottari',
+    DASHA_ORDER,
+    [DASHA_YEARS[lord] for lord in DASHA_ORDER],
+    [nakshatra % len(DASHA_ORDER) for nakshatra in range(27)],
+)
+
+# Eight yoginis of 1-8 years; Ashwini starts with Bhramari
+YOGINI = DashaSystem(
+    'yogini',
+    ['Mangala', 'Pingala', 'Dhanya', 'Bhramari', 'Bhadrika', 'Ulka', 'Siddha', 'Sankata'],
+    [1, 2, 3, 4, 5, 6, 7, 8],
+    [(nakshatra + 3) % 8 for nakshatra in range(27)],
+    rulers=['Moon', 'Sun', 'Jupiter', 'Mars', 'Mercury', 'Saturn', 'Venus', 'Rahu'],
+)
+
+# 108 years over eight planets (no Ketu); groups of nakshatras from Ardra
+ASHTOTTARI = DashaSystem(
+    'ashtottari',
+    ['Sun', 'Moon', 'Mars', 'Mercury', 'Saturn', 'Jupiter', 'Rahu', 'Venus'],
+    [6, 15, 8, 17, 10, 19, 12, 21],
+    # Ashwini ... Revati: Rahu from Uttara Bhadrapada to Bharani, Venus from
+    # Krittika to Mrigashira, Sun from Ardra to Ashlesha, and so on
+    [6, 6, 7, 7, 7, 0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5, 6, 6],
+)
+
+DASHA_SYSTEMS: Dict[str, DashaSystem] = {
+    system.name: system for system in (VIMSHOTTARI, YOGINI, ASHTOTTARI)
+}
@@ -0,0 +1,108 @@
+"""
+Bulk dasha transitions: every period change for many profiles in a window
+
+Each profile gets a lazy, time-ordered iterator over its period changes
+(dasha_engine.period_transitions, which only expands the periods that
+overlap the window), and heapq.merge interleaves them into one stream:
+
+    profile 0:  Mars-Rahu-Jupiter @ t1, ...
+    profile 1:  Venus-Sun-Moon @ t0, ...        -> t0, t1, ... over all profiles
+
+A week-long window holds at most a couple of changes per profile, so the
+scan costs a few list operations per profile and never builds a timeline.
+
+A profile is either a cached Moon longitude with its birth Julian Day or
+full birth data, in which case only the Moon is computed (one Swiss
+Ephemeris call, no houses or other planets).
+"""
+
+import heapq
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core import calculator
+from core.chart_builder import birth_julian_day
+from core.dasha_engine import LEVEL_NAMES, period_transitions, vimshottari_start
+from core.nakshatra import DASHA_ORDER
+from schemas.birth_data import BirthData
+
+
+def moon_at_birth(birth_data: BirthData) -> Tuple[float, float]:
+    """
+    Birth Julian Day (UT) and sidereal Moon longitude, all a dasha needs
+
+    Args:
+        birth_data: Birth information
+
+    Returns:
+        Tuple of (Julian Day in UT, Moon longitude)
+    """
+    _, jd = birth_julian_day(birth_data)
+    return jd, calculator.calc_moon_longitude(jd)
+
+
+def _profile_transitions(index: int, birth_jd: float, moon_longitude: float,
+                         start_jd: float, end_jd: float, depth: int) -> Iterator[Tuple[float, int, int, Tuple[int, ...]]]:
+    lord, elapsed = vimshottari_start(moon_longitude)
+    for time, level, lords in period_transitions(lord, elapsed, start_jd - birth_jd, end_jd - birth_jd, depth):
+        yield birth_jd + time, index, level, lords
+
+
+def scan_dasha_transitions(
+    start_jd: float,
+    end_jd: float,
+    profile_ids: List[str],
+    birth_jds: Optional[List[float]] = None,
+    moon_longitudes: Optional[List[float]] = None,
+    profiles: Optional[List[BirthData]] = None,
+    depth: int = 3,
+) -> Dict:
+    """
+    Period changes of many profiles in [start_jd, end_jd), in time order
+
+    Args:
+        start_jd / end_jd: Window as Julian Days (UT)
+        profile_ids: Caller's id per profile
+        birth_jds: Birth Julian Day (UT) per profile, with moon_longitudes
+        moon_longitudes: Sidereal Moon longitude at birth per profile
+        profiles: Birth data per profile, instead of birth_jds/moon_longitudes
+        depth: Deepest level whose changes count (3 = pratyantardasha)
+
+    Returns:
+        Dict with window info and columnar transitions: profile_id, jd,
+        level (highest level that changes) and lords (the new periods'
+        lords from mahadasha down to depth, joined with '-')
+
+    Raises:
+        ValueError: If the profile columns differ in length
+    """
+    if profiles is not None:
+        birth_jds, moon_longitudes = zip(*map(moon_at_birth, profiles)) if profiles else ((), ())
+    if birth_jds is None or moon_longitudes is None:
+        raise ValueError("Provide profiles or birth_jds with moon_longitudes")
+    if not len(profile_ids) == len(birth_jds) == len(moon_longitudes):
+        raise ValueError("profile_ids must have one entry per profile")
+
+    streams = [
+        _profile_transitions(index, birth_jd, moon_longitude, start_jd, end_jd, depth)
+        for index, (birth_jd, moon_longitude) in enumerate(zip(birth_jds, moon_longitudes))
+    ]
+
+    ids, jds, levels, lords = [], [], [], []
+    for jd, index, level, path in heapq.merge(*streams):
+        ids.append(profile_ids[index])
+        jds.append(jd)
+        levels.append(LEVEL_NAMES[level])
+        lords.append('-'.join(DASHA_ORDER[lord] for lord in path))
+
+    return {
+        'start_jd': start_jd,
+        'end_jd': end_jd,
+        'profiles': len(profile_ids),
+        'depth': depth,
+        'transitions': {
+            'profile_id': ids,
+            'jd': jds,
+            'level': levels,
+            'lords': lords,
+        },
+    }
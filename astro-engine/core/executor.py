@@ -0,0 +1,208 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from core import calculator, metrics
+from core.profiler import install_worker_hook, request_path
+
+# "process" (default) gives real parallelism for Swiss Ephemeris and
+# ReportLab; "thread" trades that for lower per-call overhead.
+POOL_KIND = os.getenv("POOL_KIND", "process")
+
+
+class PoolSaturatedError(Exception):
+    """Raised when a pool already has its maximum number of queued jobs"""
+
+    def __init__(self, pool_name: str, retry_after: int):
+        super().__init__(f"{pool_name} pool is saturated, retry in {retry_after}s")
+        self.pool_name = pool_name
+        self.retry_after = retry_after
+
+
+class ComputePool:
+    """
+    Bounded worker pool for CPU-bound work called from async handlers
+
+    At most max_workers jobs run at once and at most max_queue more wait
+    for a free worker. Anything beyond that is rejected immediately with
+    PoolSaturatedError so the API can answer 503 instead of piling up
+    latency. The in-flight counter is only touched from the event loop,
+    so it needs no lock. With max_tasks_per_child, process workers are
+    replaced after that many jobs, which returns memory that a large job
+    grew the heap by.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int,
+                 retry_after: int = 1, kind: str = POOL_KIND,
+                 max_tasks_per_child: Optional[int] = None):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.retry_after = retry_after
+        self.kind = kind
+        self.max_tasks_per_child = max_tasks_per_child or None
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor: Optional[Executor] = None
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs accepted but still waiting for a worker"""
+        return max(0, self.in_flight - self.max_workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.name}-pool",
+                )
+            else:
+                # spawn: never fork a process that is running an event loop and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=install_worker_hook,
+                    initargs=(request_path(),),
+                    max_tasks_per_child=self.max_tasks_per_child,
+                )
+        return self._executor
+
+    def warm_up(self) -> None:
+        """Start every worker now so the first requests don't pay for it"""
+        executor = self._get_executor()
+        futures = [executor.submit(calculator.ensure_swe_configured) for _ in range(self.max_workers)]
+        for future in futures:
+            future.result()
+
+    def check_capacity(self) -> None:
+        """
+        Reject now if run() would reject a job submitted at this moment
+
+        Raises:
+            PoolSaturatedError: If all workers are busy and the queue is full
+        """
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError(self.name, self.retry_after)
+
+    def reserve(self) -> None:
+        """
+        Claim a slot now for a run(..., reserved=True) that starts later
+
+        For work accepted synchronously (e.g. a queued job answered 202)
+        that reaches run() from a task: without the reservation a burst
+        would pass check_capacity() before any of it counts as in flight.
+        Give the slot back with release() if that run() never starts.
+
+        Raises:
+            PoolSaturatedError: If all workers are busy and the queue is full
+        """
+        self.check_capacity()
+        self.in_flight += 1
+
+    def release(self) -> None:
+        """Return a slot from reserve() whose run() never started"""
+        self.in_flight -= 1
+
+    async def run(self, fn: Callable, *args: Any, reserved: bool = False) -> Any:
+        """
+        Run fn(*args) on the pool without blocking the event loop
+
+        Args:
+            fn: Module-level callable (must be picklable for process pools)
+            *args: Positional arguments for fn
+            reserved: The caller already holds a slot from reserve()
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            PoolSaturatedError: If all workers are busy and the queue is full
+        """
+        if not reserved:
+            self.check_capacity()
+            self.in_flight += 1
+
+        try:
+            loop = asyncio.get_running_loop()
+            if not metrics.METRICS_ENABLED:
+                return await loop.run_in_executor(self._get_executor(), partial(fn, *args))
+
+            # The job's stage timings come back with its result (see core/metrics.py)
+            result, spans, counts = await loop.run_in_executor(
+                self._get_executor(), partial(metrics.traced_call, fn, time.time(), *args)
+            )
+            metrics.merge_job(spans, counts)
+            return result
+        finally:
+            self.in_flight -= 1
+
+    def start(self, fn: Callable, *args: Any) -> "asyncio.Task":
+        """
+        Claim a slot now and run fn(*args) on the pool in a new task
+
+        Lets a caller keep several jobs going at once (e.g. a streamed
+        batch) with each one counted in flight from the moment it is
+        started. Must be called from the event loop.
+
+        Args:
+            fn: Module-level callable (must be picklable for process pools)
+            *args: Positional arguments for fn
+
+        Returns:
+            Task resolving to whatever fn returns
+
+        Raises:
+            PoolSaturatedError: If all workers are busy and the queue is full
+        """
+        self.reserve()
+        started = []
+
+        async def reserved_run():
+            started.append(True)
+            return await self.run(fn, *args, reserved=True)
+
+        task = asyncio.ensure_future(reserved_run())
+        # Cancelled before its first step: run() never got to free the slot
+        task.add_done_callback(lambda task: started or self.release())
+        return task
+
+    def shutdown(self) -> None:
+        """Stop the workers (called on app shutdown)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Charts and dashas: short jobs, sized to the machine
+compute_pool = ComputePool(
+    name="compute",
+    max_workers=int(os.getenv("COMPUTE_WORKERS", "0")) or (os.cpu_count() or 1),
+    max_queue=int(os.getenv("COMPUTE_QUEUE_DEPTH", "64")),
+    retry_after=int(os.getenv("COMPUTE_RETRY_AFTER", "1")),
+)
+
+# PDF rendering: long jobs, kept apart so they cannot delay chart requests
+pdf_pool = ComputePool(
+    name="pdf",
+    max_workers=int(os.getenv("PDF_WORKERS", "2")),
+    max_queue=int(os.getenv("PDF_QUEUE_DEPTH", "8")),
+    retry_after=int(os.getenv("PDF_RETRY_AFTER", "5")),
+    max_tasks_per_child=int(os.getenv("PDF_MAX_TASKS_PER_CHILD", "50")),
+)
+
+# Queued PDF jobs (/pdf/jobs): nobody waits on the connection, so a deep
+# queue and a long Retry-After; separate workers keep them from delaying
+# the synchronous /pdf/report
+pdf_job_pool = ComputePool(
+    name="pdf_jobs",
+    max_workers=int(os.getenv("PDF_JOB_WORKERS", "1")),
+    max_queue=int(os.getenv("PDF_JOB_QUEUE_DEPTH", "100")),
+    retry_after=int(os.getenv("PDF_JOB_RETRY_AFTER", "30")),
+    max_tasks_per_child=int(os.getenv("PDF_MAX_TASKS_PER_CHILD", "50")),
+)
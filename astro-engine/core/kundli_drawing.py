@@ -0,0 +1,177 @@
+"""
+Vector kundli (rasi chart) diagrams for PDF reports
+
+Two layouts:
+
+- north: the diamond chart; houses are fixed (1 at the top, running
+  counter-clockwise) and each house shows the number of its sign;
+- south: the 4x4 grid; signs are fixed (Pisces top-left, running
+  clockwise) and the lagna's sign is marked with a diagonal and "Asc".
+
+The parts that do not depend on the chart (frame lines and the anchor
+point of every house or sign cell) are built once per (style, size,
+colour) and shared by every drawing; a chart only adds its text.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+from reportlab.graphics.shapes import Drawing, Group, Line, Polygon, Rect, String
+from reportlab.lib import colors
+
+from schemas.birth_data import ChartData
+from core.calculator import SIGNS
+
+CHART_STYLES = ('north', 'south')
+
+PLANET_ABBREVIATIONS = {
+    'Sun': 'Su', 'Moon': 'Mo', 'Mars': 'Ma', 'Mercury': 'Me', 'Jupiter': 'Ju',
+    'Venus': 'Ve', 'Saturn': 'Sa', 'Rahu': 'Ra', 'Ketu': 'Ke',
+}
+
+# North chart, unit square (y up): house -> (centre of the house, its inner corner)
+_NORTH_HOUSES = {
+    1: ((0.5, 0.75), (0.5, 0.5)),
+    2: ((0.25, 0.917), (0.25, 0.75)),
+    3: ((0.083, 0.75), (0.25, 0.75)),
+    4: ((0.25, 0.5), (0.5, 0.5)),
+    5: ((0.083, 0.25), (0.25, 0.25)),
+    6: ((0.25, 0.083), (0.25, 0.25)),
+    7: ((0.5, 0.25), (0.5, 0.5)),
+    8: ((0.75, 0.083), (0.75, 0.25)),
+    9: ((0.917, 0.25), (0.75, 0.25)),
+    10: ((0.75, 0.5), (0.5, 0.5)),
+    11: ((0.917, 0.75), (0.75, 0.75)),
+    12: ((0.75, 0.917), (0.75, 0.75)),
+}
+
+# South chart: sign index (0 = Aries) -> (column, row from the top) of its cell
+_SOUTH_CELLS = {
+    11: (0, 0), 0: (1, 0), 1: (2, 0), 2: (3, 0),
+    10: (0, 1), 3: (3, 1),
+    9: (0, 2), 4: (3, 2),
+    8: (0, 3), 7: (1, 3), 6: (2, 3), 5: (3, 3),
+}
+
+_SIGN_INDEX = {sign: index for index, sign in enumerate(SIGNS)}
+
+
+@lru_cache(maxsize=32)
+def _frame(style: str, size: float, color: colors.Color) -> Group:
+    """Static lines of an empty chart (shared, never modified)"""
+    group = Group(Rect(0, 0, size, size, fillColor=None, strokeColor=color, strokeWidth=1.2))
+
+    if style == 'north':
+        half = size / 2
+        group.add(Line(0, 0, size, size, strokeColor=color, strokeWidth=0.8))
+        group.add(Line(0, size, size, 0, strokeColor=color, strokeWidth=0.8))
+        group.add(Polygon([half, size, size, half, half, 0, 0, half],
+                          fillColor=None, strokeColor=color, strokeWidth=0.8))
+    else:
+        quarter = size / 4
+        for step in (1, 3):
+            group.add(Line(step * quarter, 0, step * quarter, size, strokeColor=color, strokeWidth=0.8))
+            group.add(Line(0, step * quarter, size, step * quarter, strokeColor=color, strokeWidth=0.8))
+        for start, end in ((0, quarter), (3 * quarter, size)):
+            group.add(Line(2 * quarter, start, 2 * quarter, end, strokeColor=color, strokeWidth=0.8))
+            group.add(Line(start, 2 * quarter, end, 2 * quarter, strokeColor=color, strokeWidth=0.8))
+    return group
+
+
+@lru_cache(maxsize=32)
+def _anchors(style: str, size: float) -> Dict[int, Tuple[Tuple[float, float], Tuple[float, float]]]:
+    """
+    Text anchors per house (north) or sign index (south)
+
+    Returns:
+        key -> ((x, y) of the planet list's first line, (x, y) of the label)
+    """
+    anchors = {}
+    if style == 'north':
+        for house, ((cx, cy), (ix, iy)) in _NORTH_HOUSES.items():
+            label = (cx + 0.45 * (ix - cx), cy + 0.45 * (iy - cy))
+            anchors[house] = ((cx * size, cy * size), (label[0] * size, label[1] * size))
+    else:
+        quarter = size / 4
+        for sign_index, (column, row) in _SOUTH_CELLS.items():
+            left, top = column * quarter, size - row * quarter
+            anchors[sign_index] = ((left + quarter / 2, top - quarter * 0.42),
+                                   (left + 4, top - 10))
+    return anchors
+
+
+def _planet_labels(chart: ChartData, style: str) -> Dict[int, List[str]]:
+    labels: Dict[int, List[str]] = {}
+    for planet in chart.planets:
+        key = planet.house if style == 'north' else _SIGN_INDEX[planet.sign]
+        text = PLANET_ABBREVIATIONS.get(planet.name, planet.name[:2])
+        labels.setdefault(key, []).append(text + ('(R)' if planet.is_retrograde else ''))
+    return labels
+
+
+def kundli_drawing(chart: ChartData, style: str = 'north', size: float = 220,
+                   stroke: Union[str, colors.Color] = '#1e2d4a',
+                   text_color: Union[str, colors.Color] = '#0f1729',
+                   font: str = 'Helvetica', bold_font: str = 'Helvetica-Bold') -> Drawing:
+    """
+    Rasi chart as a ReportLab Drawing
+
+    Args:
+        chart: Birth chart
+        style: 'north' or 'south'
+        size: Width and height in points
+        stroke: Colour of the lines (hex string or ReportLab Color)
+        text_color: Colour of planet and sign text
+        font / bold_font: Fonts for labels and planets
+
+    Returns:
+        Drawing that can be placed in a story or a table cell
+
+    Raises:
+        ValueError: If style is unknown
+    """
+    if style not in CHART_STYLES:
+        raise ValueError(f"Unknown chart style '{style}'. Use one of: {', '.join(CHART_STYLES)}")
+
+    ink = colors.toColor(text_color)
+    accent = colors.toColor(stroke)
+
+    drawing = Drawing(size, size)
+    drawing.add(_frame(style, size, accent))
+
+    anchors = _anchors(style, size)
+    font_size = max(6.0, size / 30)
+    lagna_index = _SIGN_INDEX[chart.lagna.sign]
+
+    # House / sign labels
+    if style == 'north':
+        for house, (_, (x, y)) in anchors.items():
+            sign_number = (lagna_index + house - 1) % 12 + 1
+            drawing.add(String(x, y - font_size / 3, str(sign_number), fontName=font,
+                               fontSize=font_size * 0.8, fillColor=accent, textAnchor='middle'))
+    else:
+        quarter = size / 4
+        for sign_index, (_, (x, y)) in anchors.items():
+            drawing.add(String(x, y, SIGNS[sign_index][:3], fontName=font,
+                               fontSize=font_size * 0.75, fillColor=accent))
+        column, row = _SOUTH_CELLS[lagna_index]
+        left, top = column * quarter, size - row * quarter
+        drawing.add(Line(left, top - quarter * 0.3, left + quarter * 0.3, top,
+                         strokeColor=accent, strokeWidth=0.8))
+        drawing.add(String(size / 2, size / 2 + font_size / 2, chart.birth_info.name or '',
+                           fontName=bold_font, fontSize=font_size, fillColor=ink, textAnchor='middle'))
+        drawing.add(String(size / 2, size / 2 - font_size, 'Rasi', fontName=font,
+                           fontSize=font_size * 0.85, fillColor=accent, textAnchor='middle'))
+
+    # Planets, one per line, centred on the house / cell
+    labels = _planet_labels(chart, style)
+    if style == 'south':
+        labels.setdefault(lagna_index, []).insert(0, 'Asc')
+    line_height = font_size * 1.15
+    for key, texts in labels.items():
+        (x, y), _ = anchors[key]
+        top = y + (len(texts) - 1) * line_height / 2
+        for offset, text in enumerate(texts):
+            drawing.add(String(x, top - offset * line_height - font_size / 3, text, fontName=bold_font,
+                               fontSize=font_size, fillColor=ink, textAnchor='middle'))
+    return drawing
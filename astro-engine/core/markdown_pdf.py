@@ -0,0 +1,398 @@
+"""
+Markdown to ReportLab flowables in a single pass
+
+Blocks are read line by line, and every line is classified once. Inline
+markup is tokenized left to right with a delimiter stack. The cost is
+therefore linear in the length of the text, including malformed input such
+as unclosed emphasis or stray backticks, which the LLM-written reports
+produce now and then.
+
+User text is escaped before it reaches ReportLab's paragraph markup, and
+the tags this module emits are always balanced (unmatched delimiters are
+kept as literal text), so no input makes Paragraph raise.
+
+Supported:
+
+- ATX headings (`#` to `######`);
+- paragraphs, with hard breaks from two trailing spaces or a backslash;
+- `**bold**`, `*italic*`, `***both***` and the `_` forms (not inside words);
+- `~~strike~~`, `` `code` `` and `[links](https://...)`;
+- bullet (`-`, `*`, `+`) and numbered lists, nested by indentation;
+- GFM pipe tables with column alignment;
+- fenced code blocks, block quotes (`>`) and horizontal rules.
+"""
+
+import re
+from html import escape
+from typing import Dict, List, Optional, Set, Tuple
+
+from reportlab.platypus import (
+    Flowable, HRFlowable, ListFlowable, ListItem, Paragraph, Preformatted, Table
+)
+
+from core.report_theme import ReportTheme
+
+_HEADING = re.compile(r'^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$')
+_FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+_RULE = re.compile(r'^ {0,3}([-*_])(?:[ \t]*\1){2,}[ \t]*$')
+_LIST_ITEM = re.compile(r'^([ \t]*)([-*+]|\d{1,9}[.)])(?:[ \t]+(.*)|[ \t]*$)')
+_TABLE_DELIMITER = re.compile(r'^[ \t]*\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)*\|?[ \t]*$')
+_CELL_SPLIT = re.compile(r'(?<!\\)\|')
+
+# Backslash escapes, code spans, emphasis runs, links, hard breaks
+_INLINE = re.compile(r'\\([!-/:-@\[-`{-~])|(`+)|(\*+|_+|~~)|(\[)|(\n)')
+_LINK = re.compile(r'\[([^\[\]\n]*)\]\(([^()\s]+)\)')
+_SAFE_URL = re.compile(r'^(?:https?://|mailto:)', re.IGNORECASE)
+
+_OPEN_TAGS = {'*': '<i>', '**': '<b>', '***': '<b><i>', '~~': '<strike>'}
+_CLOSE_TAGS = {'*': '</i>', '**': '</b>', '***': '</i></b>', '~~': '</strike>'}
+
+# Courier-like fonts are about this wide per point of font size
+_MONO_CHAR_WIDTH = 0.6
+
+
+def inline_markup(text: str, mono_font: str = 'Courier', link_color: Optional[str] = None) -> str:
+    """
+    Convert inline Markdown to ReportLab paragraph markup
+
+    Args:
+        text: One block's text; '\\n' marks a hard line break
+        mono_font: Font for code spans
+        link_color: Hex colour for links (default: ReportLab's)
+
+    Returns:
+        Escaped, balanced paragraph markup
+    """
+    out: List[str] = []
+    # Openers not yet matched: (index of their placeholder in out, delimiter)
+    stack: List[Tuple[int, str]] = []
+    open_counts: Dict[str, int] = {}
+    # Backtick run lengths known to have no closer further on
+    unclosed_ticks: Set[int] = set()
+    pos = 0
+    end = len(text)
+
+    while pos < end:
+        match = _INLINE.search(text, pos)
+        if match is None:
+            out.append(escape(text[pos:], quote=False))
+            break
+        start = match.start()
+        if start > pos:
+            out.append(escape(text[pos:start], quote=False))
+        pos = match.end()
+        escaped, ticks, delimiter, bracket, newline = match.groups()
+
+        if escaped is not None:
+            out.append(escape(escaped, quote=False))
+
+        elif ticks is not None:
+            close = -1 if len(ticks) in unclosed_ticks else text.find(ticks, pos)
+            if close < 0:
+                unclosed_ticks.add(len(ticks))
+                out.append(ticks)
+            else:
+                code = escape(text[pos:close].strip(), quote=False)
+                out.append(f'<font face="{mono_font}">{code}</font>')
+                pos = close + len(ticks)
+
+        elif delimiter is not None:
+            before = text[start - 1] if start > 0 else ' '
+            after = text[pos] if pos < end else ' '
+            key = delimiter.replace('_', '*')
+            can_open = not after.isspace()
+            can_close = not before.isspace()
+            if delimiter[0] == '_':
+                # No emphasis inside words: snake_case stays as written
+                can_open = can_open and not before.isalnum()
+                can_close = can_close and not after.isalnum()
+
+            if key not in _OPEN_TAGS:
+                out.append(delimiter)
+            elif can_close and open_counts.get(delimiter):
+                # Openers above the match were never closed; they stay literal
+                while True:
+                    index, opener = stack.pop()
+                    open_counts[opener] -= 1
+                    if opener == delimiter:
+                        break
+                out[index] = _OPEN_TAGS[key]
+                out.append(_CLOSE_TAGS[key])
+            elif can_open:
+                stack.append((len(out), delimiter))
+                open_counts[delimiter] = open_counts.get(delimiter, 0) + 1
+                out.append(delimiter)
+            else:
+                out.append(delimiter)
+
+        elif bracket is not None:
+            link = _LINK.match(text, start)
+            if link is None:
+                out.append('[')
+            else:
+                label, url = link.groups()
+                label = inline_markup(label, mono_font, link_color) or escape(url, quote=False)
+                if _SAFE_URL.match(url):
+                    color = f' color="{link_color}"' if link_color else ''
+                    out.append(f'<link href="{escape(url)}"{color}><u>{label}</u></link>')
+                else:
+                    out.append(label)
+                pos = link.end()
+
+        else:
+            out.append('<br/>')
+
+    return ''.join(out)
+
+
+def _is_table(lines: List[str], i: int) -> bool:
+    return '|' in lines[i] and i + 1 < len(lines) and bool(_TABLE_DELIMITER.match(lines[i + 1]))
+
+
+def _starts_block(lines: List[str], i: int) -> bool:
+    """Whether lines[i] opens a block other than a paragraph or list"""
+    line = lines[i]
+    return bool(_FENCE.match(line) or _HEADING.match(line) or _RULE.match(line)
+                or line.lstrip().startswith('>') or _is_table(lines, i))
+
+
+def _split_row(line: str) -> List[str]:
+    line = line.strip()
+    if line.startswith('|'):
+        line = line[1:]
+    if line.endswith('|') and not line.endswith('\\|'):
+        line = line[:-1]
+    return [cell.strip().replace('\\|', '|') for cell in _CELL_SPLIT.split(line)]
+
+
+def _alignment(delimiter: str) -> str:
+    if delimiter.endswith(':'):
+        return '-center' if delimiter.startswith(':') else '-right'
+    return ''
+
+
+class _List:
+    __slots__ = ('indent', 'ordered', 'start', 'items')
+
+    def __init__(self, indent: int, ordered: bool, start: int):
+        self.indent = indent
+        self.ordered = ordered
+        self.start = start
+        # Each item: [text lines, nested lists]
+        self.items: List[Tuple[List[str], List['_List']]] = []
+
+
+class MarkdownRenderer:
+    """Turns Markdown into flowables styled by a ReportTheme"""
+
+    def __init__(self, theme: ReportTheme, width: float):
+        """
+        Args:
+            theme: Styles for every block type
+            width: Frame width in points (for tables and code wrapping)
+        """
+        self.theme = theme
+        self.styles = theme.styles
+        self.width = width
+        self.link_color = theme.primary.hexval().replace('0x', '#')
+        code_style = self.styles['Code']
+        self.code_columns = max(20, int((width - code_style.leftIndent) /
+                                        (code_style.fontSize * _MONO_CHAR_WIDTH)))
+
+    def inline(self, text: str) -> str:
+        return inline_markup(text, self.theme.mono_font, self.link_color)
+
+    def render(self, text: str) -> List[Flowable]:
+        """
+        Flowables for a whole Markdown document
+
+        Args:
+            text: Markdown source
+
+        Returns:
+            List of flowables in document order
+        """
+        lines = text.expandtabs(4).splitlines()
+        story: List[Flowable] = []
+        paragraph: List[str] = []
+        i = 0
+
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+
+            if not stripped:
+                self._flush(paragraph, story)
+                i += 1
+                continue
+
+            blocks = None
+            if _FENCE.match(line):
+                blocks, i = self._code(lines, i)
+            elif _HEADING.match(line):
+                blocks, i = [self._heading(line)], i + 1
+            elif _RULE.match(line):
+                blocks, i = [HRFlowable(width='100%', thickness=0.5, color=self.theme.primary,
+                                        spaceBefore=6, spaceAfter=10)], i + 1
+            elif stripped.startswith('>'):
+                blocks, i = self._quote(lines, i)
+            elif _is_table(lines, i):
+                blocks, i = self._table(lines, i)
+            elif _LIST_ITEM.match(line):
+                blocks, i = self._list(lines, i)
+
+            if blocks is None:
+                paragraph.append(line)
+                i += 1
+            else:
+                self._flush(paragraph, story)
+                story.extend(blocks)
+
+        self._flush(paragraph, story)
+        return story
+
+    def _join(self, lines: List[str]) -> str:
+        """Paragraph text: soft line breaks become spaces, hard ones '\\n'"""
+        parts = []
+        for index, line in enumerate(lines):
+            hard = line.endswith('  ') or line.rstrip().endswith('\\')
+            text = line.strip()
+            if hard and text.endswith('\\'):
+                text = text[:-1].rstrip()
+            parts.append(text)
+            if index < len(lines) - 1:
+                parts.append('\n' if hard else ' ')
+        return ''.join(parts)
+
+    def _flush(self, paragraph: List[str], story: List[Flowable]) -> None:
+        if paragraph:
+            story.append(Paragraph(self.inline(self._join(paragraph)), self.styles['Body']))
+            paragraph.clear()
+
+    def _heading(self, line: str) -> Paragraph:
+        match = _HEADING.match(line)
+        level = len(match.group(1))
+        style = ('SectionTitle', 'Heading')[level - 1] if level <= 2 else 'Subheading'
+        return Paragraph(self.inline(match.group(2) or ''), self.styles[style])
+
+    def _code(self, lines: List[str], i: int) -> Tuple[List[Flowable], int]:
+        fence = _FENCE.match(lines[i]).group(1)
+        code = []
+        i += 1
+        while i < len(lines):
+            line = lines[i]
+            if line.strip().startswith(fence[0] * len(fence)) and not line.strip().strip(fence[0]):
+                i += 1
+                break
+            code.append(line)
+            i += 1
+        block = Preformatted('\n'.join(code) or ' ', self.styles['Code'], maxLineLength=self.code_columns)
+        return [block], i
+
+    def _quote(self, lines: List[str], i: int) -> Tuple[List[Flowable], int]:
+        quoted = []
+        while i < len(lines) and lines[i].lstrip().startswith('>'):
+            quoted.append(lines[i].lstrip()[1:])
+            i += 1
+        return [Paragraph(self.inline(self._join(quoted)), self.styles['Quote'])], i
+
+    def _table(self, lines: List[str], i: int) -> Tuple[List[Flowable], int]:
+        header = _split_row(lines[i])
+        columns = len(header)
+        aligns = [_alignment(cell) for cell in _split_row(lines[i + 1])]
+        aligns = (aligns + [''] * columns)[:columns]
+        rows = [header]
+        i += 2
+        while i < len(lines) and lines[i].strip() and '|' in lines[i]:
+            row = _split_row(lines[i])
+            rows.append((row + [''] * columns)[:columns])
+            i += 1
+
+        # Columns share the width by their longest cell, none below half an even share
+        longest = [max(len(row[column]) for row in rows) or 1 for column in range(columns)]
+        floor = sum(longest) / (2 * columns)
+        shares = [max(length, floor) for length in longest]
+        total = sum(shares)
+        widths = [self.width * share / total for share in shares]
+
+        data = [
+            [Paragraph(self.inline(cell), self.styles[('TableHeader' if index == 0 else 'TableCell') + align])
+             for cell, align in zip(row, aligns)]
+            for index, row in enumerate(rows)
+        ]
+        table = Table(data, colWidths=widths, repeatRows=1, hAlign='LEFT')
+        table.setStyle(self.theme.table_style)
+        table.spaceAfter = 12
+        return [table], i
+
+    def _list(self, lines: List[str], i: int) -> Tuple[List[Flowable], int]:
+        roots: List[_List] = []
+        stack: List[_List] = []
+        blank = False
+
+        while i < len(lines):
+            line = lines[i]
+            if not line.strip():
+                blank = True
+                i += 1
+                continue
+
+            item = _LIST_ITEM.match(line)
+            indent = len(line) - len(line.lstrip())
+            if item is None:
+                # Indented text continues the last item; so does unindented
+                # text right after it, unless it starts another block
+                if indent == 0 and (blank or _starts_block(lines, i)):
+                    break
+                stack[-1].items[-1][0].append(line)
+                blank = False
+                i += 1
+                continue
+
+            marker = item.group(2)
+            ordered = marker[0].isdigit()
+            while stack and stack[-1].indent > indent:
+                stack.pop()
+            if stack and stack[-1].indent == indent and stack[-1].ordered != ordered:
+                stack.pop()
+            if not stack or stack[-1].indent < indent:
+                node = _List(indent, ordered, int(marker[:-1]) if ordered else 1)
+                if stack:
+                    stack[-1].items[-1][1].append(node)
+                else:
+                    roots.append(node)
+                stack.append(node)
+            stack[-1].items.append(([item.group(3) or ''], []))
+            blank = False
+            i += 1
+
+        return [self._list_flowable(node, 0) for node in roots], i
+
+    def _list_flowable(self, node: _List, depth: int) -> ListFlowable:
+        items = []
+        for text_lines, children in node.items:
+            content = [Paragraph(self.inline(self._join(text_lines)), self.styles['ListItem'])]
+            content.extend(self._list_flowable(child, depth + 1) for child in children)
+            items.append(ListItem(content if len(content) > 1 else content[0]))
+
+        body = self.styles['ListItem']
+        common = dict(leftIndent=18, bulletFontName=body.fontName, bulletFontSize=body.fontSize,
+                      bulletColor=self.theme.primary, spaceAfter=0 if depth else 8)
+        if node.ordered:
+            return ListFlowable(items, bulletType='1', start=node.start, bulletFormat='%s.', **common)
+        return ListFlowable(items, bulletType='bullet', start='•' if depth % 2 == 0 else '–', **common)
+
+
+def markdown_to_flowables(text: str, theme: ReportTheme, width: float) -> List[Flowable]:
+    """
+    Flowables for a Markdown report body
+
+    Args:
+        text: Markdown source
+        theme: Report theme providing the styles
+        width: Available frame width in points
+
+    Returns:
+        List of ReportLab flowables
+    """
+    return MarkdownRenderer(theme, width).render(text)
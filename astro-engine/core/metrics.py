@@ -0,0 +1,276 @@
+"""
+Hot-path instrumentation: stage spans, counters and Prometheus exposition
+
+Code on the hot path marks its stages with `span('yogas')` and counts work
+with `count('swisseph_calls', 8)`. Both are no-ops unless a StageCollector
+is active in the current context, which costs one ContextVar lookup.
+
+Collectors are opened by:
+
+- MetricsMiddleware, once per HTTP request. When the request finishes its
+  spans and counts go into the process-wide registry, and, when
+  SERVER_TIMING is on, into a Server-Timing response header;
+- traced_call, around every job a ComputePool runs. The job's spans and
+  counts travel back with its result (worker processes have their own
+  memory) and are merged into the caller's request collector.
+
+Pool queue depth and cache hit counters are kept by their owners anyway;
+they are read by the collectors registered with add_collector only when
+/metrics is scraped.
+"""
+
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() != "false"
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+# Histogram buckets in seconds
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Sample for add_collector: (metric name, type, help, [(labels, value), ...])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+class StageCollector:
+    """Spans (stage, seconds) and counts recorded during one request or pool job"""
+
+    __slots__ = ('spans', 'counts')
+
+    def __init__(self):
+        self.spans: List[Tuple[str, float]] = []
+        self.counts: Dict[str, int] = {}
+
+    def merge(self, spans: List[Tuple[str, float]], counts: Dict[str, int]) -> None:
+        self.spans.extend(spans)
+        for name, value in counts.items():
+            self.counts[name] = self.counts.get(name, 0) + value
+
+
+_collector: ContextVar[Optional[StageCollector]] = ContextVar('astro_stage_collector', default=None)
+
+
+class span:
+    """
+    Time the enclosed block as one stage of the current request
+
+    A class rather than a @contextmanager generator: entering and leaving
+    costs a fraction of a microsecond, which matters on per-chart paths.
+    """
+
+    __slots__ = ('stage', 'collector', 'started')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> "span":
+        self.collector = _collector.get()
+        if self.collector is not None:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.collector is not None:
+            self.collector.spans.append((self.stage, time.perf_counter() - self.started))
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add to a per-request counter (exported as astro_<name>_total)"""
+    collector = _collector.get()
+    if collector is not None:
+        collector.counts[name] = collector.counts.get(name, 0) + value
+
+
+def traced_call(fn: Callable, submitted_at: float, *args: Any) -> Tuple[Any, List, Dict]:
+    """
+    Run fn(*args) under a fresh collector (executed inside pool workers)
+
+    Args:
+        fn: Job to run
+        submitted_at: time.time() when the job was handed to the pool
+        *args: Positional arguments for fn
+
+    Returns:
+        Tuple of (fn's result, spans including queue wait, counts)
+    """
+    queued = max(0.0, time.time() - submitted_at)
+    collector = StageCollector()
+    token = _collector.set(collector)
+    try:
+        with span(fn.__name__):
+            result = fn(*args)
+    finally:
+        _collector.reset(token)
+    return result, [('queue', queued)] + collector.spans, collector.counts
+
+
+def merge_job(spans: List[Tuple[str, float]], counts: Dict[str, int]) -> None:
+    """Attach a pool job's spans and counts to the current request (or the registry)"""
+    collector = _collector.get()
+    if collector is not None:
+        collector.merge(spans, counts)
+    else:
+        registry.record(spans, counts)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+class Histogram:
+    """Prometheus histogram keyed by label values"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # label values -> [count per bucket..., sum, count]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, label_values: Tuple[str, ...], value: float) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, series in sorted(self._series.items()):
+            labels = dict(zip(self.label_names, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels({**labels, 'le': repr(bound)})} {cumulative}"
+            yield f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {series[-1]}"
+            yield f"{self.name}_sum{_format_labels(labels)} {series[-2]!r}"
+            yield f"{self.name}_count{_format_labels(labels)} {series[-1]}"
+
+
+class MetricsRegistry:
+    """Process-wide request/stage histograms, work counters and scrape-time collectors"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = Histogram(
+            'astro_request_duration_seconds', 'HTTP request latency',
+            ('method', 'route', 'status'), REQUEST_BUCKETS
+        )
+        self.stages = Histogram(
+            'astro_stage_duration_seconds', 'Time spent per calculation stage',
+            ('stage',), STAGE_BUCKETS
+        )
+        self.counters: Dict[str, int] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def record(self, spans: List[Tuple[str, float]], counts: Dict[str, int]) -> None:
+        """Add finished spans and counts"""
+        with self._lock:
+            for stage, seconds in spans:
+                self.stages.observe((stage,), seconds)
+            for name, value in counts.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def record_request(self, method: str, route: str, status: int, seconds: float,
+                       collector: StageCollector) -> None:
+        """Add one finished request and everything it recorded"""
+        with self._lock:
+            self.requests.observe((method, route, str(status)), seconds)
+        self.record(collector.spans, collector.counts)
+
+    def add_collector(self, collect: Callable[[], Iterable[Sample]]) -> None:
+        """Register a callable that yields samples when /metrics is scraped"""
+        self._collectors.append(collect)
+
+    def render(self) -> str:
+        """Everything in Prometheus text exposition format (0.0.4)"""
+        lines = []
+        with self._lock:
+            lines.extend(self.requests.render())
+            lines.extend(self.stages.render())
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"# HELP astro_{name}_total Total {name.replace('_', ' ')} made while serving requests")
+                lines.append(f"# TYPE astro_{name}_total counter")
+                lines.append(f"astro_{name}_total {value}")
+
+        for collect in self._collectors:
+            for name, kind, help_text, values in collect():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in values:
+                    lines.append(f"{name}{_format_labels(labels)} {value!r}")
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+
+def server_timing_header(spans: List[Tuple[str, float]]) -> str:
+    """Server-Timing value with the total milliseconds per stage"""
+    totals: Dict[str, float] = {}
+    for stage, seconds in spans:
+        totals[stage] = totals.get(stage, 0.0) + seconds
+    return ', '.join(f"{stage};dur={seconds * 1000.0:.3f}" for stage, seconds in totals.items())
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that opens a StageCollector per HTTP request
+
+    Requests are labelled with their route template (not the raw path) so
+    the number of series stays bounded.
+    """
+
+    def __init__(self, app, excluded_paths: Tuple[str, ...] = ('/metrics',)):
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or not METRICS_ENABLED or scope['path'] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        collector = StageCollector()
+        token = _collector.set(collector)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                if SERVER_TIMING and collector.spans:
+                    headers = list(message.get('headers', []))
+                    headers.append((b'server-timing', server_timing_header(collector.spans).encode()))
+                    message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _collector.reset(token)
+            route = scope.get('route')
+            registry.record_request(
+                scope['method'],
+                getattr(route, 'path', 'unmatched'),
+                status,
+                time.perf_counter() - started,
+                collector
+            )
@@ -1,35 +1,22 @@
-from typing import Dict, Tuple
+"""
+Nakshatra, pada and sign lookup by arithmetic
 
-# 27 Nakshatras with their lords (for Vimshottari dasha)
-NAKSHATRA_DATA = [
-    {'number': 1, 'name': 'Ashwini', 'lord': 'Ketu', 'start': 0.0, 'end': 13.333333},
-    {'number': 2, 'name': 'Bharani', 'lord': 'Venus', 'start': 13.333333, 'end': 26.666667},
-    {'number': 3, 'name': 'Krittika', 'lord': 'Sun', 'start': 26.666667, 'end': 40.0},
-    {'number': 4, 'name': 'Rohini', 'lord': 'Moon', 'start': 40.0, 'end': 53.333333},
-    {'number': 5, 'name': 'Mrigashira', 'lord': 'Mars', 'start': 53.333333, 'end': 66.666667},
-    {'number': 6, 'name': 'Ardra', 'lord': 'Rahu', 'start': 66.666667, 'end': 80.0},
-    {'number': 7, 'name': 'Punarvasu', 'lord': 'Jupiter', 'start': 80.0, 'end': 93.333333},
-    {'number': 8, 'name': 'Pushya', 'lord': 'Saturn', 'start': 93.333333, 'end': 106.666667},
-    {'number': 9, 'name': 'Ashlesha', 'lord': 'Mercury', 'start': 106.666667, 'end': 120.0},
-    {'number': 10, 'name': 'Magha', 'lord': 'Ketu', 'start': 120.0, 'end': 133.333333},
-    {'number': 11, 'name': 'Purva Phalguni', 'lord': 'Venus', 'start': 133.333333, 'end': 146.666667},
-    {'number': 12, 'name': 'Uttara Phalguni', 'lord': 'Sun', 'start': 146.666667, 'end': 160.0},
-    {'number': 13, 'name': 'Hasta', 'lord': 'Moon', 'start': 160.0, 'end': 173.333333},
-    {'number': 14, 'name': 'Chitra', 'lord': 'Mars', 'start': 173.333333, 'end': 186.666667},
-    {'number': 15, 'name': 'Swati', 'lord': 'Rahu', 'start': 186.666667, 'end': 200.0},
-    {'number': 16, 'name': 'Vishakha', 'lord': 'Jupiter', 'start': 200.0, 'end': 213.333333},
-    {'number': 17, 'name': 'Anuradha', 'lord': 'Saturn', 'start': 213.333333, 'end': 226.666667},
-    {'number': 18, 'name': 'Jyeshtha', 'lord': 'Mercury', 'start': 226.666667, 'end': 240.0},
-    {'number': 19, 'name': 'Mula', 'lord': 'Ketu', 'start': 240.0, 'end': 253.333333},
-    {'number': 20, 'name': 'Purva Ashadha', 'lord': 'Venus', 'start': 253.333333, 'end': 266.666667},
-    {'number': 21, 'name': 'Uttara Ashadha', 'lord': 'Sun', 'start': 266.666667, 'end': 280.0},
-    {'number': 22, 'name': 'Shravana', 'lord': 'Moon', 'start': 280.0, 'end': 293.333333},
-    {'number': 23, 'name': 'Dhanishta', 'lord': 'Mars', 'start': 293.333333, 'end': 306.666667},
-    {'number': 24, 'name': 'Shatabhisha', 'lord': 'Rahu', 'start': 306.666667, 'end': 320.0},
-    {'number': 25, 'name': 'Purva Bhadrapada', 'lord': 'Jupiter', 'start': 320.0, 'end': 333.333333},
-    {'number': 26, 'name': 'Uttara Bhadrapada', 'lord': 'Saturn', 'start': 333.333333, 'end': 346.666667},
-    {'number': 27, 'name': 'Revati', 'lord': 'Mercury', 'start': 346.666667, 'end': 360.0}
-]
+A nakshatra spans exactly 40/3° and a pada 10/3°, so the pada containing a
+longitude is floor(longitude * 3 / 10) (0-107) and its nakshatra is that
+index // 4. Multiplying by 3 and dividing by 10 keeps every whole-degree
+boundary exact in floating point, which the old 13.333333° table did not.
+
+Lookups index prebuilt, immutable records (one per pada and one per sign)
+instead of scanning the table, so the same record object is returned for
+every longitude in a pada. The *_indices functions do the same for NumPy
+arrays of longitudes in a few vector operations.
+"""
+
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+from core.calculator import SIGN_LORDS, SIGNS
 
 # Vimshottari dasha order (repeating cycle)
 DASHA_ORDER = ['Ketu', 'Venus', 'Sun', 'Moon', 'Mars', 'Rahu', 'Jupiter', 'Saturn', 'Mercury']
@@ -47,43 +34,162 @@ DASHA_YEARS = {
     'Venus': 20
 }
 
+NAKSHATRA_NAMES = (
+    'Ashwini', 'Bharani', 'Krittika', 'Rohini', 'Mrigashira', 'Ardra', 'Punarvasu',
+    'Pushya', 'Ashlesha', 'Magha', 'Purva Phalguni', 'Uttara Phalguni', 'Hasta',
+    'Chitra', 'Swati', 'Vishakha', 'Anuradha', 'Jyeshtha', 'Mula', 'Purva Ashadha',
+    'Uttara Ashadha', 'Shravana', 'Dhanishta', 'Shatabhisha', 'Purva Bhadrapada',
+    'Uttara Bhadrapada', 'Revati'
+)
+
+# 40/3° per nakshatra, 10/3° per pada
+NAKSHATRA_SPAN = 40.0 / 3.0
+PADA_SPAN = 10.0 / 3.0
+
+# Lords follow the dasha order from Ashwini (Ketu), three times round
+NAKSHATRA_LORDS = tuple(DASHA_ORDER[index % 9] for index in range(27))
+
+# 27 Nakshatras with their lords (for Vimshottari dasha)
+NAKSHATRA_DATA = [
+    {'number': index + 1, 'name': name, 'lord': NAKSHATRA_LORDS[index],
+     'start': index * NAKSHATRA_SPAN, 'end': (index + 1) * NAKSHATRA_SPAN}
+    for index, name in enumerate(NAKSHATRA_NAMES)
+]
+
+
+class NakshatraInfo(NamedTuple):
+    """Nakshatra and pada of a longitude (same fields as get_nakshatra's dict)"""
+    name: str
+    number: int  # 1-27
+    lord: str
+    pada: int  # 1-4
+    degree_range_start: float
+    degree_range_end: float
+
+
+class SignInfo(NamedTuple):
+    """Sign of a longitude"""
+    index: int  # 0 = Aries
+    name: str
+    lord: str
+
+
+# One shared record per pada (index = nakshatra * 4 + pada - 1) and per sign
+PADA_RECORDS = tuple(
+    NakshatraInfo(NAKSHATRA_NAMES[index // 4], index // 4 + 1, NAKSHATRA_LORDS[index // 4],
+                  index % 4 + 1, (index // 4) * NAKSHATRA_SPAN, (index // 4 + 1) * NAKSHATRA_SPAN)
+    for index in range(108)
+)
+_PADA_DICTS = tuple(record._asdict() for record in PADA_RECORDS)
+SIGN_RECORDS = tuple(SignInfo(index, sign, SIGN_LORDS[sign]) for index, sign in enumerate(SIGNS))
+
+# Lord of each nakshatra as an index into DASHA_ORDER, for array lookups
+NAKSHATRA_LORD_INDEX = np.array([index % 9 for index in range(27)], dtype=np.int8)
+
+
+def pada_index(longitude: float) -> int:
+    """
+    Pada containing a longitude
+
+    Args:
+        longitude: Sidereal longitude in degrees (wrapped into 0-360)
+
+    Returns:
+        0-107; the nakshatra index is pada_index // 4
+    """
+    longitude %= 360.0
+    # min(): a longitude a hair below 360 must not round up into pada 108
+    return min(int(longitude * 3.0 / 10.0), 107)
+
+
+def nakshatra_at(longitude: float) -> NakshatraInfo:
+    """
+    Nakshatra and pada of a longitude
+
+    Args:
+        longitude: Sidereal longitude in degrees
+
+    Returns:
+        Shared NakshatraInfo record (do not expect a new object per call)
+    """
+    return PADA_RECORDS[pada_index(longitude)]
+
+
+def sign_at(longitude: float) -> SignInfo:
+    """
+    Sign of a longitude
+
+    Args:
+        longitude: Sidereal longitude in degrees
+
+    Returns:
+        Shared SignInfo record
+    """
+    return SIGN_RECORDS[min(int(longitude % 360.0 / 30.0), 11)]
+
+
+def pada_indices(longitudes) -> np.ndarray:
+    """
+    Vectorized pada_index
+
+    Args:
+        longitudes: Array-like of sidereal longitudes (any shape)
+
+    Returns:
+        uint8 array of the same shape, values 0-107
+    """
+    scaled = np.remainder(longitudes, 360.0, dtype=np.float64)
+    scaled *= 3.0
+    scaled /= 10.0
+    np.minimum(scaled, 107.0, out=scaled)
+    return scaled.astype(np.uint8)
+
+
+def nakshatra_indices(longitudes) -> np.ndarray:
+    """
+    Vectorized nakshatra lookup
+
+    Args:
+        longitudes: Array-like of sidereal longitudes (any shape)
+
+    Returns:
+        uint8 array of nakshatra indices 0-26 (index into NAKSHATRA_NAMES)
+    """
+    indices = pada_indices(longitudes)
+    indices >>= 2
+    return indices
+
+
+def sign_indices(longitudes) -> np.ndarray:
+    """
+    Vectorized sign lookup
+
+    Args:
+        longitudes: Array-like of sidereal longitudes (any shape)
+
+    Returns:
+        uint8 array of sign indices 0-11 (index into calculator.SIGNS)
+    """
+    scaled = np.remainder(longitudes, 360.0, dtype=np.float64)
+    scaled /= 30.0
+    np.minimum(scaled, 11.0, out=scaled)
+    return scaled.astype(np.uint8)
+
 
 def get_nakshatra(longitude: float) -> Dict:
     """
     Get nakshatra details from longitude
 
+    Prefer nakshatra_at(), which returns the shared record without
+    building a dict.
+
     Args:
         longitude: Sidereal longitude (0-360°)
 
     Returns:
-        Dict with name, number, lord, pada
+        Dict with name, number, lord, pada, degree_range_start, degree_range_end
     """
-    for nak in NAKSHATRA_DATA:
-        if nak['start'] <= longitude < nak['end']:
-            # Calculate pada (1-4)
-            nakshatra_span = nak['end'] - nak['start']  # 13.333333°
-            pada_span = nakshatra_span / 4  # 3.333333° per pada
-            position_in_nakshatra = longitude - nak['start']
-            pada = int(position_in_nakshatra / pada_span) + 1
-
-            return {
-                'name': nak['name'],
-                'number': nak['number'],
-                'lord': nak['lord'],
-                'pada': pada,
-                'degree_range_start': nak['start'],
-                'degree_range_end': nak['end']
-            }
-
-    # Edge case: exactly 360° should be Revati
-    return {
-        'name': 'Revati',
-        'number': 27,
-        'lord': 'Mercury',
-        'pada': 4,
-        'degree_range_start': 346.666667,
-        'degree_range_end': 360.0
-    }
+    return _PADA_DICTS[pada_index(longitude)].copy()
 
 
 def get_nakshatra_lord_index(nakshatra_lord: str) -> int:
@@ -0,0 +1,323 @@
+"""
+Queued PDF rendering with results kept on local disk
+
+POST /pdf/jobs hands a report to PdfJobStore.submit and returns at once;
+the render runs on pdf_job_pool and writes <job id>.pdf into PDF_JOB_DIR,
+where GET /pdf/jobs/{id}/download picks it up.
+
+The job id is a hash of what is rendered, so resubmitting an identical
+request returns the pending or finished job instead of rendering again.
+Job state lives in the API process; a finished PDF on disk is also found
+by id from other API workers and after a restart when they share
+PDF_JOB_DIR. Without it each API process renders into its own mkdtemp
+directory. Either way the directory must be private (0700, owned by this
+user), since whatever lies there is served as a finished job. Finished
+jobs and their files are dropped PDF_JOB_TTL seconds after they complete.
+"""
+
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import re
+import shutil
+import stat
+import tempfile
+import time
+from typing import Any, Callable, Dict, Optional
+
+from core.calculator import ENGINE_VERSION
+from core.executor import ComputePool, pdf_job_pool
+
+# Shared by API workers when set; default: a private temp directory per process
+PDF_JOB_DIR = os.getenv("PDF_JOB_DIR") or None
+PDF_JOB_TTL = float(os.getenv("PDF_JOB_TTL", "3600"))
+
+# Minimum seconds between sweeps of expired jobs
+SWEEP_INTERVAL = 60.0
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+_JOB_ID = re.compile(r'^[0-9a-f]{64}$')
+
+# The store's own files: finished PDFs and render_to_file's partial files
+_JOB_FILE = re.compile(r'^[0-9a-f]{64}\.pdf(\.\w+\.tmp)?$')
+
+
+def pdf_job_key(kind: str, payload: Dict[str, Any]) -> str:
+    """
+    Content-addressed id for a PDF job
+
+    Args:
+        kind: Report type (e.g. 'report')
+        payload: JSON-serializable request that fully determines the PDF
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    normalized = {'kind': kind, 'payload': payload, 'engine': ENGINE_VERSION}
+    data = json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def private_directory(path: Optional[str] = None) -> str:
+    """
+    Directory for job files that only this user can read or write
+
+    Args:
+        path: Directory to use (created 0700 if missing); None for a new
+            mkdtemp directory that is removed at exit
+
+    Returns:
+        The directory path
+
+    Raises:
+        PermissionError: If path is not a real directory owned by this user
+            or others may write to it
+    """
+    if path is None:
+        path = tempfile.mkdtemp(prefix='astro-pdf-jobs-')
+        atexit.register(shutil.rmtree, path, True)
+        return path
+
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"PDF job directory {path} is not a directory")
+    if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+        raise PermissionError(f"PDF job directory {path} is owned by another user")
+    if info.st_mode & 0o022:
+        raise PermissionError(f"PDF job directory {path} is writable by other users")
+    return path
+
+
+def render_to_file(write: Callable[..., None], path: str, *args: Any) -> int:
+    """
+    Pool job: call write(*args, file) and move the result to path
+
+    The PDF only appears under its final name once it is complete. The
+    partial file is created exclusively (mkstemp, 0600), never through an
+    existing name or symlink.
+
+    Returns:
+        Size of the written file in bytes
+    """
+    fd, partial = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                   dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(*args, f)
+        os.replace(partial, path)
+    except BaseException:
+        try:
+            os.remove(partial)
+        except OSError:
+            pass
+        raise
+    return os.path.getsize(path)
+
+
+class PdfJob:
+    """State of one queued render"""
+
+    __slots__ = ('id', 'filename', 'status', 'created_at', 'finished_at', 'size', 'error', 'task')
+
+    def __init__(self, job_id: str, filename: str, status: str = PENDING,
+                 created_at: Optional[float] = None):
+        self.id = job_id
+        self.filename = filename
+        self.status = status
+        self.created_at = created_at if created_at is not None else time.time()
+        self.finished_at: Optional[float] = None
+        self.size: Optional[int] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'filename': self.filename,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'size': self.size,
+            'error': self.error,
+        }
+
+
+class PdfJobStore:
+    """Submits renders to a pool, tracks them, and expires their files"""
+
+    def __init__(self, directory: Optional[str], ttl: float, pool: ComputePool):
+        """
+        Args:
+            directory: Job directory (see private_directory; None = private temp dir)
+            ttl: Seconds finished jobs and their files are kept
+            pool: Pool the renders run on
+        """
+        self._configured = directory
+        self._directory: Optional[str] = None
+        self.ttl = ttl
+        self.pool = pool
+        self.submitted = 0
+        self.deduped = 0
+        self._jobs: Dict[str, PdfJob] = {}
+        self._last_sweep = 0.0
+
+    @property
+    def directory(self) -> str:
+        """Job directory, set up on first use (not at import, which pool workers also do)"""
+        if self._directory is None:
+            self._directory = private_directory(self._configured)
+        return self._directory
+
+    @directory.setter
+    def directory(self, path: str) -> None:
+        self._directory = private_directory(path)
+
+    def path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.pdf")
+
+    def submit(self, job_id: str, filename: str, write: Callable[..., None], *args: Any) -> PdfJob:
+        """
+        Queue write(*args, file) as job_id unless that job already exists
+
+        Must be called from the event loop. A failed job is retried.
+
+        Args:
+            job_id: Value of pdf_job_key for the request
+            filename: Download name for the PDF
+            write: Module-level renderer taking the output file object last
+            *args: Leading arguments for write
+
+        Returns:
+            The new or existing PdfJob
+
+        Raises:
+            PoolSaturatedError: If the job pool cannot take another job
+        """
+        self.sweep()
+
+        job = self.get(job_id)
+        if job is not None and job.status != FAILED:
+            self.deduped += 1
+            return job
+
+        # Count the job as in flight now, so a burst of submits is shed
+        # here with a 503 rather than accepted and failed later
+        self.pool.reserve()
+        job = self._jobs[job_id] = PdfJob(job_id, filename)
+        job.task = asyncio.get_running_loop().create_task(self._run(job, write, args))
+        job.task.add_done_callback(lambda task: self._unstarted(job))
+        self.submitted += 1
+        return job
+
+    def _unstarted(self, job: PdfJob) -> None:
+        # Cancelled before _run began (it sets finished_at once it has): free the slot
+        if job.finished_at is None:
+            self.pool.release()
+            job.status = FAILED
+            job.error = "cancelled"
+            job.finished_at = time.time()
+            job.task = None
+
+    async def _run(self, job: PdfJob, write: Callable[..., None], args: tuple) -> None:
+        try:
+            job.size = await self.pool.run(render_to_file, write, self.path(job.id), *args, reserved=True)
+            job.status = DONE
+        except asyncio.CancelledError:
+            job.status = FAILED
+            job.error = "cancelled"
+            raise
+        except Exception as e:
+            job.status = FAILED
+            job.error = str(e)
+        finally:
+            job.finished_at = time.time()
+            job.task = None
+
+    def get(self, job_id: str) -> Optional[PdfJob]:
+        """
+        Look up a job, including PDFs finished by another API process
+
+        Args:
+            job_id: Job id from POST /pdf/jobs
+
+        Returns:
+            PdfJob, or None if it is unknown or has expired
+        """
+        if not _JOB_ID.match(job_id):
+            return None
+
+        job = self._jobs.get(job_id)
+        if job is not None:
+            if job.finished_at is not None and time.time() - job.finished_at > self.ttl:
+                # The file goes with the next sweep (another process may have rewritten it)
+                del self._jobs[job_id]
+                return None
+            return job
+
+        try:
+            stat = os.stat(self.path(job_id))
+        except OSError:
+            return None
+        if time.time() - stat.st_mtime > self.ttl:
+            return None
+        job = PdfJob(job_id, f"report-{job_id[:12]}.pdf", status=DONE, created_at=stat.st_mtime)
+        job.finished_at = stat.st_mtime
+        job.size = stat.st_size
+        return job
+
+    def open(self, job: PdfJob):
+        """Open a finished job's PDF (the handle stays valid if the file expires meanwhile)"""
+        return open(self.path(job.id), 'rb')
+
+    def sweep(self, force: bool = False) -> int:
+        """
+        Drop finished jobs and job files older than the TTL
+
+        Only the store's own file names are touched, so a PDF_JOB_DIR that
+        also holds other files keeps them.
+
+        Runs at most once per SWEEP_INTERVAL unless forced.
+
+        Returns:
+            Number of files removed
+        """
+        now = time.time()
+        if not force and now - self._last_sweep < SWEEP_INTERVAL:
+            return 0
+        self._last_sweep = now
+
+        for job_id, job in list(self._jobs.items()):
+            if job.finished_at is not None and now - job.finished_at > self.ttl:
+                del self._jobs[job_id]
+
+        removed = 0
+        try:
+            entries = list(os.scandir(self.directory))
+        except OSError:
+            return 0
+        for entry in entries:
+            if not _JOB_FILE.match(entry.name):
+                continue
+            try:
+                if now - entry.stat().st_mtime > self.ttl:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Job counts by status plus submit/dedupe counters"""
+        counts = {PENDING: 0, DONE: 0, FAILED: 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return {**counts, 'submitted': self.submitted, 'deduped': self.deduped}
+
+
+pdf_jobs = PdfJobStore(PDF_JOB_DIR, PDF_JOB_TTL, pdf_job_pool)
@@ -0,0 +1,151 @@
+"""
+Bounded-memory hand-off of rendered PDFs from the PDF pool to the response
+
+ReportLab cannot emit a document page by page: it lays out the whole story
+and serializes the file in one write at the end. What can be bounded is
+everything after that. A render job writes into a PdfSpool instead of a
+BytesIO; output up to PDF_SPOOL_THRESHOLD stays in memory and comes back
+to the API process as bytes, anything larger goes to a temp file and only
+its path crosses the process boundary. The API process then streams the
+file in PDF_STREAM_CHUNK pieces, so a multi-megabyte report costs it one
+chunk of memory instead of the pickled PDF plus a BytesIO copy.
+"""
+
+import asyncio
+import os
+import tempfile
+from typing import Any, Callable, List, NamedTuple, Optional
+
+PDF_SPOOL_THRESHOLD = int(os.getenv("PDF_SPOOL_THRESHOLD", str(512 * 1024)))
+PDF_SPOOL_DIR = os.getenv("PDF_SPOOL_DIR") or None
+PDF_STREAM_CHUNK = 64 * 1024
+
+
+class SpooledPdf(NamedTuple):
+    """A rendered PDF: inline bytes when small, otherwise a temp file the receiver owns"""
+    size: int
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+
+
+class PdfSpool:
+    """
+    Write-only file object that moves to disk past a size threshold
+
+    ReportLab only needs write(); everything written is kept in memory
+    until the total would exceed threshold, then flushed to a temp file
+    that takes every later write.
+    """
+
+    def __init__(self, threshold: int = PDF_SPOOL_THRESHOLD, directory: Optional[str] = PDF_SPOOL_DIR):
+        self.threshold = threshold
+        self.directory = directory
+        self.size = 0
+        self.path: Optional[str] = None
+        self._chunks: List[bytes] = []
+        self._file = None
+
+    def write(self, data: bytes) -> int:
+        if self._file is None and self.size + len(data) > self.threshold:
+            fd, self.path = tempfile.mkstemp(prefix='astro-pdf-', suffix='.pdf', dir=self.directory)
+            self._file = os.fdopen(fd, 'wb')
+            self._file.writelines(self._chunks)
+            self._chunks = []
+
+        if self._file is None:
+            self._chunks.append(bytes(data))
+        else:
+            self._file.write(data)
+        self.size += len(data)
+        return len(data)
+
+    def close(self) -> SpooledPdf:
+        """Finish writing and describe where the PDF ended up"""
+        if self._file is None:
+            return SpooledPdf(size=self.size, data=b''.join(self._chunks))
+        self._file.close()
+        return SpooledPdf(size=self.size, path=self.path)
+
+    def discard(self) -> None:
+        """Drop everything written so far (used when rendering fails)"""
+        self._chunks = []
+        if self._file is not None:
+            self._file.close()
+            os.remove(self.path)
+
+
+def spool_output(write: Callable[..., None], *args: Any) -> SpooledPdf:
+    """
+    Call write(*args, output) with a PdfSpool as output
+
+    Args:
+        write: Renderer that writes a PDF into the file object it is given last
+        *args: Leading arguments for write
+
+    Returns:
+        SpooledPdf with the bytes or the temp file path
+    """
+    spool = PdfSpool()
+    try:
+        write(*args, spool)
+    except BaseException:
+        spool.discard()
+        raise
+    return spool.close()
+
+
+def open_spooled(pdf: SpooledPdf):
+    """
+    Open a spooled PDF's temp file for reading and unlink it right away
+
+    The open handle keeps the data readable; the disk space is released as
+    soon as the handle is closed, even if the response is never sent.
+    """
+    f = open(pdf.path, 'rb')
+    try:
+        os.remove(pdf.path)
+    except OSError:
+        pass
+    return f
+
+
+def remove_spooled(pdf: SpooledPdf) -> None:
+    """Delete a spooled PDF's temp file, if it has one"""
+    if pdf.path is not None:
+        try:
+            os.remove(pdf.path)
+        except OSError:
+            pass
+
+
+async def run_spooled(pool, render: Callable[..., SpooledPdf], *args: Any) -> SpooledPdf:
+    """
+    Run a spooling render on pool, cleaning up after callers that stop waiting
+
+    A request cancelled while its render is running (client gone) would
+    leave the render's temp file behind: the result still arrives, but
+    nobody is left to open it. The render is shielded so its result is
+    seen, and removed, in that case.
+
+    Args:
+        pool: ComputePool to render on
+        render: Module-level render job returning a SpooledPdf
+        *args: Arguments for render
+
+    Returns:
+        SpooledPdf from render
+
+    Raises:
+        PoolSaturatedError: If the pool cannot take another job
+    """
+    task = pool.start(render, *args)
+    try:
+        return await asyncio.shield(task)
+    except asyncio.CancelledError:
+        task.add_done_callback(_discard_result)
+        raise
+
+
+def _discard_result(task: "asyncio.Task") -> None:
+    if not task.cancelled() and task.exception() is None:
+        remove_spooled(task.result())
@@ -0,0 +1,318 @@
+"""
+On-demand sampling profiler for a running API worker
+
+A profile covers the API process and its worker-pool processes (compute
+and PDF), where chart building, yoga detection and ReportLab
+rendering actually run, and comes back as collapsed stacks:
+
+    api[812];MainThread;run (asyncio/runners.py:86);... 37
+    SpawnProcess-2[840];MainThread;_detect_raj_yoga (core/yoga_rules.py:170) 12
+
+which flamegraph.pl, speedscope and inferno read directly.
+
+Two back ends:
+
+- py-spy (if installed and allowed to ptrace): `py-spy record --pid
+  <api> --subprocesses --format raw`, native speed and sees C frames;
+- the stdlib sampler: a thread that walks sys._current_frames() every
+  interval. Pool workers run the same sampler after the API process
+  sends them PROFILE_SIGNAL (installed by install_worker_hook, the pools'
+  initializer); each writes its stacks to a file the API process merges.
+
+Stacks whose innermost frame is a known wait (selector, lock, queue,
+pipe read) are dropped unless idle=True, so idle workers don't drown the
+hot paths.
+
+Off unless PROFILER_TOKEN is set; the token is then required on every
+request. Profile requests reach the workers through a file in a private
+(mkdtemp, 0700) directory whose path the pools pass to the initializer.
+"""
+
+import asyncio
+import atexit
+import json
+import math
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+PROFILER_TOKEN = os.getenv("PROFILER_TOKEN", "")
+PROFILER_ENABLED = bool(PROFILER_TOKEN)
+
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+DEFAULT_INTERVAL = 0.005
+
+# Default action "ignore": a child that never installed the hook is unaffected
+PROFILE_SIGNAL = getattr(signal, 'SIGURG', None)
+
+# Extra time for worker processes to write their stacks after the window
+WORKER_GRACE_SECONDS = 2.0
+
+# Innermost frames that mean "waiting", as (file name, function)
+_IDLE_LEAVES = {
+    ('selectors.py', 'select'),
+    ('threading.py', 'wait'),
+    ('queue.py', 'get'),
+    ('connection.py', '_recv'),
+    ('connection.py', 'wait'),
+    ('connection.py', '_poll'),
+}
+
+_labels: Dict[object, str] = {}
+_worker_sampling = threading.Lock()
+
+# API process: private directory for profile requests; worker: the
+# request file of its parent (set by install_worker_hook)
+_request_dir: Optional[str] = None
+_worker_request_path: Optional[str] = None
+
+
+class ProfilerError(Exception):
+    """Raised when a profile cannot be taken"""
+
+
+def _frame_label(code) -> str:
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename.replace('\\', '/').split('/')
+        label = _labels[code] = f"{code.co_name} ({'/'.join(path[-2:])}:{code.co_firstlineno})"
+    return label
+
+
+def _is_idle(code) -> bool:
+    return (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES
+
+
+def sample_stacks(seconds: float, interval: float = DEFAULT_INTERVAL,
+                  idle: bool = False, root: str = '') -> Counter:
+    """
+    Sample every thread of this process except the caller
+
+    Args:
+        seconds: Length of the sampling window
+        interval: Pause between samples in seconds
+        idle: Keep stacks that are only waiting
+        root: Optional first frame (e.g. process label) for every stack
+
+    Returns:
+        Counter of collapsed stack (root;thread;outer;...;inner) -> samples
+    """
+    own = threading.get_ident()
+    stacks: Counter = Counter()
+    deadline = time.monotonic() + seconds
+
+    while time.monotonic() < deadline:
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own or (not idle and _is_idle(frame.f_code)):
+                continue
+            frames = []
+            while frame is not None:
+                frames.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            frames.append(thread_names.get(ident, f"thread-{ident}"))
+            if root:
+                frames.append(root)
+            frames.reverse()
+            stacks[';'.join(frames)] += 1
+        frame = None
+        time.sleep(interval)
+
+    return stacks
+
+
+def render_collapsed(stacks: Counter) -> str:
+    """Collapsed-stack text, one 'stack count' line per distinct stack"""
+    return ''.join(f"{stack} {samples}\n" for stack, samples in sorted(stacks.items()))
+
+
+def request_path() -> str:
+    """
+    File through which this process sends profile requests to its workers
+
+    Lives in a private directory created on first use (removed at exit), so
+    other local users cannot plant or redirect it. Pools pass it to
+    install_worker_hook.
+    """
+    global _request_dir
+    if _request_dir is None:
+        _request_dir = tempfile.mkdtemp(prefix='astro-profile-')
+        atexit.register(shutil.rmtree, _request_dir, True)
+    return os.path.join(_request_dir, 'request.json')
+
+
+def install_worker_hook(path: Optional[str] = None) -> None:
+    """
+    Pool initializer: sample this worker when the API process asks
+
+    Args:
+        path: request_path() of the API process (no hook without it)
+    """
+    global _worker_request_path
+    if PROFILE_SIGNAL is not None and path is not None:
+        _worker_request_path = path
+        signal.signal(PROFILE_SIGNAL, _on_profile_signal)
+
+
+def _on_profile_signal(signum, frame) -> None:
+    try:
+        with open(_worker_request_path) as f:
+            request = json.load(f)
+    except (OSError, ValueError):
+        return
+    threading.Thread(target=_profile_worker, args=(request,), name='profiler', daemon=True).start()
+
+
+def _profile_worker(request: Dict) -> None:
+    if not _worker_sampling.acquire(blocking=False):
+        return
+    try:
+        root = f"{multiprocessing.current_process().name}[{os.getpid()}]"
+        stacks = sample_stacks(request['seconds'], request['interval'], request['idle'], root)
+        path = os.path.join(request['output_dir'], f"{os.getpid()}.collapsed")
+        with open(path + '.tmp', 'w') as f:
+            f.write(render_collapsed(stacks))
+        os.replace(path + '.tmp', path)
+    except OSError:
+        pass
+    finally:
+        _worker_sampling.release()
+
+
+def _read_collapsed(path: str, stacks: Counter) -> None:
+    with open(path) as f:
+        for line in f:
+            stack, _, samples = line.rstrip('\n').rpartition(' ')
+            if stack and samples.isdigit():
+                stacks[stack] += int(samples)
+
+
+def profile_with_sampler(seconds: float, interval: float = DEFAULT_INTERVAL,
+                         idle: bool = False, workers: bool = True) -> str:
+    """
+    Stdlib profile of this process and (optionally) its pool workers
+
+    Blocks for the sampling window; call it from a thread.
+
+    Args:
+        seconds: Length of the sampling window
+        interval: Pause between samples in seconds
+        idle: Keep stacks that are only waiting
+        workers: Also sample child processes that installed the hook
+
+    Returns:
+        Collapsed-stack text
+    """
+    children = multiprocessing.active_children() if workers and PROFILE_SIGNAL is not None else []
+    output_dir = tempfile.mkdtemp(prefix='astro-profile-')
+    path = request_path()
+    signalled = set()
+
+    try:
+        if children:
+            with open(path, 'w') as f:
+                json.dump({'seconds': seconds, 'interval': interval, 'idle': idle,
+                           'output_dir': output_dir}, f)
+            for child in children:
+                try:
+                    os.kill(child.pid, PROFILE_SIGNAL)
+                    signalled.add(child.pid)
+                except OSError:
+                    pass
+
+        stacks = sample_stacks(seconds, interval, idle, root=f"api[{os.getpid()}]")
+
+        # Worker files appear once their own window has closed
+        deadline = time.monotonic() + WORKER_GRACE_SECONDS
+        pending = {f"{pid}.collapsed" for pid in signalled}
+        while pending and time.monotonic() < deadline:
+            pending -= set(os.listdir(output_dir))
+            if pending:
+                time.sleep(0.05)
+        for name in os.listdir(output_dir):
+            if name.endswith('.collapsed'):
+                _read_collapsed(os.path.join(output_dir, name), stacks)
+    finally:
+        if children:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    return render_collapsed(stacks)
+
+
+async def profile_with_py_spy(seconds: float, interval: float = DEFAULT_INTERVAL,
+                              idle: bool = False) -> str:
+    """
+    py-spy profile of this process and all its children
+
+    Raises:
+        ProfilerError: If py-spy is missing or fails (e.g. no ptrace permission)
+    """
+    py_spy = shutil.which('py-spy')
+    if py_spy is None:
+        raise ProfilerError("py-spy is not installed")
+
+    fd, output = tempfile.mkstemp(prefix='astro-profile-', suffix='.collapsed')
+    os.close(fd)
+    command = [
+        py_spy, 'record', '--pid', str(os.getpid()), '--subprocesses', '--nonblocking',
+        '--format', 'raw', '--output', output,
+        '--duration', str(max(1, math.ceil(seconds))),
+        '--rate', str(max(1, round(1.0 / interval))),
+    ]
+    if idle:
+        command.append('--idle')
+
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *command, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), seconds + 30.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            raise ProfilerError("py-spy did not finish")
+        if process.returncode != 0:
+            raise ProfilerError(f"py-spy failed: {stderr.decode(errors='replace').strip()[-500:]}")
+        with open(output) as f:
+            return f.read()
+    finally:
+        os.remove(output)
+
+
+async def run_profile(seconds: float, interval: float = DEFAULT_INTERVAL,
+                      mode: str = 'auto', idle: bool = False) -> Tuple[str, str]:
+    """
+    Take one profile with the requested back end
+
+    Args:
+        seconds: Length of the sampling window
+        interval: Sampling interval in seconds
+        mode: 'py-spy', 'sampler', or 'auto' (py-spy, falling back to the sampler)
+        idle: Keep stacks that are only waiting
+
+    Returns:
+        Tuple of (collapsed-stack text, back end used)
+
+    Raises:
+        ProfilerError: If mode is 'py-spy' and py-spy cannot run
+    """
+    if mode in ('auto', 'py-spy'):
+        try:
+            return await profile_with_py_spy(seconds, interval, idle), 'py-spy'
+        except ProfilerError:
+            if mode == 'py-spy':
+                raise
+
+    text = await asyncio.to_thread(profile_with_sampler, seconds, interval, idle)
+    return text, 'sampler'
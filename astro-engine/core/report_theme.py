@@ -0,0 +1,245 @@
+"""
+Named PDF report themes, built once per process and shared by every render
+
+A ReportTheme holds the paragraph styles, table style, fonts, colours and
+page geometry of a report. Themes are created when this module is imported (once per API
+or pool worker process) and only read while rendering, so a render costs
+no style construction at all. ReportLab styles are plain attribute bags
+that layout never mutates, which makes sharing them between concurrent
+renders in a thread pool safe as well.
+
+Page templates are stateful during layout (frames track the current
+position), so a theme stores only their geometry and doc_template() makes
+a fresh SimpleDocTemplate for every document.
+
+Custom branding: build a ReportTheme with other colours, fonts, margins or
+a footer and pass it to register_theme(); reports then ask for it by name.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, TableStyle
+
+DEFAULT_THEME = os.getenv("PDF_THEME", "classic")
+
+# One sample sheet per process; themes derive their styles from it
+_SAMPLE_STYLES = getSampleStyleSheet()
+
+
+class ReportTheme:
+    """
+    Styles and page setup for one report look
+
+    Styles are looked up by name in `styles`:
+
+    - Title: report title
+    - SectionTitle / Heading / Subheading: `#`, `##` and deeper headings
+    - Body: paragraphs
+    - ListItem: list item text (the list draws the bullets)
+    - Quote: block quotes
+    - Code: fenced code blocks
+    - TableHeader / TableCell: table cells, plus -center and -right variants
+
+    `table_style` holds the grid and header colours for tables.
+    """
+
+    def __init__(self, name: str, primary: str, accent: str, text: str,
+                 font: str = 'Helvetica', bold_font: str = 'Helvetica-Bold',
+                 italic_font: str = 'Helvetica-Oblique', mono_font: str = 'Courier',
+                 pagesize: Tuple[float, float] = A4,
+                 margins: Tuple[float, float, float, float] = (72, 72, 72, 18),
+                 footer: Optional[str] = None):
+        """
+        Args:
+            name: Registry name
+            primary: Hex colour of headings
+            accent: Hex colour of the report title
+            text: Hex colour of body text
+            font / bold_font / italic_font / mono_font: ReportLab font names
+                (registered TTF fonts work too)
+            pagesize: Page size in points
+            margins: (left, right, top, bottom) in points
+            footer: Optional text drawn at the bottom of every page
+        """
+        self.name = name
+        self.primary = colors.HexColor(primary)
+        self.accent = colors.HexColor(accent)
+        self.text = colors.HexColor(text)
+        self.font = font
+        self.bold_font = bold_font
+        self.italic_font = italic_font
+        self.mono_font = mono_font
+        self.pagesize = pagesize
+        self.margins = margins
+        self.footer = footer
+        self.styles: Dict[str, ParagraphStyle] = {}
+        self._build_styles()
+        self.table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), self.primary),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f4f5f8')]),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#c8ccd6')),
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('TOPPADDING', (0, 0), (-1, -1), 4),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+        ])
+
+    def _build_styles(self) -> None:
+        self.styles['Title'] = ParagraphStyle(
+            f'{self.name}-Title',
+            parent=_SAMPLE_STYLES['Heading1'],
+            fontSize=24,
+            textColor=self.accent,
+            spaceAfter=30,
+            alignment=TA_CENTER,
+            fontName=self.bold_font
+        )
+        self.styles['Heading'] = ParagraphStyle(
+            f'{self.name}-Heading',
+            parent=_SAMPLE_STYLES['Heading2'],
+            fontSize=16,
+            textColor=self.primary,
+            spaceAfter=12,
+            spaceBefore=12,
+            fontName=self.bold_font
+        )
+        self.styles['SectionTitle'] = ParagraphStyle(
+            f'{self.name}-SectionTitle',
+            parent=self.styles['Heading'],
+            fontSize=18
+        )
+        self.styles['Body'] = ParagraphStyle(
+            f'{self.name}-Body',
+            parent=_SAMPLE_STYLES['BodyText'],
+            fontSize=11,
+            textColor=self.text,
+            spaceAfter=12,
+            alignment=TA_JUSTIFY,
+            leading=16,
+            fontName=self.font
+        )
+        self.styles['Subheading'] = ParagraphStyle(
+            f'{self.name}-Subheading',
+            parent=self.styles['Heading'],
+            fontSize=13,
+            leading=16,
+            spaceBefore=10,
+            spaceAfter=6
+        )
+        self.styles['ListItem'] = ParagraphStyle(
+            f'{self.name}-ListItem',
+            parent=self.styles['Body'],
+            spaceAfter=4
+        )
+        self.styles['Quote'] = ParagraphStyle(
+            f'{self.name}-Quote',
+            parent=self.styles['Body'],
+            leftIndent=18,
+            textColor=self.primary,
+            fontName=self.italic_font
+        )
+        self.styles['Code'] = ParagraphStyle(
+            f'{self.name}-Code',
+            parent=_SAMPLE_STYLES['Code'],
+            fontName=self.mono_font,
+            fontSize=8.5,
+            leading=11,
+            leftIndent=6,
+            spaceBefore=4,
+            spaceAfter=12
+        )
+        for name, parent, font, color in (('TableHeader', 'Body', self.bold_font, colors.white),
+                                          ('TableCell', 'Body', self.font, self.text)):
+            for suffix, alignment in (('', TA_LEFT), ('-center', TA_CENTER), ('-right', TA_RIGHT)):
+                self.styles[name + suffix] = ParagraphStyle(
+                    f'{self.name}-{name}{suffix}',
+                    parent=self.styles[parent],
+                    fontName=font,
+                    textColor=color,
+                    fontSize=9.5,
+                    leading=12,
+                    spaceAfter=0,
+                    alignment=alignment
+                )
+
+    def doc_template(self, output, **info) -> SimpleDocTemplate:
+        """
+        A new document with this theme's page size and margins
+
+        Args:
+            output: Writable binary file object
+            **info: Document metadata (title, author, subject)
+
+        Returns:
+            SimpleDocTemplate ready for build()
+        """
+        left, right, top, bottom = self.margins
+        return SimpleDocTemplate(
+            output,
+            pagesize=self.pagesize,
+            leftMargin=left,
+            rightMargin=right,
+            topMargin=top,
+            bottomMargin=bottom,
+            **info
+        )
+
+    def build(self, doc: SimpleDocTemplate, story: List) -> None:
+        """Lay out story into doc, with the theme's page decoration"""
+        if self.footer is None:
+            doc.build(story)
+        else:
+            doc.build(story, onFirstPage=self._draw_footer, onLaterPages=self._draw_footer)
+
+    def _draw_footer(self, canvas, doc) -> None:
+        canvas.saveState()
+        canvas.setFont(self.font, 8)
+        canvas.setFillColor(self.primary)
+        canvas.drawString(doc.leftMargin, 20, self.footer)
+        canvas.drawRightString(self.pagesize[0] - doc.rightMargin, 20, str(doc.page))
+        canvas.restoreState()
+
+
+_themes: Dict[str, ReportTheme] = {}
+
+
+def register_theme(theme: ReportTheme) -> ReportTheme:
+    """Make theme available by name (replaces a theme of the same name)"""
+    _themes[theme.name] = theme
+    return theme
+
+
+def get_theme(name: Optional[str] = None) -> ReportTheme:
+    """
+    Look up a registered theme
+
+    Args:
+        name: Theme name (default: PDF_THEME)
+
+    Returns:
+        The shared ReportTheme
+
+    Raises:
+        ValueError: If no theme has that name
+    """
+    theme = _themes.get(name or DEFAULT_THEME)
+    if theme is None:
+        raise ValueError(f"Unknown report theme '{name}'. Available: {', '.join(sorted(_themes))}")
+    return theme
+
+
+def theme_names() -> List[str]:
+    """Names of all registered themes"""
+    return sorted(_themes)
+
+
+# Deep navy + gold
+register_theme(ReportTheme('classic', primary='#1e2d4a', accent='#c9a227', text='#0f1729'))
+
+# Black on white with page numbers, for printing
+register_theme(ReportTheme('print', primary='#000000', accent='#000000', text='#000000',
+                           margins=(72, 72, 72, 54), footer='JyotishAI'))
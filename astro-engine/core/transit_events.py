@@ -0,0 +1,322 @@
+"""
+Transit event search: sign ingresses, nakshatra changes, stations and
+exact transit-to-natal aspects
+
+Every planet is sampled on a coarse grid (one day by default). Candidate
+events are bracketed with array arithmetic on the unwrapped longitudes and
+speeds, then each bracket is refined to about a second:
+
+- longitude crossings (ingress, nakshatra, aspect) with a bracketed Newton
+  iteration that uses the planet's speed as the derivative and falls back
+  to bisection whenever a step would leave the bracket;
+- stations (speed = 0) with Brent's method on the speed.
+
+Grid intervals that contain a station are split at the station so a planet
+that crosses a boundary and turns back within one step is still caught.
+The Moon can cross two nakshatra boundaries in a day; every boundary in a
+bracket is reported.
+
+Positions come from the precomputed ephemeris table when it covers the
+range (see core/ephemeris_table.py) and from Swiss Ephemeris otherwise.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import swisseph as swe
+
+from core import calculator, metrics
+from core.ephemeris_table import ephemeris_series, get_table
+from core.nakshatra import NAKSHATRA_DATA, NAKSHATRA_SPAN
+
+EVENT_TYPES = ('ingress', 'nakshatra', 'station', 'aspect')
+
+# Aspect name -> separation in degrees (transit minus natal)
+ASPECT_ANGLES = {
+    'conjunction': (0.0,),
+    'sextile': (60.0, 300.0),
+    'square': (90.0, 270.0),
+    'trine': (120.0, 240.0),
+    'opposition': (180.0,),
+}
+
+# Mean nodes never station; the Sun and Moon never go retrograde
+STATIONING_PLANETS = ('Mars', 'Mercury', 'Jupiter', 'Venus', 'Saturn')
+
+# Refinement tolerance in days (~1 second)
+TIME_TOLERANCE = 1e-5
+
+
+def _wrap(angle: float) -> float:
+    """Map an angle difference to [-180, 180)"""
+    return (angle + 180.0) % 360.0 - 180.0
+
+
+def _position_function(planet_name: str, use_table: bool) -> Callable[[float], Tuple[float, float]]:
+    """Return f(jd) -> (longitude, speed) for one planet"""
+    if use_table:
+        table = get_table()
+        return lambda jd: table.body_at(planet_name, jd)
+
+    calculator.ensure_swe_configured()
+    is_ketu = planet_name == 'Ketu'
+    planet_id = calculator.PLANETS[planet_name]
+    flags = swe.FLG_SIDEREAL | swe.FLG_SPEED
+
+    def position(jd: float) -> Tuple[float, float]:
+        result = swe.calc_ut(jd, planet_id, flags)[0]
+        metrics.count('swisseph_calls')
+        if is_ketu:
+            return (result[0] + 180.0) % 360.0, -result[3]
+        return result[0], result[3]
+
+    return position
+
+
+def _refine_crossing(position, target: float, a: float, b: float,
+                     fa: float, fb: float) -> float:
+    """
+    Time in [a, b] where the longitude passes target
+
+    fa and fb are the signed distances (longitude - target) at a and b and
+    must differ in sign. Newton steps use the speed as the derivative and
+    are replaced by bisection whenever they would leave the bracket.
+    """
+    t = a - fa * (b - a) / (fb - fa)
+    for _ in range(50):
+        longitude, speed = position(t)
+        f = _wrap(longitude - target)
+        if f == 0.0:
+            return t
+        # Shrink the bracket around the root
+        if (f < 0) == (fa < 0):
+            a, fa = t, f
+        else:
+            b, fb = t, f
+
+        step = f / speed if speed else math.inf
+        t_next = t - step
+        if not (a < t_next < b):
+            t_next = 0.5 * (a + b)
+        if abs(t_next - t) < TIME_TOLERANCE or b - a < TIME_TOLERANCE:
+            return t_next
+        t = t_next
+    return t
+
+
+def _refine_station(position, a: float, b: float, fa: float, fb: float) -> float:
+    """Brent's method on the speed: time in [a, b] where speed = 0"""
+    if fa == 0.0:
+        return a
+    if fb == 0.0:
+        return b
+
+    c, fc = a, fa
+    d = e = b - a
+    for _ in range(100):
+        if (fb > 0) == (fc > 0):
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+
+        tolerance = 2.0 * np.finfo(float).eps * abs(b) + 0.5 * TIME_TOLERANCE
+        midpoint = 0.5 * (c - b)
+        if abs(midpoint) <= tolerance or fb == 0.0:
+            return b
+
+        if abs(e) >= tolerance and abs(fa) > abs(fb):
+            # Inverse quadratic interpolation (secant when only two points)
+            s = fb / fa
+            if a == c:
+                p = 2.0 * midpoint * s
+                q = 1.0 - s
+            else:
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * midpoint * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * midpoint * q - abs(tolerance * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = midpoint
+        else:
+            d = e = midpoint
+
+        a, fa = b, fb
+        b += d if abs(d) > tolerance else math.copysign(tolerance, midpoint)
+        fb = position(b)[1]
+    return b
+
+
+def _crossing_event(planet_name: str, kind: str, target: float, jd: float,
+                    direct: bool, meta: Dict) -> Dict:
+    """Describe a longitude crossing"""
+    boundary = target % 360.0
+    event = {
+        'jd': jd,
+        'datetime': calculator.julian_day_to_datetime(jd).isoformat(),
+        'planet': planet_name,
+        'type': kind,
+        'longitude': boundary,
+        'is_retrograde': not direct,
+    }
+
+    if kind == 'ingress':
+        sign_index = int(round(boundary / 30.0)) % 12
+        entered = sign_index if direct else (sign_index - 1) % 12
+        left = (sign_index - 1) % 12 if direct else sign_index
+        event['from_sign'] = calculator.SIGNS[left]
+        event['to_sign'] = calculator.SIGNS[entered]
+    elif kind == 'nakshatra':
+        nakshatra_index = int(round(boundary / NAKSHATRA_SPAN)) % 27
+        entered = nakshatra_index if direct else (nakshatra_index - 1) % 27
+        left = (nakshatra_index - 1) % 27 if direct else nakshatra_index
+        event['from_nakshatra'] = NAKSHATRA_DATA[left]['name']
+        event['to_nakshatra'] = NAKSHATRA_DATA[entered]['name']
+    else:
+        event['natal_point'] = meta['natal_point']
+        event['aspect_type'] = meta['aspect_type']
+        event['natal_longitude'] = meta['natal_longitude']
+
+    return event
+
+
+def find_transit_events(
+    start_jd: float,
+    end_jd: float,
+    natal_points: Optional[Dict[str, float]] = None,
+    planets: Optional[List[str]] = None,
+    event_types: Optional[List[str]] = None,
+    aspects: Optional[List[str]] = None,
+    step: float = 1.0,
+) -> List[Dict]:
+    """
+    All transit events between two Julian Days, sorted by time
+
+    Args:
+        start_jd: Start of the window (UT)
+        end_jd: End of the window (UT)
+        natal_points: Natal longitudes to aspect, e.g. {'Moon': 35.1, 'Lagna': 190.2}
+        planets: Transiting planets to scan (default: all nine grahas)
+        event_types: Subset of EVENT_TYPES (default: all)
+        aspects: Subset of ASPECT_ANGLES keys (default: all)
+        step: Coarse sampling step in days
+
+    Returns:
+        List of event dicts with jd, datetime (UTC ISO), planet, type and
+        type-specific fields
+    """
+    if end_jd <= start_jd:
+        raise ValueError("end_jd must be after start_jd")
+
+    planets = planets or list(calculator.PLANETS)
+    event_types = set(event_types or EVENT_TYPES)
+    natal_points = natal_points or {}
+    aspects = aspects or list(ASPECT_ANGLES)
+
+    unknown = set(planets) - set(calculator.PLANETS)
+    if unknown:
+        raise ValueError(f"Unknown planets: {sorted(unknown)}")
+    unknown = event_types - set(EVENT_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown event types: {sorted(unknown)}")
+    unknown = set(aspects) - set(ASPECT_ANGLES)
+    if unknown:
+        raise ValueError(f"Unknown aspects: {sorted(unknown)}")
+
+    # Coarse grid that always includes end_jd
+    count = max(2, int(math.ceil((end_jd - start_jd) / step)) + 1)
+    grid_end = start_jd + step * (count - 1)
+
+    series, source = ephemeris_series(start_jd, grid_end, step)
+    use_table = source == 'table'
+
+    # Target families: (kind, base, period, meta)
+    families = []
+    if 'ingress' in event_types:
+        families.append(('ingress', 0.0, 30.0, None))
+    if 'nakshatra' in event_types:
+        families.append(('nakshatra', 0.0, NAKSHATRA_SPAN, None))
+    if 'aspect' in event_types:
+        for natal_name, natal_longitude in natal_points.items():
+            for aspect_type in aspects:
+                for angle in ASPECT_ANGLES[aspect_type]:
+                    families.append(('aspect', (natal_longitude + angle) % 360.0, 360.0, {
+                        'natal_point': natal_name,
+                        'aspect_type': aspect_type,
+                        'natal_longitude': natal_longitude,
+                    }))
+    bases = np.array([family[1] for family in families])[:, None]
+    periods = np.array([family[2] for family in families])[:, None]
+
+    events = []
+    jds = series['jd'].tolist()
+
+    for planet_name in planets:
+        row = series['planets'].index(planet_name)
+        unwrapped = np.unwrap(series['longitude'][row], period=360.0)
+        speed = series['speed'][row]
+        longitude = unwrapped.tolist()
+        position = _position_function(planet_name, use_table)
+
+        # Stations: speed changes sign inside a grid interval
+        station_intervals = {}
+        if planet_name in STATIONING_PLANETS:
+            for i in np.nonzero(np.signbit(speed[:-1]) != np.signbit(speed[1:]))[0].tolist():
+                t = _refine_station(position, jds[i], jds[i + 1],
+                                    float(speed[i]), float(speed[i + 1]))
+                station_longitude = longitude[i] + _wrap(position(t)[0] - longitude[i])
+                station_intervals[i] = (t, station_longitude)
+                if 'station' in event_types and start_jd <= t <= end_jd:
+                    events.append({
+                        'jd': t,
+                        'datetime': calculator.julian_day_to_datetime(t).isoformat(),
+                        'planet': planet_name,
+                        'type': 'station',
+                        'direction': 'retrograde' if speed[i] > 0 else 'direct',
+                        'longitude': station_longitude % 360.0,
+                        'sign': calculator.get_sign_from_longitude(station_longitude % 360.0),
+                    })
+
+        if not families:
+            continue
+
+        # Index of the last boundary at or below each sample, per family
+        levels = np.floor((unwrapped[None, :] - bases) / periods)
+        changed = levels[:, :-1] != levels[:, 1:]
+        for i in station_intervals:
+            changed[:, i] = True
+
+        for family_index, i in zip(*np.nonzero(changed)):
+            i = int(i)
+            kind, base, period, meta = families[family_index]
+
+            # Monotonic pieces of this grid interval
+            pieces = [(jds[i], longitude[i], jds[i + 1], longitude[i + 1])]
+            if i in station_intervals:
+                t_station, l_station = station_intervals[i]
+                pieces = [(jds[i], longitude[i], t_station, l_station),
+                          (t_station, l_station, jds[i + 1], longitude[i + 1])]
+
+            for a, la, b, lb in pieces:
+                direct = lb >= la
+                low, high = (la, lb) if direct else (lb, la)
+                first = math.floor((low - base) / period) + 1
+                last = math.floor((high - base) / period)
+                boundaries = [base + k * period for k in range(first, last + 1)]
+                if not direct:
+                    boundaries.reverse()
+
+                for target in boundaries:
+                    t = _refine_crossing(position, target, a, b, la - target, lb - target)
+                    if start_jd <= t <= end_jd:
+                        events.append(_crossing_event(planet_name, kind, target, t, direct, meta))
+
+    events.sort(key=lambda event: event['jd'])
+    return events
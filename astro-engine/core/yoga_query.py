@@ -0,0 +1,127 @@
+"""
+Memoized yoga detection and composable filtering for /yogas/query
+
+Detected yogas are cached under a fingerprint of the facts the rules read
+(planet houses, longitudes, signs, dignities and house lords), so repeated
+queries for the same chart skip detection entirely.
+"""
+
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+from schemas.birth_data import ChartData, Yoga
+from core.calculator import ENGINE_VERSION
+from core.chart_cache import LRUTier
+from core.metrics import span
+from core.yoga_rules import chart_facts, detect_yogas
+
+YOGA_CACHE_SIZE = int(os.getenv("YOGA_CACHE_SIZE", "10000"))
+YOGA_CACHE_TTL = float(os.getenv("YOGA_CACHE_TTL", "86400"))
+
+yoga_cache = LRUTier(YOGA_CACHE_SIZE, YOGA_CACHE_TTL)
+
+
+def chart_fingerprint(chart: ChartData) -> str:
+    """
+    Hash of everything yoga detection depends on
+
+    Args:
+        chart: Complete birth chart data
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    facts = chart_facts(chart)
+    payload = json.dumps(
+        [ENGINE_VERSION, facts.planet_names, facts.tables],
+        sort_keys=True,
+        separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def detect_yogas_cached(chart: ChartData, fingerprint: Optional[str] = None) -> List[Yoga]:
+    """
+    detect_yogas, memoized per chart fingerprint
+
+    Args:
+        chart: Complete birth chart data
+        fingerprint: chart_fingerprint(chart), if the caller already has it
+
+    Returns:
+        List of detected yogas (shared with other callers; do not mutate)
+    """
+    key = fingerprint or chart_fingerprint(chart)
+    yogas = yoga_cache.get(key)
+    if yogas is None:
+        with span('yogas'):
+            yogas = detect_yogas(chart)
+        yoga_cache.set(key, yogas)
+    return yogas
+
+
+def filter_yogas(
+    yogas: List[Yoga],
+    types: Optional[List[str]] = None,
+    benefic: Optional[bool] = None,
+    strengths: Optional[List[str]] = None,
+    planets: Optional[List[str]] = None,
+    houses: Optional[List[int]] = None,
+) -> List[Yoga]:
+    """
+    Yogas matching every given filter (None = no constraint)
+
+    Args:
+        yogas: Detected yogas
+        types: Allowed yoga types (raj, dhana, ...)
+        benefic: True for benefic only, False for malefic only
+        strengths: Allowed strengths (weak, moderate, strong, exceptional)
+        planets: Keep yogas involving any of these planets
+        houses: Keep yogas involving any of these houses
+
+    Returns:
+        Matching yogas in detection order
+    """
+    planets = set(planets) if planets else None
+    houses = set(houses) if houses else None
+    return [
+        y for y in yogas
+        if (not types or y.type in types)
+        and (benefic is None or y.benefic == benefic)
+        and (not strengths or y.strength in strengths)
+        and (planets is None or not planets.isdisjoint(y.planets_involved))
+        and (houses is None or not houses.isdisjoint(y.houses_involved))
+    ]
+
+
+def summarize_yogas(yogas: List[Yoga], group_by: str = 'type') -> Dict:
+    """
+    Group yogas and count them by type, strength and benefic/malefic
+
+    Args:
+        yogas: Yogas to summarize
+        group_by: Yoga field to group on (type, strength or benefic)
+
+    Returns:
+        Dict with groups (key -> yogas) and counts
+    """
+    groups: Dict[str, List[Yoga]] = {}
+    for yoga in yogas:
+        key = getattr(yoga, group_by)
+        if group_by == 'benefic':
+            key = 'benefic' if key else 'malefic'
+        groups.setdefault(key, []).append(yoga)
+
+    benefic_count = sum(1 for y in yogas if y.benefic)
+    return {
+        'groups': groups,
+        'counts': {
+            'type': dict(Counter(y.type for y in yogas)),
+            'strength': dict(Counter(y.strength for y in yogas)),
+            'benefic': benefic_count,
+            'malefic': len(yogas) - benefic_count,
+        }
+    }
@@ -1,14 +1,36 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from contextlib import asynccontextmanager
 import uvicorn
 import os
 
-from routers import chart, dasha, yogas, pdf
+from routers import chart, dasha, yogas, pdf, ephemeris, admin
+from core.executor import compute_pool, pdf_pool, pdf_job_pool, PoolSaturatedError
+from core.ephemeris_table import get_table
+from core.chart_cache import chart_cache
+from core.pdf_jobs import pdf_jobs
+from core.yoga_query import yoga_cache
+from core.metrics import METRICS_ENABLED, MetricsMiddleware, registry
+from core.profiler import PROFILER_ENABLED
 
 # Environment configuration
 is_production = os.getenv("ENVIRONMENT", "development") == "production"
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:3001").split(",")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start-up / shutdown hooks"""
+    compute_pool.warm_up()
+    get_table()  # map the precomputed ephemeris if one has been generated
+    pdf_jobs.sweep(force=True)  # PDFs left by a previous run past their TTL
+    yield
+    compute_pool.shutdown()
+    pdf_pool.shutdown()
+    pdf_job_pool.shutdown()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="JyotishAI Astro Engine",
@@ -16,6 +38,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url=None if is_production else "/docs",
     redoc_url=None if is_production else "/redoc",
+    lifespan=lifespan,
 )
 
 # CORS middleware
@@ -27,11 +50,65 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request stage timings (outermost, so it sees the whole request)
+app.add_middleware(MetricsMiddleware)
+
+
+def _runtime_metrics():
+    """Cache and pool counters, read when /metrics is scraped"""
+    stats = chart_cache.stats()
+    yield ('astro_chart_cache_hits_total', 'counter', 'Chart cache hits per tier',
+           [({'tier': 'memory'}, stats['memory_hits']), ({'tier': 'shared'}, stats['shared_hits'])])
+    yield ('astro_chart_cache_misses_total', 'counter', 'Charts computed because no tier had them',
+           [({}, stats['misses'])])
+    yield ('astro_chart_cache_entries', 'gauge', 'Charts in the memory tier',
+           [({}, stats['memory_entries'])])
+    yield ('astro_yoga_cache_hits_total', 'counter', 'Yoga cache hits', [({}, yoga_cache.hits)])
+    yield ('astro_yoga_cache_misses_total', 'counter', 'Yoga cache misses', [({}, yoga_cache.misses)])
+
+    jobs = pdf_jobs.stats()
+    yield ('astro_pdf_jobs', 'gauge', 'PDF jobs held by this process per status',
+           [({'status': status}, jobs[status]) for status in ('pending', 'done', 'failed')])
+    yield ('astro_pdf_jobs_submitted_total', 'counter', 'PDF jobs queued for rendering',
+           [({}, jobs['submitted'])])
+    yield ('astro_pdf_jobs_deduped_total', 'counter', 'PDF job requests answered by an existing job',
+           [({}, jobs['deduped'])])
+
+    pools = (compute_pool, pdf_pool, pdf_job_pool)
+    yield ('astro_pool_workers', 'gauge', 'Workers per pool',
+           [({'pool': pool.name}, pool.max_workers) for pool in pools])
+    yield ('astro_pool_in_flight', 'gauge', 'Jobs running or queued per pool',
+           [({'pool': pool.name}, pool.in_flight) for pool in pools])
+    yield ('astro_pool_queue_depth', 'gauge', 'Jobs waiting for a worker per pool',
+           [({'pool': pool.name}, pool.queue_depth) for pool in pools])
+    yield ('astro_pool_rejected_total', 'counter', 'Jobs shed with 503 per pool',
+           [({'pool': pool.name}, pool.rejected) for pool in pools])
+
+
+registry.add_collector(_runtime_metrics)
+
+
+# Load shedding
+@app.exception_handler(PoolSaturatedError)
+async def pool_saturated_handler(request: Request, exc: PoolSaturatedError):
+    """Shed load with 503 + Retry-After when a worker pool is full"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
 # Include routers
 app.include_router(chart.router)
 app.include_router(dasha.router)
 app.include_router(yogas.router)
 app.include_router(pdf.router)
+app.include_router(ephemeris.router)
+
+# Sampling profiler: only mounted when PROFILER_TOKEN is set
+if PROFILER_ENABLED:
+    app.include_router(admin.router)
 
 
 @app.get("/")
@@ -42,6 +119,7 @@ async def root():
         "dasha": "/dasha",
         "yogas": "/yogas",
         "pdf": "/pdf",
+        "ephemeris": "/ephemeris",
     }
     if not is_production:
         endpoints["docs"] = "/docs"
@@ -60,6 +138,14 @@ async def health_check():
     return {"status": "healthy", "service": "astro-engine"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Request latency, per-stage timings and counters in Prometheus text format"""
+    if not METRICS_ENABLED:
+        return PlainTextResponse("metrics disabled\n", status_code=404)
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
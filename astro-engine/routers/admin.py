@@ -0,0 +1,67 @@
+import asyncio
+import hmac
+import os
+import time
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from core.profiler import (
+    DEFAULT_INTERVAL, PROFILE_MAX_SECONDS, PROFILER_TOKEN, ProfilerError, run_profile
+)
+
+# Only included by main.py when core.profiler.PROFILER_ENABLED
+router = APIRouter(prefix="/admin", tags=["admin"], include_in_schema=False)
+
+# One profile at a time per API process
+_profile_lock = asyncio.Lock()
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Check X-Admin-Token against PROFILER_TOKEN (never open, even if mounted without one)"""
+    if not PROFILER_TOKEN or not hmac.compare_digest(x_admin_token or '', PROFILER_TOKEN):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@router.post("/profile", dependencies=[Depends(require_admin)])
+async def profile_worker(
+    seconds: float = Query(10.0, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(DEFAULT_INTERVAL * 1000.0, ge=1.0, le=1000.0),
+    mode: Literal['auto', 'sampler', 'py-spy'] = 'auto',
+    idle: bool = False,
+):
+    """
+    Sample this API worker and its pool processes for a while
+
+    Traffic keeps being served during the window. The response is a
+    collapsed-stack file (flamegraph.pl, speedscope, inferno).
+
+    Args:
+        seconds: Length of the sampling window
+        interval_ms: Sampling interval in milliseconds
+        mode: py-spy, sampler (stdlib) or auto (py-spy when it can run)
+        idle: Include threads that are only waiting
+
+    Returns:
+        text/plain collapsed stacks; X-Profile-Mode names the back end used
+    """
+    if _profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    async with _profile_lock:
+        try:
+            collapsed, used = await run_profile(seconds, interval_ms / 1000.0, mode, idle)
+        except ProfilerError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Profiling error: {str(e)}")
+
+    filename = f"profile-{os.getpid()}-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        collapsed,
+        headers={
+            'Content-Disposition': f'attachment; filename="{filename}"',
+            'X-Profile-Mode': used,
+        }
+    )
@@ -1,30 +1,40 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 from typing import List
 
-try:
-    from zoneinfo import ZoneInfo
-except ImportError:
-    from backports.zoneinfo import ZoneInfo
-
 from schemas.birth_data import (
-    BirthData, ChartData, Planet, House, TransitData,
-    TransitVsNatalData, TransitAspect
+    BirthData, ChartData, Planet, TransitData,
+    TransitVsNatalData, TransitAspect, TransitEventRequest, TransitEvent,
+    TransitAlertRequest, TransitAspectsRequest, TransitAspectsData
 )
 from core import calculator
-from core.nakshatra import get_nakshatra
-from core.dasha import calc_dasha_balance, get_dasha_sequence
-from core.yoga_rules import detect_yogas
-from core.ashtakavarga import calc_ashtakavarga
+from core.nakshatra import nakshatra_at
+from core.batch import BATCH_MAX_PROFILES, cached_charts, iter_batch_results
+from core.chart_cache import chart_cache, chart_cache_key
+from core.executor import compute_pool, PoolSaturatedError
+from core.metrics import span
+from core.ephemeris_table import get_table
+from core.transit_events import find_transit_events
+from core.alerts import calc_transit_aspects, scan_transit_alerts
 
 router = APIRouter(prefix="/chart", tags=["chart"])
 
+# Longest window for one transit event search (about ten years)
+TRANSIT_EVENTS_MAX_DAYS = 3660
+
+# Most transit samples per alert scan (the tensor grows with samples x profiles)
+TRANSIT_ALERTS_MAX_SAMPLES = 400
+
 
 @router.post("", response_model=ChartData)
 async def calculate_chart(birth_data: BirthData):
     """
     Calculate complete birth chart from birth data
 
+    The X-Chart-Key response header carries the chart's cache key, which
+    /chart/transits/aspects accepts in place of the whole chart.
+
     Args:
         birth_data: Birth information (date, time, location)
 
@@ -32,146 +42,73 @@ async def calculate_chart(birth_data: BirthData):
         Complete ChartData with planets, houses, dashas, yogas
     """
     try:
-        # Combine date and time
-        birth_datetime = datetime.combine(birth_data.birth_date, birth_data.birth_time)
-
-        # Calculate Julian Day using actual timezone from birth data
-        tz = ZoneInfo(birth_data.timezone)
-        birth_dt_aware = birth_datetime.replace(tzinfo=tz)
-        utc_offset_hours = birth_dt_aware.utcoffset().total_seconds() / 3600
-        jd = calculator.calc_julian_day(birth_datetime, utc_offset_hours)
-
-        # Get ayanamsha
-        ayanamsha = calculator.get_ayanamsha(jd)
-
-        # Calculate planetary positions
-        positions = calculator.calc_planetary_positions(jd)
-
-        # Calculate lagna
-        lagna_degree = calculator.calc_lagna(
-            jd,
-            birth_data.latitude,
-            birth_data.longitude
+        chart = await chart_cache.get_chart(birth_data)
+
+        # Serialize here (the chart is already validated) so it shows up as a stage
+        with span('serialize'):
+            body = chart.model_dump_json()
+        return Response(
+            content=body,
+            media_type='application/json',
+            headers={'X-Chart-Key': chart_cache_key(birth_data)}
         )
 
-        # Calculate houses (Whole Sign)
-        houses_data = calculator.calc_houses(lagna_degree)
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chart calculation error: {str(e)}")
 
-        # Build Planet objects
-        planets = []
-        for planet_name, pos_data in positions.items():
-            longitude = pos_data['longitude']
-            sign = calculator.get_sign_from_longitude(longitude)
-            sign_lord = calculator.SIGN_LORDS[sign]
-            degree_in_sign = calculator.get_degree_in_sign(longitude)
-            house = calculator.get_planet_house(longitude, lagna_degree)
-            nakshatra_info = get_nakshatra(longitude)
-            dignity = calculator.get_planet_dignity(planet_name, longitude)
 
-            planet = Planet(
-                name=planet_name,
-                longitude=longitude,
-                latitude=pos_data['latitude'],
-                speed=pos_data['speed'],
-                sign=sign,
-                sign_lord=sign_lord,
-                degree_in_sign=degree_in_sign,
-                house=house,
-                nakshatra=nakshatra_info['name'],
-                nakshatra_lord=nakshatra_info['lord'],
-                pada=nakshatra_info['pada'],
-                is_retrograde=pos_data['is_retrograde'],
-                dignity=dignity
-            )
-            planets.append(planet)
-
-        # Add planets to houses
-        houses = []
-        for house_data in houses_data:
-            planets_in_house = [
-                p.name for p in planets if p.house == house_data['number']
-            ]
-            house = House(
-                number=house_data['number'],
-                sign=house_data['sign'],
-                lord=house_data['lord'],
-                cusp=house_data['cusp'],
-                planets=planets_in_house
-            )
-            houses.append(house)
-
-        # Create lagna as Planet object
-        lagna_sign = calculator.get_sign_from_longitude(lagna_degree)
-        lagna_nakshatra_info = get_nakshatra(lagna_degree)
-
-        lagna = Planet(
-            name='Lagna',
-            longitude=lagna_degree,
-            latitude=0.0,
-            speed=0.0,
-            sign=lagna_sign,
-            sign_lord=calculator.SIGN_LORDS[lagna_sign],
-            degree_in_sign=calculator.get_degree_in_sign(lagna_degree),
-            house=1,
-            nakshatra=lagna_nakshatra_info['name'],
-            nakshatra_lord=lagna_nakshatra_info['lord'],
-            pada=lagna_nakshatra_info['pada'],
-            is_retrograde=False,
-            dignity='neutral'
-        )
+@router.post("/batch")
+async def calculate_chart_batch(profiles: List[BirthData]):
+    """
+    Calculate birth charts for many profiles in one request
 
-        # Calculate Vimshottari Dasha
-        moon_longitude = next(p.longitude for p in planets if p.name == 'Moon')
-        balance_info = calc_dasha_balance(moon_longitude, birth_datetime)
-        dasha_sequence = get_dasha_sequence(birth_datetime, balance_info)
+    Cached charts are served directly; the rest are spread across the
+    compute pool and streamed back as NDJSON, one line per profile in
+    input order. A profile that fails yields an error line instead of
+    failing the whole batch.
 
-        from schemas.birth_data import DashaPeriod, DashaSequence
+    Args:
+        profiles: List of birth information (at most BATCH_MAX_PROFILES)
 
-        dasha_periods = [
-            DashaPeriod(
-                planet=d['planet'],
-                start_date=datetime.fromisoformat(d['start_date']),
-                end_date=datetime.fromisoformat(d['end_date']),
-                level=d['level'],
-                parent_planet=d.get('parent_planet')
-            )
-            for d in dasha_sequence
-        ]
-
-        dasha_at_birth = DashaSequence(
-            birth_date=birth_datetime,
-            balance_at_birth={
-                'nakshatra_lord': balance_info['nakshatra_lord'],
-                'balance_years': balance_info['balance_years']
-            },
-            periods=dasha_periods
+    Returns:
+        StreamingResponse of lines like {"index", "status", "chart" | "error"}
+    """
+    if len(profiles) > BATCH_MAX_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many profiles: at most {BATCH_MAX_PROFILES} per batch"
         )
 
-        # Build ChartData object (without yogas for now)
-        chart_data = ChartData(
-            birth_info=birth_data,
-            julian_day=jd,
-            ayanamsha=ayanamsha,
-            lagna=lagna,
-            planets=planets,
-            houses=houses,
-            dasha_at_birth=dasha_at_birth,
-            yogas=[],
-            ashtakavarga=[]
-        )
+    cached = await cached_charts(profiles)
+    if len(cached) < len(profiles):
+        # Shed with 503 now, before the 200 and the stream have started
+        compute_pool.check_capacity()
+
+    return StreamingResponse(
+        iter_batch_results(profiles, cached),
+        media_type='application/x-ndjson'
+    )
 
-        # Detect yogas
-        yogas = detect_yogas(chart_data)
-        chart_data.yogas = yogas
 
-        # Calculate Ashtakavarga
-        ashtakavarga = calc_ashtakavarga(chart_data)
-        chart_data.ashtakavarga = ashtakavarga
+@router.get("/cache/stats")
+async def get_chart_cache_stats():
+    """
+    Chart cache hit/miss counters
+
+    Returns:
+        Dict with per-tier hits, misses, evictions and sizes
+    """
+    return chart_cache.stats()
 
-        return chart_data
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Chart calculation error: {str(e)}")
+def _transit_positions(jd: float):
+    """Shared precomputed table when it covers jd, Swiss Ephemeris otherwise"""
+    table = get_table()
+    if table is not None and table.covers(jd):
+        return table.positions_at(jd)
+    return calculator.calc_planetary_positions(jd)
 
 
 @router.get("/transits", response_model=TransitData)
@@ -186,7 +123,7 @@ async def get_current_transits():
         now = datetime.utcnow()
         jd = calculator.calc_julian_day(now, utc_offset_hours=0)  # UTC
 
-        positions = calculator.calc_planetary_positions(jd)
+        positions = _transit_positions(jd)
 
         planets = []
         for planet_name, pos_data in positions.items():
@@ -194,7 +131,7 @@ async def get_current_transits():
             sign = calculator.get_sign_from_longitude(longitude)
             sign_lord = calculator.SIGN_LORDS[sign]
             degree_in_sign = calculator.get_degree_in_sign(longitude)
-            nakshatra_info = get_nakshatra(longitude)
+            nakshatra = nakshatra_at(longitude)
 
             planet = Planet(
                 name=planet_name,
@@ -205,9 +142,9 @@ async def get_current_transits():
                 sign_lord=sign_lord,
                 degree_in_sign=degree_in_sign,
                 house=1,  # Not applicable for transits without natal chart
-                nakshatra=nakshatra_info['name'],
-                nakshatra_lord=nakshatra_info['lord'],
-                pada=nakshatra_info['pada'],
+                nakshatra=nakshatra.name,
+                nakshatra_lord=nakshatra.lord,
+                pada=nakshatra.pada,
                 is_retrograde=pos_data['is_retrograde'],
                 dignity='neutral'
             )
@@ -223,6 +160,154 @@ async def get_current_transits():
         raise HTTPException(status_code=500, detail=f"Transit calculation error: {str(e)}")
 
 
+@router.post("/transits/events", response_model=List[TransitEvent])
+async def search_transit_events(request: TransitEventRequest):
+    """
+    Find ingresses, nakshatra changes, stations and exact natal aspects
+
+    Event times are refined to about a second (see core/transit_events.py).
+
+    Args:
+        request: Time window, natal longitudes and event filters
+
+    Returns:
+        List of TransitEvent sorted by time
+    """
+    start_jd = calculator.utc_julian_day(request.start)
+    end_jd = calculator.utc_julian_day(request.end)
+
+    if end_jd <= start_jd:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end_jd - start_jd > TRANSIT_EVENTS_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large: at most {TRANSIT_EVENTS_MAX_DAYS} days per request"
+        )
+
+    try:
+        return await compute_pool.run(
+            find_transit_events,
+            start_jd,
+            end_jd,
+            request.natal_points,
+            request.planets,
+            request.event_types,
+            request.aspects
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transit event search error: {str(e)}")
+
+
+@router.post("/transits/alerts")
+async def scan_transit_alerts_bulk(request: TransitAlertRequest):
+    """
+    Transit-to-natal aspect hits for many profiles in one call
+
+    Transit positions are computed once for the window and compared with
+    every profile's natal longitudes as one array operation. Only hits
+    (closest approach within the profile's orb) are returned.
+
+    Args:
+        request: Window, natal longitude matrix, per-profile orbs and filters
+
+    Returns:
+        Dict with window info and columnar hits (profile_id, transit_planet,
+        natal_point, aspect_type, orb, jd of closest approach)
+    """
+    start_jd = calculator.utc_julian_day(request.start)
+    end_jd = calculator.utc_julian_day(request.end) if request.end else start_jd
+
+    if end_jd < start_jd:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end_jd - start_jd) / request.step_days + 1 > TRANSIT_ALERTS_MAX_SAMPLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large: at most {TRANSIT_ALERTS_MAX_SAMPLES} samples per request"
+        )
+
+    profile_count = len(request.profile_ids)
+    if len(request.longitudes) != profile_count:
+        raise HTTPException(status_code=400, detail="longitudes must have one row per profile")
+    if any(len(row) != len(request.natal_points) for row in request.longitudes):
+        raise HTTPException(status_code=400, detail="each longitudes row must match natal_points")
+    orbs = request.orbs if request.orbs is not None else [request.default_orb] * profile_count
+
+    try:
+        return await compute_pool.run(
+            scan_transit_alerts,
+            start_jd,
+            end_jd,
+            request.natal_points,
+            request.longitudes,
+            orbs,
+            request.profile_ids,
+            request.planets,
+            request.aspects,
+            request.step_days
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transit alert scan error: {str(e)}")
+
+
+@router.post("/transits/aspects", response_model=TransitAspectsData, response_model_exclude_none=True)
+async def calculate_transit_aspects(request: TransitAspectsRequest):
+    """
+    Slim transit-vs-natal: aspects without echoing the natal chart
+
+    The natal side is either a chart cache key (X-Chart-Key from POST
+    /chart) or plain natal longitudes. Only the requested sections are
+    returned.
+
+    Args:
+        request: Natal reference, optional instant, orb and sections
+
+    Returns:
+        TransitAspectsData with the requested sections
+    """
+    if request.natal_longitudes is not None:
+        natal_longitudes = request.natal_longitudes
+    elif request.chart_key is not None:
+        natal_chart = await chart_cache.get_cached(request.chart_key)
+        if natal_chart is None:
+            raise HTTPException(status_code=404, detail="Unknown or expired chart_key")
+        natal_longitudes = {p.name: p.longitude for p in natal_chart.planets}
+        natal_longitudes['Lagna'] = natal_chart.lagna.longitude
+    else:
+        raise HTTPException(status_code=400, detail="Provide chart_key or natal_longitudes")
+
+    try:
+        at = request.at or datetime.utcnow()
+        jd = calculator.utc_julian_day(at)
+        transit_longitudes = {
+            name: pos_data['longitude'] for name, pos_data in _transit_positions(jd).items()
+        }
+
+        aspects, significant_transits = calc_transit_aspects(
+            transit_longitudes, natal_longitudes, request.orb
+        )
+
+        return TransitAspectsData(
+            calculated_at=at,
+            julian_day=jd,
+            aspects=aspects if 'aspects' in request.include else None,
+            significant_transits=significant_transits if 'significant_transits' in request.include else None,
+            transits=transit_longitudes if 'transits' in request.include else None
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Transit aspect calculation error: {str(e)}")
+
+
 @router.post("/transits/natal", response_model=TransitVsNatalData)
 async def calculate_transits_vs_natal(natal_chart: ChartData):
     """
@@ -238,56 +323,15 @@ async def calculate_transits_vs_natal(natal_chart: ChartData):
         # Get current transits
         current_transits = await get_current_transits()
 
-        # Calculate aspects
-        aspects = []
-        significant_transits = []
-
-        transit_planets = {p.name: p for p in current_transits.planets}
-        natal_planets = {p.name: p for p in natal_chart.planets}
-
-        for transit_name, transit_planet in transit_planets.items():
-            for natal_name, natal_planet in natal_planets.items():
-                diff = abs(transit_planet.longitude - natal_planet.longitude)
-                if diff > 180:
-                    diff = 360 - diff
-
-                # Determine aspect type
-                aspect_type = None
-                orb_tolerance = 5.0  # degrees
-
-                if diff <= orb_tolerance:
-                    aspect_type = 'conjunction'
-                elif abs(diff - 60) <= orb_tolerance:
-                    aspect_type = 'sextile'
-                elif abs(diff - 90) <= orb_tolerance:
-                    aspect_type = 'square'
-                elif abs(diff - 120) <= orb_tolerance:
-                    aspect_type = 'trine'
-                elif abs(diff - 180) <= orb_tolerance:
-                    aspect_type = 'opposition'
-
-                if aspect_type:
-                    is_exact = diff <= 1.0 or abs(diff - 60) <= 1.0 or abs(diff - 90) <= 1.0 or abs(diff - 120) <= 1.0 or abs(diff - 180) <= 1.0
-
-                    aspect = TransitAspect(
-                        transit_planet=transit_name,
-                        natal_planet=natal_name,
-                        aspect_type=aspect_type,
-                        orb=diff,
-                        is_exact=is_exact
-                    )
-                    aspects.append(aspect)
-
-                    # Significant transits
-                    if transit_name in ['Saturn', 'Jupiter', 'Rahu', 'Ketu'] and aspect_type in ['conjunction', 'opposition']:
-                        significant_transits.append(
-                            f"Transiting {transit_name} {aspect_type} natal {natal_name} (orb: {diff:.2f}°)"
-                        )
+        aspects, significant_transits = calc_transit_aspects(
+            {p.name: p.longitude for p in current_transits.planets},
+            {p.name: p.longitude for p in natal_chart.planets}
+        )
 
         return TransitVsNatalData(
             natal_chart=natal_chart,
             current_transits=current_transits,
-            aspects=aspects,
+            aspects=[TransitAspect(**aspect) for aspect in aspects],
             significant_transits=significant_transits
         )
 
@@ -1,25 +1,32 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from datetime import datetime
 from typing import Dict, List
+import os
 
-try:
-    from zoneinfo import ZoneInfo
-except ImportError:
-    from backports.zoneinfo import ZoneInfo
-
-from schemas.birth_data import BirthData, DashaPeriod, DashaSequence
+from schemas.birth_data import (
+    BirthData, DashaSequence, DashaSystemName, DashaSystemsRequest, DashaTransitionRequest, DashaTreeRequest
+)
 from core.dasha import (
-    calc_dasha_balance,
-    get_dasha_sequence,
     get_antardasha,
-    get_pratyantardasha,
-    get_current_dasha
+    get_pratyantardasha
 )
 from core import calculator
-from core.nakshatra import get_nakshatra
+from core.chart_cache import chart_cache
+from core.dasha_queries import current_dasha_periods, dasha_systems, dasha_tree
+from core.dasha_transitions import scan_dasha_transitions
+from core.executor import compute_pool, PoolSaturatedError
 
 router = APIRouter(prefix="/dasha", tags=["dasha"])
 
+# Largest /dasha/tree response (periods); the full 5-level tree has ~74k
+DASHA_TREE_MAX_NODES = int(os.getenv("DASHA_TREE_MAX_NODES", "25000"))
+
+# Most dates per /dasha/current request
+DASHA_CURRENT_MAX_DATES = 1000
+
+# Longest window for one /dasha/transitions scan
+DASHA_TRANSITIONS_MAX_DAYS = float(os.getenv("DASHA_TRANSITIONS_MAX_DAYS", "366"))
+
 
 @router.post("", response_model=DashaSequence)
 async def calculate_dasha(birth_data: BirthData):
@@ -33,95 +40,191 @@ async def calculate_dasha(birth_data: BirthData):
         Complete DashaSequence with 120-year periods
     """
     try:
-        # Combine date and time
-        birth_datetime = datetime.combine(birth_data.birth_date, birth_data.birth_time)
-
-        # Calculate Julian Day using actual timezone from birth data
-        tz = ZoneInfo(birth_data.timezone)
-        birth_dt_aware = birth_datetime.replace(tzinfo=tz)
-        utc_offset_hours = birth_dt_aware.utcoffset().total_seconds() / 3600
-        jd = calculator.calc_julian_day(birth_datetime, utc_offset_hours)
-
-        # Calculate Moon position
-        positions = calculator.calc_planetary_positions(jd)
-        moon_longitude = positions['Moon']['longitude']
-
-        # Calculate dasha balance
-        balance_info = calc_dasha_balance(moon_longitude, birth_datetime)
-
-        # Get dasha sequence
-        dasha_sequence = get_dasha_sequence(birth_datetime, balance_info)
-
-        # Convert to Pydantic models
-        dasha_periods = [
-            DashaPeriod(
-                planet=d['planet'],
-                start_date=datetime.fromisoformat(d['start_date']),
-                end_date=datetime.fromisoformat(d['end_date']),
-                level=d['level'],
-                parent_planet=d.get('parent_planet')
-            )
-            for d in dasha_sequence
-        ]
-
-        return DashaSequence(
-            birth_date=birth_datetime,
-            balance_at_birth={
-                'nakshatra_lord': balance_info['nakshatra_lord'],
-                'balance_years': balance_info['balance_years'],
-                'nakshatra_name': balance_info['nakshatra_name']
-            },
-            periods=dasha_periods
-        )
+        # The dasha sequence is part of the (cached) birth chart
+        chart = await chart_cache.get_chart(birth_data)
+        return chart.dasha_at_birth
 
+    except PoolSaturatedError:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Dasha calculation error: {str(e)}")
 
 
-@router.post("/current")
-async def get_current_dasha_periods(birth_data: BirthData, date: datetime = None):
+@router.post("/tree")
+async def get_dasha_tree(request: DashaTreeRequest):
     """
-    Get current mahadasha, antardasha, pratyantardasha for a given date
+    Mahadasha -> antardasha -> ... -> prana periods in one response
+
+    Every mahadasha is listed; the sub-periods of a period are listed only
+    if it overlaps the [start, end) window, so a zoomed timeline gets the
+    deep levels for the visible years only.
 
     Args:
-        birth_data: Birth information
-        date: Date to check (defaults to today)
+        request: Birth data, depth (1-5) and optional window
 
     Returns:
-        Dict with current periods at all three levels
+        Dict with birth (ISO), levels, lords and periods: nested
+        [lord, start, end, children?] arrays where lord indexes lords and
+        start/end are days since birth
     """
     try:
-        if date is None:
-            date = datetime.now()
+        return await compute_pool.run(
+            dasha_tree,
+            request.birth_data,
+            request.depth,
+            request.start,
+            request.end,
+            DASHA_TREE_MAX_NODES
+        )
 
-        # Calculate dasha sequence
-        dasha_result = await calculate_dasha(birth_data)
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Dasha tree error: {str(e)}")
 
-        # Convert DashaPeriod to dict format expected by get_current_dasha
-        sequence = [
-            {
-                'planet': p.planet,
-                'start_date': p.start_date.isoformat(),
-                'end_date': p.end_date.isoformat(),
-                'level': p.level
-            }
-            for p in dasha_result.periods
-        ]
 
-        # Get current periods
-        current = get_current_dasha(sequence, date)
+@router.post("/transitions")
+async def scan_dasha_transitions_bulk(request: DashaTransitionRequest):
+    """
+    Mahadasha/antardasha/pratyantardasha changes for many profiles
 
-        if not current:
-            raise HTTPException(status_code=404, detail="No dasha found for given date")
+    Per-profile period iterators are merged into one time-ordered stream
+    (see core/dasha_transitions.py). Profiles are either cached Moon
+    longitudes with birth Julian Days or full birth data.
 
-        return {
-            'date': date.isoformat(),
-            'mahadasha': current['mahadasha'],
-            'antardasha': current['antardasha'],
-            'pratyantardasha': current['pratyantardasha']
-        }
+    Args:
+        request: Window, depth and profiles
+
+    Returns:
+        Dict with window info and columnar transitions (profile_id, jd,
+        level, lords)
+    """
+    start_jd = calculator.utc_julian_day(request.start)
+    end_jd = calculator.utc_julian_day(request.end)
+
+    if end_jd <= start_jd:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if end_jd - start_jd > DASHA_TRANSITIONS_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large: at most {DASHA_TRANSITIONS_MAX_DAYS:g} days per request"
+        )
+
+    profile_count = len(request.profile_ids)
+    if request.profiles is not None:
+        if len(request.profiles) != profile_count:
+            raise HTTPException(status_code=400, detail="profiles must have one entry per profile_id")
+    elif request.birth_jds is None or request.moon_longitudes is None:
+        raise HTTPException(status_code=400, detail="Provide profiles or birth_jds with moon_longitudes")
+    elif not len(request.birth_jds) == len(request.moon_longitudes) == profile_count:
+        raise HTTPException(
+            status_code=400,
+            detail="birth_jds and moon_longitudes must have one entry per profile_id"
+        )
+
+    try:
+        return await compute_pool.run(
+            scan_dasha_transitions,
+            start_jd,
+            end_jd,
+            request.profile_ids,
+            request.birth_jds,
+            request.moon_longitudes,
+            request.profiles,
+            request.depth
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Dasha transition scan error: {str(e)}")
+
+
+@router.post("/systems")
+async def calculate_dasha_systems(request: DashaSystemsRequest):
+    """
+    Several dasha systems for one birth in one call
+
+    The Moon at birth is computed once and every requested system is
+    derived from it by the shared kernel in core/dasha_engine.py.
+
+    Args:
+        request: Birth data, systems, tree depth and window, date of the current periods
+
+    Returns:
+        Dict with birth (ISO), moon_longitude, levels and per system: lords,
+        rulers, years, balance at birth, current periods (dicts like
+        /dasha/current, or null outside the timeline) and periods (nested
+        [lord, start, end, children?] arrays as in /dasha/tree)
+    """
+    try:
+        return await compute_pool.run(
+            dasha_systems,
+            request.birth_data,
+            request.systems,
+            request.depth,
+            request.start,
+            request.end,
+            request.date,
+            DASHA_TREE_MAX_NODES
+        )
+
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Dasha systems calculation error: {str(e)}")
+
+
+@router.post("/current")
+async def get_current_dasha_periods(
+    birth_data: BirthData,
+    date: datetime = None,
+    dates: List[datetime] = Query(None),
+    system: DashaSystemName = 'vimshottari'
+):
+    """
+    Get current mahadasha, antardasha, pratyantardasha for one or more dates
+
+    No chart is built: only the Moon at birth is computed and the running
+    periods are found arithmetically from the dasha balance.
+
+    Args:
+        birth_data: Birth information
+        date: Date to check (defaults to now)
+        dates: Several dates to check in one call (repeat the parameter)
+        system: Dasha system (core/dasha_systems.py)
+
+    Returns:
+        Dict with current periods at all three levels; with dates,
+        {"results": [...]} holding one such dict per date
+    """
+    moments = dates or [date or datetime.now()]
+    if len(moments) > DASHA_CURRENT_MAX_DATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many dates: at most {DASHA_CURRENT_MAX_DATES} per request"
+        )
+
+    try:
+        # One date is a single Moon computation; many go to the pool
+        if len(moments) == 1:
+            results = current_dasha_periods(birth_data, moments, system)
+        else:
+            results = await compute_pool.run(current_dasha_periods, birth_data, moments, system)
+
+        missing = next((result['date'] for result in results if result['mahadasha'] is None), None)
+        if missing is not None:
+            raise HTTPException(status_code=404, detail=f"No dasha found for {missing}")
+
+        return {'results': results} if dates else results[0]
 
-    except HTTPException:
+    except (HTTPException, PoolSaturatedError):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Current dasha calculation error: {str(e)}")
@@ -0,0 +1,81 @@
+from fastapi import APIRouter, HTTPException, Query, Response
+from datetime import datetime
+
+from core import calculator
+from core.executor import compute_pool, PoolSaturatedError
+from core.ephemeris_table import ephemeris_payload
+
+router = APIRouter(prefix="/ephemeris", tags=["ephemeris"])
+
+# Upper bound on samples per planet for one request
+EPHEMERIS_MAX_SAMPLES = 100_000
+# JSON is about ten times larger and slower to build than the binary format
+EPHEMERIS_MAX_JSON_SAMPLES = 10_000
+
+BINARY_LAYOUT = (
+    "jd:f8[n];longitude:f8[p,n];latitude:f8[p,n];speed:f8[p,n];is_retrograde:u1[p,n]"
+)
+
+
+@router.get("")
+async def get_ephemeris(
+    start: datetime,
+    end: datetime,
+    step_days: float = Query(1.0, gt=0),
+    format: str = Query("json", pattern="^(json|binary)$"),
+    exact: bool = False
+):
+    """
+    Sidereal positions of all nine grahas over a time range
+
+    Args:
+        start: First instant (naive values are UTC)
+        end: Last instant (included if it falls on a step)
+        step_days: Spacing between samples in days
+        format: "json" for columnar JSON (up to EPHEMERIS_MAX_JSON_SAMPLES),
+            "binary" for packed little-endian arrays laid out as described
+            by the X-Ephemeris-Layout header (up to EPHEMERIS_MAX_SAMPLES)
+        exact: Always call Swiss Ephemeris instead of interpolating the
+            precomputed table (see core/ephemeris_table.py for its error)
+
+    Returns:
+        Columnar arrays of jd, longitude, latitude, speed, is_retrograde
+    """
+    start_jd = calculator.utc_julian_day(start)
+    end_jd = calculator.utc_julian_day(end)
+
+    if end_jd < start_jd:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    samples = (end_jd - start_jd) / step_days + 1
+    if samples > EPHEMERIS_MAX_SAMPLES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range too large: at most {EPHEMERIS_MAX_SAMPLES} samples per request"
+        )
+    if format == "json" and samples > EPHEMERIS_MAX_JSON_SAMPLES:
+        raise HTTPException(
+            status_code=400,
+            detail=(f"Range too large for format=json: at most {EPHEMERIS_MAX_JSON_SAMPLES} samples; "
+                    f"use format=binary for up to {EPHEMERIS_MAX_SAMPLES}")
+        )
+
+    try:
+        body, source, planets, count = await compute_pool.run(
+            ephemeris_payload, start_jd, end_jd, step_days, format == "binary", exact
+        )
+
+    except PoolSaturatedError:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ephemeris calculation error: {str(e)}")
+
+    if format == "binary":
+        headers = {
+            'X-Ephemeris-Planets': ",".join(planets),
+            'X-Ephemeris-Samples': str(count),
+            'X-Ephemeris-Layout': BINARY_LAYOUT,
+            'X-Ephemeris-Source': source,
+        }
+        return Response(content=body, media_type='application/octet-stream', headers=headers)
+
+    return Response(content=body, media_type='application/json')
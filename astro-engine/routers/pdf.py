@@ -1,24 +1,64 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+from reportlab.platypus import Paragraph, Spacer
+from html import escape
 from io import BytesIO
-from typing import Dict
+import os
+from datetime import datetime
+from typing import BinaryIO, Dict, Literal, Optional
 from pydantic import BaseModel
 
+from schemas.birth_data import BirthData, ChartData
+from core.chart_cache import chart_cache
+from core.chart_report import chart_report_flowables
+from core.executor import pdf_pool, PoolSaturatedError
+from core.markdown_pdf import markdown_to_flowables
+from core.pdf_jobs import DONE, FAILED, pdf_job_key, pdf_jobs
+from core.pdf_spool import PDF_STREAM_CHUNK, SpooledPdf, open_spooled, run_spooled, spool_output
+from core.report_theme import get_theme, theme_names
+
 router = APIRouter(prefix="/pdf", tags=["pdf"])
 
 
 class ReportRequest(BaseModel):
     """Request model for PDF report generation"""
     title: str
-    content: str  # Markdown or plain text content
+    content: str  # Markdown (see core/markdown_pdf.py) or plain text
     author: str = "JyotishAI"
     subject: str = "Vedic Astrology Report"
+    theme: Optional[str] = None  # Registered report theme (default: PDF_THEME)
+
+
+def write_pdf_report(report_data: ReportRequest, output: BinaryIO) -> None:
+    """
+    Render a styled PDF report with ReportLab into a file object
+
+    Args:
+        report_data: Report content and metadata
+        output: Writable binary file object (BytesIO, PdfSpool, open file)
+    """
+    # Styles and page setup are shared, prebuilt per process
+    theme = get_theme(report_data.theme)
+
+    # Create PDF document
+    doc = theme.doc_template(
+        output,
+        title=report_data.title,
+        author=report_data.author,
+        subject=report_data.subject
+    )
+
+    # Title, then the Markdown body
+    story = [
+        Paragraph(escape(report_data.title, quote=False), theme.styles['Title']),
+        Spacer(1, 0.2 * inch),
+    ]
+    story.extend(markdown_to_flowables(report_data.content, theme, doc.width))
+
+    # Build PDF
+    theme.build(doc, story)
 
 
 def create_pdf_report(report_data: ReportRequest) -> BytesIO:
@@ -32,114 +72,113 @@ def create_pdf_report(report_data: ReportRequest) -> BytesIO:
         BytesIO buffer with PDF data
     """
     buffer = BytesIO()
+    write_pdf_report(report_data, buffer)
+    buffer.seek(0)
+    return buffer
 
-    # Create PDF document
-    doc = SimpleDocTemplate(
-        buffer,
-        pagesize=A4,
-        rightMargin=72,
-        leftMargin=72,
-        topMargin=72,
-        bottomMargin=18,
-    )
 
-    # Define styles
-    styles = getSampleStyleSheet()
-
-    # Custom title style (deep navy + gold theme)
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#c9a227'),  # Gold
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
-    )
+def render_pdf_report(report_data: ReportRequest) -> SpooledPdf:
+    """
+    Pool job behind /pdf/report: render into a spool instead of a BytesIO
+
+    Args:
+        report_data: Report content and metadata
+
+    Returns:
+        SpooledPdf (inline bytes, or a temp file for large reports)
+    """
+    return spool_output(write_pdf_report, report_data)
+
+
+class ChartReportRequest(BaseModel):
+    """Request model for a report rendered from a birth chart"""
+    chart: Optional[ChartData] = None  # A chart from POST /chart ...
+    birth_data: Optional[BirthData] = None  # ... or birth data to compute (cached) one from
+    title: Optional[str] = None  # Default: "Birth Chart of <name>"
+    content: str = ""  # Optional Markdown appended after the tables
+    chart_style: Literal['north', 'south', 'both'] = 'both'
+    theme: Optional[str] = None
+    as_of: Optional[datetime] = None  # Date that picks the running dasha (default: now)
+    author: str = "JyotishAI"
+    subject: str = "Vedic Astrology Report"
 
-    # Custom heading style
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        textColor=colors.HexColor('#1e2d4a'),  # Navy
-        spaceAfter=12,
-        spaceBefore=12,
-        fontName='Helvetica-Bold'
-    )
 
-    # Custom body style
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['BodyText'],
-        fontSize=11,
-        textColor=colors.HexColor('#0f1729'),
-        spaceAfter=12,
-        alignment=TA_JUSTIFY,
-        leading=16
+def _chart_report_title(request: ChartReportRequest, chart: ChartData) -> str:
+    return request.title or f"Birth Chart of {chart.birth_info.name or 'Unknown'}"
+
+
+def write_chart_report(request: ChartReportRequest, chart: ChartData, output: BinaryIO) -> None:
+    """
+    Render a chart report (kundli diagrams, dasha, yoga and ashtakavarga tables)
+
+    Args:
+        request: Report options
+        chart: The birth chart to report on
+        output: Writable binary file object
+    """
+    theme = get_theme(request.theme)
+    title = _chart_report_title(request, chart)
+
+    doc = theme.doc_template(output, title=title, author=request.author, subject=request.subject)
+
+    story = [
+        Paragraph(escape(title, quote=False), theme.styles['Title']),
+        Spacer(1, 0.1 * inch),
+    ]
+    story.extend(chart_report_flowables(chart, theme, doc.width, request.chart_style, request.as_of))
+    if request.content:
+        story.append(Spacer(1, 0.2 * inch))
+        story.extend(markdown_to_flowables(request.content, theme, doc.width))
+
+    theme.build(doc, story)
+
+
+def render_chart_report(request: ChartReportRequest, chart: ChartData) -> SpooledPdf:
+    """Pool job behind /pdf/chart-report"""
+    return spool_output(write_chart_report, request, chart)
+
+
+async def _iter_file(f: BinaryIO):
+    try:
+        while True:
+            chunk = await run_in_threadpool(f.read, PDF_STREAM_CHUNK)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
+
+def spooled_pdf_response(pdf: SpooledPdf, headers: Dict[str, str]) -> Response:
+    """
+    Response for a rendered PDF, streamed from disk in chunks when it was spooled
+
+    Args:
+        pdf: Result of a render job
+        headers: Extra headers (Content-Disposition)
+
+    Returns:
+        Response with the bytes, or StreamingResponse over the temp file
+    """
+    if pdf.path is None:
+        return Response(content=pdf.data, media_type='application/pdf', headers=headers)
+
+    return StreamingResponse(
+        _iter_file(open_spooled(pdf)),
+        media_type='application/pdf',
+        headers={**headers, 'Content-Length': str(pdf.size)}
     )
 
-    # Build story (content)
-    story = []
-
-    # Title
-    story.append(Paragraph(report_data.title, title_style))
-    story.append(Spacer(1, 0.2 * inch))
-
-    # Parse content (simple markdown parsing)
-    lines = report_data.content.split('\n')
-
-    for line in lines:
-        line = line.strip()
-
-        if not line:
-            story.append(Spacer(1, 0.1 * inch))
-            continue
-
-        # Heading (## or #)
-        if line.startswith('## '):
-            heading_text = line[3:].strip()
-            story.append(Paragraph(heading_text, heading_style))
-
-        elif line.startswith('# '):
-            heading_text = line[2:].strip()
-            title_para = ParagraphStyle(
-                'SectionTitle',
-                parent=heading_style,
-                fontSize=18
-            )
-            story.append(Paragraph(heading_text, title_para))
-
-        # List item
-        elif line.startswith('- ') or line.startswith('* '):
-            list_text = line[2:].strip()
-            bullet_style = ParagraphStyle(
-                'Bullet',
-                parent=body_style,
-                leftIndent=20,
-                bulletIndent=10
-            )
-            story.append(Paragraph(f"• {list_text}", bullet_style))
-
-        # Bold text **text**
-        elif '**' in line:
-            line = line.replace('**', '<b>').replace('**', '</b>')
-            story.append(Paragraph(line, body_style))
-
-        # Italic text *text*
-        elif '*' in line and not line.startswith('*'):
-            line = line.replace('*', '<i>').replace('*', '</i>')
-            story.append(Paragraph(line, body_style))
-
-        # Regular paragraph
-        else:
-            story.append(Paragraph(line, body_style))
 
-    # Build PDF
-    doc.build(story)
+@router.get("/themes")
+async def list_report_themes():
+    """
+    Names of the report themes accepted by ReportRequest.theme
 
-    buffer.seek(0)
-    return buffer
+    Returns:
+        Dictionary with the theme names and the default
+    """
+    return {'themes': theme_names(), 'default': get_theme().name}
 
 
 @router.post("/report")
@@ -151,21 +190,22 @@ async def generate_pdf_report(report_data: ReportRequest):
         report_data: Report title, content, and metadata
 
     Returns:
-        PDF file as StreamingResponse
+        PDF file (streamed from a temp file when larger than PDF_SPOOL_THRESHOLD)
     """
     try:
-        pdf_buffer = create_pdf_report(report_data)
+        get_theme(report_data.theme)
+        pdf = await run_spooled(pdf_pool, render_pdf_report, report_data)
 
         headers = {
             'Content-Disposition': f'attachment; filename="{report_data.title.replace(" ", "_")}.pdf"'
         }
 
-        return StreamingResponse(
-            pdf_buffer,
-            media_type='application/pdf',
-            headers=headers
-        )
+        return spooled_pdf_response(pdf, headers)
 
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF generation error: {str(e)}")
 
@@ -179,20 +219,162 @@ async def preview_pdf_report(report_data: ReportRequest):
         report_data: Report title, content, and metadata
 
     Returns:
-        PDF file as StreamingResponse for inline viewing
+        PDF file for inline viewing (streamed like /pdf/report)
     """
     try:
-        pdf_buffer = create_pdf_report(report_data)
+        get_theme(report_data.theme)
+        pdf = await run_spooled(pdf_pool, render_pdf_report, report_data)
 
         headers = {
             'Content-Disposition': f'inline; filename="{report_data.title.replace(" ", "_")}.pdf"'
         }
 
-        return StreamingResponse(
-            pdf_buffer,
-            media_type='application/pdf',
-            headers=headers
-        )
+        return spooled_pdf_response(pdf, headers)
 
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF preview error: {str(e)}")
+
+
+@router.post("/chart-report")
+async def generate_chart_report(request: ChartReportRequest, inline: bool = False):
+    """
+    Generate a PDF report straight from a birth chart
+
+    Kundli diagrams are drawn as vectors and the dasha, yoga and
+    ashtakavarga tables come from the chart itself, so no images need to
+    be rendered and uploaded by the client.
+
+    Args:
+        request: chart or birth_data, plus report options
+        inline: Serve for preview instead of as an attachment
+
+    Returns:
+        PDF file (streamed like /pdf/report)
+    """
+    try:
+        get_theme(request.theme)
+        if request.chart is not None:
+            chart = request.chart
+        elif request.birth_data is not None:
+            chart = await chart_cache.get_chart(request.birth_data)
+        else:
+            raise ValueError("Provide either chart or birth_data")
+
+        # The worker gets the chart once, not twice
+        pdf = await run_spooled(pdf_pool, render_chart_report, request.model_copy(update={'chart': None}), chart)
+
+        disposition = 'inline' if inline else 'attachment'
+        filename = _chart_report_title(request, chart).replace(" ", "_")
+        headers = {
+            'Content-Disposition': f'{disposition}; filename="{filename}.pdf"'
+        }
+
+        return spooled_pdf_response(pdf, headers)
+
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chart report error: {str(e)}")
+
+
+def _job_status(job) -> Dict:
+    status = job.to_dict()
+    status['status_url'] = f"/pdf/jobs/{job.id}"
+    if job.status == DONE:
+        status['download_url'] = f"/pdf/jobs/{job.id}/download"
+    return status
+
+
+@router.post("/jobs", status_code=202)
+async def submit_pdf_job(report_data: ReportRequest):
+    """
+    Queue a PDF report and return at once
+
+    Identical requests share one job (the id is a hash of the request), so
+    resubmitting returns the pending or finished job without rendering again.
+
+    Args:
+        report_data: Report title, content, and metadata
+
+    Returns:
+        Job status with status_url to poll (202, Location header)
+    """
+    try:
+        get_theme(report_data.theme)
+        job = pdf_jobs.submit(
+            pdf_job_key('report', report_data.model_dump(mode='json')),
+            f'{report_data.title.replace(" ", "_")}.pdf',
+            write_pdf_report,
+            report_data
+        )
+    except PoolSaturatedError:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"PDF job error: {str(e)}")
+
+    return JSONResponse(
+        status_code=202,
+        content=_job_status(job),
+        headers={'Location': f"/pdf/jobs/{job.id}"}
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_pdf_job(job_id: str):
+    """
+    Status of a queued PDF report
+
+    Args:
+        job_id: Id returned by POST /pdf/jobs
+
+    Returns:
+        Job status: pending, done (with download_url) or failed (with error)
+    """
+    job = pdf_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired PDF job")
+    return _job_status(job)
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_pdf_job(job_id: str, inline: bool = False):
+    """
+    Download the PDF of a finished job
+
+    Args:
+        job_id: Id returned by POST /pdf/jobs
+        inline: Serve for preview instead of as an attachment
+
+    Returns:
+        PDF file streamed from disk
+    """
+    job = pdf_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired PDF job")
+    if job.status == FAILED:
+        raise HTTPException(status_code=409, detail=f"PDF job failed: {job.error}")
+    if job.status != DONE:
+        raise HTTPException(status_code=409, detail="PDF job has not finished yet")
+
+    try:
+        f = pdf_jobs.open(job)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Unknown or expired PDF job")
+
+    disposition = 'inline' if inline else 'attachment'
+    return StreamingResponse(
+        _iter_file(f),
+        media_type='application/pdf',
+        headers={
+            'Content-Disposition': f'{disposition}; filename="{job.filename}"',
+            'Content-Length': str(os.fstat(f.fileno()).st_size),
+        }
+    )
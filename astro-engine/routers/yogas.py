@@ -1,8 +1,8 @@
 from fastapi import APIRouter, HTTPException
 from typing import List
 
-from schemas.birth_data import ChartData, Yoga
-from core.yoga_rules import detect_yogas
+from schemas.birth_data import ChartData, Yoga, YogaQuery, YogaQueryResult
+from core.yoga_query import chart_fingerprint, detect_yogas_cached, filter_yogas, summarize_yogas
 
 router = APIRouter(prefix="/yogas", tags=["yogas"])
 
@@ -19,13 +19,51 @@ async def detect_chart_yogas(chart_data: ChartData):
         List of detected yogas with strength and descriptions
     """
     try:
-        yogas = detect_yogas(chart_data)
+        yogas = detect_yogas_cached(chart_data)
         return yogas
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Yoga detection error: {str(e)}")
 
 
+@router.post("/query", response_model=YogaQueryResult)
+async def query_yogas(query: YogaQuery):
+    """
+    Detect yogas once and return them filtered, grouped and counted
+
+    Replaces separate calls to /filter/{type}, /benefic, /malefic and
+    /strong. Detection is memoized per chart fingerprint.
+
+    Args:
+        query: Chart plus optional type, benefic, strength, planet and
+            house filters and the field to group on
+
+    Returns:
+        YogaQueryResult with groups and counts of the matching yogas
+    """
+    try:
+        chart_hash = chart_fingerprint(query.chart)
+        all_yogas = detect_yogas_cached(query.chart, chart_hash)
+        matched = filter_yogas(
+            all_yogas,
+            types=query.types,
+            benefic=query.benefic,
+            strengths=query.strengths,
+            planets=query.planets,
+            houses=query.houses
+        )
+
+        return YogaQueryResult(
+            chart_hash=chart_hash,
+            total=len(all_yogas),
+            matched=len(matched),
+            **summarize_yogas(matched, query.group_by)
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Yoga query error: {str(e)}")
+
+
 @router.post("/filter/{yoga_type}", response_model=List[Yoga])
 async def filter_yogas_by_type(chart_data: ChartData, yoga_type: str):
     """
@@ -39,7 +77,7 @@ async def filter_yogas_by_type(chart_data: ChartData, yoga_type: str):
         List of yogas matching the specified type
     """
     try:
-        all_yogas = detect_yogas(chart_data)
+        all_yogas = detect_yogas_cached(chart_data)
         filtered = [y for y in all_yogas if y.type == yoga_type]
         return filtered
 
@@ -59,7 +97,7 @@ async def get_benefic_yogas(chart_data: ChartData):
         List of benefic yogas
     """
     try:
-        all_yogas = detect_yogas(chart_data)
+        all_yogas = detect_yogas_cached(chart_data)
         benefic = [y for y in all_yogas if y.benefic]
         return benefic
 
@@ -79,7 +117,7 @@ async def get_malefic_yogas(chart_data: ChartData):
         List of malefic yogas
     """
     try:
-        all_yogas = detect_yogas(chart_data)
+        all_yogas = detect_yogas_cached(chart_data)
         malefic = [y for y in all_yogas if not y.benefic]
         return malefic
 
@@ -99,7 +137,7 @@ async def get_strong_yogas(chart_data: ChartData):
         List of strong/exceptional yogas
     """
     try:
-        all_yogas = detect_yogas(chart_data)
+        all_yogas = detect_yogas_cached(chart_data)
         strong = [y for y in all_yogas if y.strength in ['strong', 'exceptional']]
         return strong
 
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 from datetime import datetime, date, time
 
 
@@ -66,6 +66,39 @@ class DashaSequence(BaseModel):
     periods: List[DashaPeriod]
 
 
+class DashaTreeRequest(BaseModel):
+    """Birth data plus the part of the dasha tree to expand"""
+    birth_data: BirthData
+    depth: int = Field(3, ge=1, le=5)  # 1 = mahadasha ... 5 = prana
+    start: Optional[datetime] = None  # Window to expand (naive = birth time zone); default: birth
+    end: Optional[datetime] = None  # Default: end of the 120-year cycle
+
+
+# Dasha systems offered by user_preferences.dasha_system (core/dasha_systems.py)
+DashaSystemName = Literal['vimshottari', 'yogini', 'ashtottari']
+
+
+class DashaSystemsRequest(BaseModel):
+    """Birth data plus the dasha systems to compute from one Moon position"""
+    birth_data: BirthData
+    systems: List[DashaSystemName] = ['vimshottari']
+    depth: int = Field(2, ge=1, le=5)  # Tree levels per system (1 = mahadasha ... 5 = prana)
+    start: Optional[datetime] = None  # Window to expand (naive, birth time zone); default: birth
+    end: Optional[datetime] = None  # Default: end of each system's timeline
+    date: Optional[datetime] = None  # Moment of the current periods (default: now)
+
+
+class DashaTransitionRequest(BaseModel):
+    """Profiles and window for a bulk dasha transition scan"""
+    start: datetime  # Naive values are UTC
+    end: datetime
+    depth: int = Field(3, ge=1, le=5)  # Deepest level reported (3 = pratyantardasha)
+    profile_ids: List[str]
+    birth_jds: Optional[List[float]] = None  # Birth Julian Day (UT) per profile
+    moon_longitudes: Optional[List[float]] = None  # Sidereal Moon at birth per profile
+    profiles: Optional[List[BirthData]] = None  # Used instead of birth_jds/moon_longitudes
+
+
 class Yoga(BaseModel):
     """Detected yoga"""
     name: str
@@ -121,3 +154,86 @@ class TransitVsNatalData(BaseModel):
     current_transits: TransitData
     aspects: List[TransitAspect]
     significant_transits: List[str]  # Human-readable descriptions
+
+
+class TransitEventRequest(BaseModel):
+    """Window and filters for a transit event search"""
+    start: datetime  # Naive values are UTC
+    end: datetime
+    natal_points: Dict[str, float] = {}  # e.g. {"Moon": 35.1, "Lagna": 190.2}
+    planets: Optional[List[str]] = None  # Default: all nine grahas
+    event_types: Optional[List[str]] = None  # ingress, nakshatra, station, aspect
+    aspects: Optional[List[str]] = None  # conjunction, sextile, square, trine, opposition
+
+
+class TransitEvent(BaseModel):
+    """A single refined transit event"""
+    jd: float
+    datetime: datetime  # UTC
+    planet: str
+    type: str  # ingress, nakshatra, station, aspect
+    longitude: float
+    is_retrograde: Optional[bool] = None
+    from_sign: Optional[str] = None
+    to_sign: Optional[str] = None
+    from_nakshatra: Optional[str] = None
+    to_nakshatra: Optional[str] = None
+    direction: Optional[str] = None  # Stations: retrograde or direct
+    sign: Optional[str] = None
+    natal_point: Optional[str] = None
+    aspect_type: Optional[str] = None
+    natal_longitude: Optional[float] = None
+
+
+class TransitAlertRequest(BaseModel):
+    """Compact natal longitudes for a bulk transit alert scan"""
+    start: datetime  # Naive values are UTC
+    end: Optional[datetime] = None  # Default: single instant at start
+    step_days: float = Field(1.0, gt=0)
+    natal_points: List[str]  # Column names, e.g. ["Moon", "Lagna"]
+    profile_ids: List[str]
+    longitudes: List[List[Optional[float]]]  # One row per profile; null = unknown
+    orbs: Optional[List[float]] = None  # Per-profile orb in degrees
+    default_orb: float = Field(5.0, gt=0)
+    planets: Optional[List[str]] = None  # Default: all nine grahas
+    aspects: Optional[List[str]] = None  # conjunction, sextile, square, trine, opposition
+
+
+class TransitAspectsRequest(BaseModel):
+    """Natal reference for the slim transit-vs-natal endpoint"""
+    chart_key: Optional[str] = None  # X-Chart-Key from POST /chart
+    natal_longitudes: Optional[Dict[str, float]] = None  # Used instead of chart_key
+    at: Optional[datetime] = None  # Default: now (naive values are UTC)
+    orb: float = Field(5.0, gt=0)
+    include: List[Literal['aspects', 'significant_transits', 'transits']] = [
+        'aspects', 'significant_transits'
+    ]
+
+
+class TransitAspectsData(BaseModel):
+    """Slim transit-vs-natal result; sections not requested are omitted"""
+    calculated_at: datetime
+    julian_day: float
+    aspects: Optional[List[TransitAspect]] = None
+    significant_transits: Optional[List[str]] = None
+    transits: Optional[Dict[str, float]] = None  # Transit longitudes
+
+
+class YogaQuery(BaseModel):
+    """Chart plus composable filters for POST /yogas/query"""
+    chart: ChartData
+    types: Optional[List[str]] = None  # raj, dhana, pancha_mahapurusha, arishta, ...
+    benefic: Optional[bool] = None  # True = benefic only, False = malefic only
+    strengths: Optional[List[str]] = None  # weak, moderate, strong, exceptional
+    planets: Optional[List[str]] = None  # Any of these planets involved
+    houses: Optional[List[int]] = None  # Any of these houses involved
+    group_by: Literal['type', 'strength', 'benefic'] = 'type'
+
+
+class YogaQueryResult(BaseModel):
+    """Filtered yogas grouped by one field, with counts"""
+    chart_hash: str
+    total: int  # Yogas detected before filtering
+    matched: int
+    groups: Dict[str, List[Yoga]]
+    counts: Dict[str, Any]  # type -> n, strength -> n, benefic, malefic (of matched)
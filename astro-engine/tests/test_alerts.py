@@ -0,0 +1,72 @@
+"""
+Tests for the bulk transit alert scan
+"""
+
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.alerts import find_aspect_hits, scan_transit_alerts
+from core.transit_events import ASPECT_ANGLES
+
+
+def _brute_force(transit, natal, orbs, aspects):
+    hits = {}
+    for profile in range(natal.shape[0]):
+        for point in range(natal.shape[1]):
+            for planet in range(transit.shape[0]):
+                best = None
+                for sample in range(transit.shape[1]):
+                    separation = abs(transit[planet, sample] - natal[profile, point]) % 360
+                    separation = min(separation, 360 - separation)
+                    for index, name in enumerate(aspects):
+                        orb = abs(separation - ASPECT_ANGLES[name][0])
+                        if best is None or orb < best[0]:
+                            best = (orb, index)
+                if best[0] <= orbs[profile]:
+                    hits[(profile, point, planet)] = best
+    return hits
+
+
+def test_hits_match_brute_force():
+    """The array scan finds exactly the pairs a nested loop finds"""
+    rng = np.random.default_rng(7)
+    transit = rng.uniform(0, 360, (9, 3))
+    natal = rng.uniform(0, 360, (40, 4))
+    orbs = rng.uniform(1, 8, 40)
+    aspects = list(ASPECT_ANGLES)
+
+    hits = find_aspect_hits(transit, natal, orbs, aspects)
+    expected = _brute_force(transit, natal, orbs, aspects)
+
+    found = {
+        (p, k, q): (orb, aspect)
+        for p, k, q, orb, aspect in zip(hits['profile'], hits['point'], hits['planet'],
+                                        hits['orb'], hits['aspect'])
+    }
+    assert found.keys() == expected.keys()
+    for key, (orb, aspect) in found.items():
+        assert abs(orb - expected[key][0]) < 1e-3
+        assert aspect == expected[key][1]
+
+
+def test_scan_reports_conjunction_with_transit_position():
+    """A natal point placed on the transiting Sun is a zero-orb conjunction"""
+    from core import calculator
+
+    jd = 2461041.5
+    sun = calculator.calc_planetary_positions(jd)['Sun']['longitude']
+
+    result = scan_transit_alerts(
+        jd, jd, ['Sun', 'Moon'], [[sun, None], [(sun + 45) % 360, None]],
+        [1.0, 1.0], ['a', 'b'], planets=['Sun'], aspects=['conjunction']
+    )
+
+    assert result['samples'] == 1
+    assert result['hits']['profile_id'] == ['a']
+    assert result['hits']['aspect_type'] == ['conjunction']
+    assert result['hits']['orb'][0] < 1e-3
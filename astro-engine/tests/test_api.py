@@ -0,0 +1,345 @@
+"""
+API tests using an in-process ASGI client
+
+Exercises the FastAPI routers end to end with the same reference chart
+used in test_calculator.py (18 Feb 1994, 23:07 IST, Raipur).
+"""
+
+import json
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from main import app
+from core.dasha_transitions import moon_at_birth
+from schemas.birth_data import BirthData
+
+
+PRABHAT_BIRTH_JSON = {
+    "name": "Prabhat Tiwari",
+    "birth_date": "1994-02-18",
+    "birth_time": "23:07:00",
+    "latitude": 21.14,
+    "longitude": 81.38,
+    "timezone": "Asia/Kolkata"
+}
+
+
+def test_chart_endpoint():
+    """POST /chart returns the reference chart"""
+    with TestClient(app) as client:
+        response = client.post("/chart", json=PRABHAT_BIRTH_JSON)
+
+    assert response.status_code == 200
+    chart = response.json()
+    assert chart["lagna"]["sign"] == "Libra"
+    moon = next(p for p in chart["planets"] if p["name"] == "Moon")
+    assert moon["nakshatra"] == "Krittika"
+
+
+def test_chart_batch_preserves_order_and_reports_errors():
+    """POST /chart/batch streams one line per profile, in input order"""
+    bad_profile = dict(PRABHAT_BIRTH_JSON, timezone="Not/AZone")
+    second_profile = dict(PRABHAT_BIRTH_JSON, birth_date="2000-01-01")
+    profiles = [PRABHAT_BIRTH_JSON, bad_profile, second_profile]
+
+    with TestClient(app) as client:
+        single = client.post("/chart", json=PRABHAT_BIRTH_JSON).json()
+        response = client.post("/chart/batch", json=profiles)
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [line["index"] for line in lines] == [0, 1, 2]
+    assert [line["status"] for line in lines] == ["ok", "error", "ok"]
+    assert lines[0]["chart"]["planets"] == single["planets"]
+    assert lines[2]["chart"]["birth_info"]["birth_date"] == "2000-01-01"
+
+
+
+def test_chart_batch_serves_cache_and_sheds_load(monkeypatch):
+    """Cached profiles skip the pool; uncached ones get 503 from a full pool; size is capped"""
+    from core.executor import compute_pool
+
+    uncached_profile = dict(PRABHAT_BIRTH_JSON, birth_date="1975-07-07")
+
+    with TestClient(app) as client:
+        single = client.post("/chart", json=PRABHAT_BIRTH_JSON).json()
+        saved = compute_pool.in_flight
+        compute_pool.in_flight = compute_pool.max_workers + compute_pool.max_queue
+        try:
+            cached = client.post("/chart/batch", json=[PRABHAT_BIRTH_JSON, PRABHAT_BIRTH_JSON])
+            shed = client.post("/chart/batch", json=[PRABHAT_BIRTH_JSON, uncached_profile])
+        finally:
+            compute_pool.in_flight = saved
+
+        monkeypatch.setattr('routers.chart.BATCH_MAX_PROFILES', 1)
+        too_many = client.post("/chart/batch", json=[PRABHAT_BIRTH_JSON, PRABHAT_BIRTH_JSON])
+
+    assert cached.status_code == 200
+    lines = [json.loads(line) for line in cached.text.splitlines()]
+    assert [line["status"] for line in lines] == ["ok", "ok"]
+    assert lines[1]["chart"] == single
+
+    assert shed.status_code == 503
+    assert too_many.status_code == 400
+
+
+def test_saturated_pool_returns_503():
+    """A full compute pool sheds load with 503 + Retry-After"""
+    from core.executor import compute_pool
+
+    # A profile no other test has cached, so the request needs the pool
+    uncached_profile = dict(PRABHAT_BIRTH_JSON, birth_date="1980-05-05")
+
+    with TestClient(app) as client:
+        saved = compute_pool.in_flight
+        compute_pool.in_flight = compute_pool.max_workers + compute_pool.max_queue
+        try:
+            response = client.post("/chart", json=uncached_profile)
+            health = client.get("/health")
+        finally:
+            compute_pool.in_flight = saved
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(compute_pool.retry_after)
+    assert health.status_code == 200
+
+
+def test_repeat_chart_is_served_from_cache():
+    """A known profile is answered from the chart cache"""
+    from core.chart_cache import chart_cache
+
+    with TestClient(app) as client:
+        client.post("/chart", json=PRABHAT_BIRTH_JSON)
+        hits_before = client.get("/chart/cache/stats").json()["memory_hits"]
+        client.post("/dasha", json=PRABHAT_BIRTH_JSON)
+        stats = client.get("/chart/cache/stats").json()
+
+    assert stats["memory_hits"] == hits_before + 1
+    assert stats == chart_cache.stats()
+
+
+def test_dasha_tree_endpoint():
+    """POST /dasha/tree expands only the periods inside the window"""
+    request = {
+        "birth_data": PRABHAT_BIRTH_JSON,
+        "depth": 5,
+        "start": "2026-01-01T00:00:00",
+        "end": "2026-03-01T00:00:00"
+    }
+
+    with TestClient(app) as client:
+        response = client.post("/dasha/tree", json=request)
+        whole_life = client.post("/dasha/tree", json=dict(request, start=None, end=None))
+        too_deep = client.post("/dasha/tree", json=dict(request, depth=6))
+        # The same window as aware UTC datetimes (IST is UTC+05:30)
+        aware = client.post("/dasha/tree", json=dict(
+            request, start="2025-12-31T18:30:00+00:00", end="2026-02-28T18:30:00+00:00"
+        ))
+        backwards = client.post("/dasha/tree", json=dict(request, start=request["end"], end=request["start"]))
+
+    assert response.status_code == 200
+    tree = response.json()
+    assert tree["levels"][-1] == "prana" and len(tree["lords"]) == 9
+    start, end = tree["window"]
+
+    expanded = [node for node in tree["periods"] if len(node) == 4]
+    assert len(tree["periods"]) == 10 and len(expanded) == 1
+    node, level = expanded[0], 0
+    while len(node) == 4:
+        children = node[3]
+        assert children[0][1] == node[1] and children[-1][2] == node[2]
+        visible = [child for child in children if child[1] < end and child[2] > start]
+        if level < 3:
+            assert [child for child in children if len(child) == 4] == visible
+        node, level = visible[0], level + 1
+    assert level == 4  # a prana period
+
+    # The whole 5-level tree is larger than DASHA_TREE_MAX_NODES
+    assert aware.status_code == 200 and aware.json() == tree
+    assert whole_life.status_code == 400
+    assert backwards.status_code == 400
+    assert too_deep.status_code == 422
+
+
+def test_dasha_current_endpoint():
+    """POST /dasha/current agrees with the chart's dasha, one date or several"""
+    dates = ["2000-06-01T12:00:00", "2026-03-15T08:30:00", "2040-01-01T00:00:00"]
+
+    with TestClient(app) as client:
+        chart = client.post("/chart", json=PRABHAT_BIRTH_JSON).json()
+        single = client.post("/dasha/current", params={"date": dates[1]}, json=PRABHAT_BIRTH_JSON)
+        several = client.post("/dasha/current", params={"dates": dates}, json=PRABHAT_BIRTH_JSON)
+        before_birth = client.post("/dasha/current", params={"date": "1990-01-01T00:00:00"},
+                                   json=PRABHAT_BIRTH_JSON)
+        # 03:00 UTC is 08:30 on the birth clock (Asia/Kolkata)
+        aware = client.post("/dasha/current", params={"date": "2026-03-15T03:00:00+00:00"},
+                            json=PRABHAT_BIRTH_JSON)
+
+    assert single.status_code == 200
+    results = several.json()["results"]
+    assert [result["date"] for result in results] == dates
+    assert results[1] == single.json()
+    assert aware.json() == single.json()
+
+    mahadashas = chart["dasha_at_birth"]["periods"]
+    for result in results:
+        maha = result["mahadasha"]
+        assert any(p["planet"] == maha["planet"] and p["end_date"] == maha["end_date"] for p in mahadashas)
+        antar, pratyantar = result["antardasha"], result["pratyantardasha"]
+        assert antar["parent_planet"] == maha["planet"]
+        assert pratyantar["parent_planet"] == f"{maha['planet']}-{antar['planet']}"
+        assert maha["start_date"] <= antar["start_date"] <= pratyantar["start_date"] <= result["date"]
+
+    assert before_birth.status_code == 404
+
+
+def test_dasha_systems_endpoint():
+    """POST /dasha/systems returns each system from one Moon; Vimshottari matches /dasha/tree"""
+    request = {
+        "birth_data": PRABHAT_BIRTH_JSON,
+        "systems": ["vimshottari", "yogini", "ashtottari"],
+        "depth": 2,
+        "date": "2026-03-15T08:30:00"
+    }
+
+    with TestClient(app) as client:
+        response = client.post("/dasha/systems", json=request)
+        tree = client.post("/dasha/tree", json={"birth_data": PRABHAT_BIRTH_JSON, "depth": 2})
+        current = client.post("/dasha/current", params={"date": request["date"], "system": "yogini"},
+                              json=PRABHAT_BIRTH_JSON)
+        unknown = client.post("/dasha/systems", json=dict(request, systems=["chara"]))
+
+    assert response.status_code == 200
+    systems = response.json()["systems"]
+    assert list(systems) == request["systems"]
+    assert systems["vimshottari"]["periods"] == tree.json()["periods"]
+    assert systems["yogini"]["rulers"][systems["yogini"]["lords"].index("Sankata")] == "Rahu"
+    assert systems["yogini"]["current"][:2] == [current.json()["mahadasha"], current.json()["antardasha"]]
+    assert len(systems["ashtottari"]["lords"]) == 8
+    assert unknown.status_code == 422
+
+
+def test_dasha_transitions_endpoint():
+    """POST /dasha/transitions gives the same changes for birth data and cached Moons"""
+    birth_jd, moon = moon_at_birth(BirthData(**PRABHAT_BIRTH_JSON))
+    request = {
+        "start": "2020-01-01T00:00:00",
+        "end": "2021-01-01T00:00:00",
+        "profile_ids": ["a", "b"],
+        "profiles": [PRABHAT_BIRTH_JSON, PRABHAT_BIRTH_JSON]
+    }
+
+    with TestClient(app) as client:
+        from_profiles = client.post("/dasha/transitions", json=request)
+        cached = client.post("/dasha/transitions", json=dict(
+            request, profiles=None, birth_jds=[birth_jd, birth_jd], moon_longitudes=[moon, moon]
+        ))
+        mismatched = client.post("/dasha/transitions", json=dict(request, profile_ids=["a"]))
+        too_long = client.post("/dasha/transitions", json=dict(request, end="2030-01-01T00:00:00"))
+
+    assert from_profiles.status_code == 200
+    transitions = from_profiles.json()["transitions"]
+    assert transitions == cached.json()["transitions"]
+    assert transitions["jd"] == sorted(transitions["jd"])
+    # Both profiles change on the same instants
+    assert transitions["profile_id"][:2] == ["a", "b"] and transitions["jd"][0] == transitions["jd"][1]
+    assert set(transitions["level"]) <= {"mahadasha", "antardasha", "pratyantardasha"}
+    assert all(len(lords.split("-")) == 3 for lords in transitions["lords"])
+
+    assert mismatched.status_code == 400
+    assert too_long.status_code == 400
+
+
+def test_transit_events_endpoint():
+    """POST /chart/transits/events returns time-sorted events"""
+    request = {
+        "start": "2026-01-01T00:00:00",
+        "end": "2026-04-01T00:00:00",
+        "natal_points": {"Moon": 35.1},
+        "planets": ["Mars", "Mercury"]
+    }
+
+    with TestClient(app) as client:
+        response = client.post("/chart/transits/events", json=request)
+        too_long = client.post("/chart/transits/events", json=dict(request, end="2040-01-01T00:00:00"))
+
+    assert response.status_code == 200
+    events = response.json()
+    assert {e["type"] for e in events} == {"ingress", "nakshatra", "station", "aspect"}
+    assert [e["jd"] for e in events] == sorted(e["jd"] for e in events)
+    assert too_long.status_code == 400
+
+
+def test_transit_alerts_endpoint():
+    """POST /chart/transits/alerts returns columnar hits only"""
+    request = {
+        "start": "2026-01-01T00:00:00",
+        "end": "2026-01-02T00:00:00",
+        "natal_points": ["Moon", "Lagna"],
+        "profile_ids": ["a", "b", "c"],
+        "longitudes": [[35.1, 190.2], [100.0, None], [280.0, 10.0]],
+        "orbs": [3.0, 3.0, 0.5]
+    }
+
+    with TestClient(app) as client:
+        response = client.post("/chart/transits/alerts", json=request)
+        mismatched = client.post("/chart/transits/alerts", json=dict(request, orbs=[1.0]))
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["profiles"] == 3
+    hits = result["hits"]
+    assert len(set(len(column) for column in hits.values())) == 1
+    assert all(orb <= 3.0 for orb in hits["orb"])
+    assert mismatched.status_code == 400
+
+
+def test_slim_transit_aspects_by_chart_key():
+    """POST /chart/transits/aspects accepts a chart key and returns only the requested sections"""
+    with TestClient(app) as client:
+        chart_response = client.post("/chart", json=PRABHAT_BIRTH_JSON)
+        chart = chart_response.json()
+        key = chart_response.headers["X-Chart-Key"]
+
+        natal = {p["name"]: p["longitude"] for p in chart["planets"]}
+        natal["Lagna"] = chart["lagna"]["longitude"]
+        at = "2026-01-01T00:00:00"
+
+        by_key = client.post("/chart/transits/aspects", json={"chart_key": key, "at": at})
+        by_longitudes = client.post("/chart/transits/aspects", json={
+            "natal_longitudes": natal, "at": at, "include": ["aspects"]
+        })
+        full = client.post("/chart/transits/natal", json=chart)
+        unknown = client.post("/chart/transits/aspects", json={"chart_key": "0" * 64})
+
+    assert by_key.status_code == 200
+    slim = by_key.json()
+    assert set(slim) == {"calculated_at", "julian_day", "aspects", "significant_transits"}
+    assert slim["aspects"] == by_longitudes.json()["aspects"]
+    assert set(by_longitudes.json()) == {"calculated_at", "julian_day", "aspects"}
+    assert len(by_key.content) * 4 < len(full.content)
+    assert unknown.status_code == 404
+
+
+def test_yoga_query_groups_and_counts():
+    """POST /yogas/query filters, groups and counts in one call"""
+    with TestClient(app) as client:
+        chart = client.post("/chart", json=PRABHAT_BIRTH_JSON).json()
+        everything = client.post("/yogas/query", json={"chart": chart}).json()
+        benefic = client.post("/yogas", json=chart).json()
+        strong_benefic = client.post("/yogas/query", json={
+            "chart": chart, "benefic": True, "strengths": ["strong", "exceptional"], "group_by": "strength"
+        }).json()
+
+    assert everything["total"] == everything["matched"] == len(benefic)
+    assert sum(everything["counts"]["type"].values()) == everything["total"]
+    assert {name for name in everything["groups"]} == set(everything["counts"]["type"])
+    assert everything["chart_hash"] == strong_benefic["chart_hash"]
+    assert set(strong_benefic["groups"]) <= {"strong", "exceptional"}
+    assert strong_benefic["counts"]["malefic"] == 0
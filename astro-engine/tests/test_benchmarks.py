@@ -0,0 +1,62 @@
+"""
+Tests for the benchmark suite plumbing (corpus, timing, baseline comparison)
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from benchmarks.run import BENCHMARKS, compare_results, make_corpus, run_benchmarks
+
+
+def test_corpus_is_deterministic():
+    """Same seed, same corpus; different seed, different corpus"""
+    assert make_corpus(20) == make_corpus(20)
+    assert make_corpus(20, seed=1) != make_corpus(20, seed=2)
+    assert len({b.timezone for b in make_corpus(50)}) > 1
+
+
+def test_run_benchmarks_reports_timings():
+    """A small run produces per-benchmark timings plus metadata"""
+    results = run_benchmarks(['calc_lagna', 'get_nakshatra'], corpus_size=3, repeats=2)
+
+    assert results['meta']['corpus_size'] == 3
+    assert set(results['results']) == {'calc_lagna', 'get_nakshatra'}
+    lagna = results['results']['calc_lagna']
+    assert lagna['calls'] == 3
+    assert lagna['repeats'] == 2
+    assert 0 < lagna['min_us'] <= lagna['median_us'] <= lagna['max_us']
+
+    with pytest.raises(ValueError):
+        run_benchmarks(['no_such_benchmark'])
+    assert len({benchmark.name for benchmark in BENCHMARKS}) == len(BENCHMARKS)
+
+
+def test_compare_results_flags_regressions():
+    """Medians beyond the threshold count as regressions or improvements"""
+    baseline = {'results': {
+        'steady': {'median_us': 100.0},
+        'slower': {'median_us': 100.0},
+        'faster': {'median_us': 100.0},
+        'dropped': {'median_us': 100.0},
+    }}
+    current = {'results': {
+        'steady': {'median_us': 110.0},
+        'slower': {'median_us': 130.0},
+        'faster': {'median_us': 50.0},
+        'added': {'median_us': 10.0},
+    }}
+
+    status = {row['name']: row['status'] for row in compare_results(current, baseline, threshold=0.2)}
+
+    assert status == {
+        'steady': 'ok',
+        'slower': 'regression',
+        'faster': 'improved',
+        'added': 'new',
+        'dropped': 'missing',
+    }
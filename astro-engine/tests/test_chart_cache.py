@@ -0,0 +1,106 @@
+"""
+Tests for the content-addressed chart cache
+"""
+
+import asyncio
+import sys
+import os
+from datetime import date, time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import chart_cache as cache_module
+from core.chart_cache import ChartCache, LRUTier, SQLiteTier, chart_cache_key
+from schemas.birth_data import BirthData
+
+
+PRABHAT_BIRTH_DATA = BirthData(
+    name="Prabhat Tiwari",
+    birth_date=date(1994, 2, 18),
+    birth_time=time(23, 7, 0),
+    latitude=21.14,
+    longitude=81.38,
+    timezone="Asia/Kolkata"
+)
+
+
+def test_key_ignores_name_but_not_birth_details():
+    """Key depends on calculation inputs only"""
+    renamed = PRABHAT_BIRTH_DATA.model_copy(update={'name': 'Someone Else'})
+    moved = PRABHAT_BIRTH_DATA.model_copy(update={'latitude': 21.15})
+
+    assert chart_cache_key(renamed) == chart_cache_key(PRABHAT_BIRTH_DATA)
+    assert chart_cache_key(moved) != chart_cache_key(PRABHAT_BIRTH_DATA)
+
+
+def test_key_changes_with_engine_version(monkeypatch):
+    """An engine upgrade invalidates old keys"""
+    before = chart_cache_key(PRABHAT_BIRTH_DATA)
+    monkeypatch.setattr(cache_module, 'ENGINE_VERSION', 'next')
+    assert chart_cache_key(PRABHAT_BIRTH_DATA) != before
+
+
+def test_lru_tier_size_and_ttl():
+    """LRU evicts least recently used entries and expires old ones"""
+    tier = LRUTier(max_size=2, ttl=60)
+    tier.set('a', 1)
+    tier.set('b', 2)
+    tier.get('a')
+    tier.set('c', 3)
+
+    assert tier.get('b') is None
+    assert tier.get('a') == 1
+    assert tier.evictions == 1
+
+    expired = LRUTier(max_size=2, ttl=-1)
+    expired.set('a', 1)
+    assert expired.get('a') is None
+
+
+def test_chart_cache_hits_memory_then_shared_tier(tmp_path):
+    """Second lookup is a memory hit; a fresh process can reuse the shared tier"""
+    shared = SQLiteTier(str(tmp_path / 'charts.sqlite3'), ttl=60)
+    cache = ChartCache(LRUTier(10, 60), shared)
+
+    first = asyncio.run(cache.get_chart(PRABHAT_BIRTH_DATA))
+    renamed = PRABHAT_BIRTH_DATA.model_copy(update={'name': 'Copy'})
+    second = asyncio.run(cache.get_chart(renamed))
+
+    assert cache.misses == 1 and cache.hits == 1
+    assert second.birth_info.name == 'Copy'
+    assert second.planets == first.planets
+
+    other_worker = ChartCache(LRUTier(10, 60), shared)
+    third = asyncio.run(other_worker.get_chart(PRABHAT_BIRTH_DATA))
+    assert other_worker.shared_hits == 1 and other_worker.misses == 0
+    assert third.planets == first.planets
+
+
+def test_cancelled_caller_does_not_cancel_waiters(monkeypatch):
+    """Concurrent requests still get the chart when the one that started it disconnects"""
+    started = []
+
+    async def slow_run(function, birth_data):
+        started.append(birth_data.name)
+        await asyncio.sleep(0.2)
+        return function(birth_data)
+
+    async def scenario():
+        cache = ChartCache(LRUTier(10, 60))
+        monkeypatch.setattr(cache_module.compute_pool, 'run', slow_run)
+
+        first = asyncio.ensure_future(cache.get_chart(PRABHAT_BIRTH_DATA))
+        await asyncio.sleep(0.05)
+        waiter = asyncio.ensure_future(cache.get_chart(PRABHAT_BIRTH_DATA.model_copy(update={'name': 'Waiter'})))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        chart = await waiter
+        assert first.cancelled()
+        return cache, chart
+
+    cache, chart = asyncio.run(scenario())
+    assert chart.birth_info.name == 'Waiter'
+    assert len(started) == 1 and cache.misses == 1 and cache.hits == 1
+    assert not cache._pending
@@ -0,0 +1,96 @@
+"""
+Tests for chart reports: vector kundli diagrams and the chart tables
+"""
+
+import sys
+import os
+from datetime import date, datetime, time, timezone
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+from reportlab.graphics.shapes import Drawing, String
+
+from schemas.birth_data import BirthData
+from core.chart_builder import build_chart
+from core.chart_report import chart_report_flowables
+from core.kundli_drawing import kundli_drawing
+from core.report_theme import get_theme
+from main import app
+
+PRABHAT_BIRTH_DATA = BirthData(
+    name="Prabhat Tiwari",
+    birth_date=date(1994, 2, 18),
+    birth_time=time(23, 7),
+    latitude=21.14,
+    longitude=81.38,
+    timezone="Asia/Kolkata"
+)
+
+
+def _strings(drawing):
+    return [item.text for item in drawing.contents if isinstance(item, String)]
+
+
+def test_kundli_frames_are_shared_per_style():
+    """Charts of one style reuse the same frame; only the text differs"""
+    chart = build_chart(PRABHAT_BIRTH_DATA)
+    first = kundli_drawing(chart, 'north')
+    second = kundli_drawing(chart.model_copy(update={'planets': chart.planets[:1]}), 'north')
+    assert first.contents[0] is second.contents[0]
+    assert kundli_drawing(chart, 'south').contents[0] is not first.contents[0]
+
+    # Libra lagna: house 1 shows sign 7; the south chart marks Libra
+    north = _strings(first)
+    assert north[0] == '7' and 'Ju' in north
+    assert 'Asc' in _strings(kundli_drawing(chart, 'south'))
+    with pytest.raises(ValueError):
+        kundli_drawing(chart, 'east')
+
+
+def test_report_story_has_charts_and_tables():
+    chart = build_chart(PRABHAT_BIRTH_DATA)
+    theme = get_theme('classic')
+    story = chart_report_flowables(chart, theme, 451, 'both', as_of=datetime(1994, 3, 1))
+
+    drawings = [cell for flowable in story if hasattr(flowable, '_cellvalues')
+                for row in flowable._cellvalues for cell in row if isinstance(cell, Drawing)]
+    assert len(drawings) == 2
+
+    texts = [getattr(flowable, 'text', '') for flowable in story]
+    assert 'Ashtakavarga' in texts
+    # The first mahadasha starts at birth, so its antardashas are cut there too
+    first = chart.dasha_at_birth.periods[0]
+    antardashas = story[texts.index(f'Antardashas of the {first.planet} mahadasha') + 1]
+    assert antardashas._cellvalues[1][1].text == first.start_date.strftime('%d %b %Y')
+
+    with pytest.raises(ValueError):
+        chart_report_flowables(chart, theme, 451, 'east')
+
+
+def test_aware_as_of_is_read_on_the_birth_clock():
+    """The Moon mahadasha starts 11 Dec 1995 00:04 IST, i.e. 10 Dec 18:34 UTC"""
+    chart = build_chart(PRABHAT_BIRTH_DATA)
+    theme = get_theme('classic')
+    story = chart_report_flowables(chart, theme, 451, 'north',
+                                   as_of=datetime(1995, 12, 10, 20, 0, tzinfo=timezone.utc))
+
+    texts = [getattr(flowable, 'text', '') for flowable in story]
+    assert 'Antardashas of the Moon mahadasha' in texts
+
+
+def test_chart_report_endpoint():
+    with TestClient(app) as client:
+        response = client.post('/pdf/chart-report', json={
+            'birth_data': PRABHAT_BIRTH_DATA.model_dump(mode='json'),
+            'chart_style': 'south',
+            'content': '## Notes\nSaturn transits the fifth house.'
+        })
+        missing = client.post('/pdf/chart-report', json={'title': 'Nothing'})
+
+    assert response.status_code == 200
+    assert response.content.startswith(b'%PDF')
+    assert 'Birth_Chart_of_Prabhat_Tiwari.pdf' in response.headers['content-disposition']
+    assert missing.status_code == 400
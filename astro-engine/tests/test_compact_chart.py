@@ -0,0 +1,57 @@
+"""
+Tests for the array-backed CompactChart used inside the chart pipeline
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import calculator
+from core.ashtakavarga import calc_ashtakavarga
+from core.chart_builder import birth_julian_day, build_chart
+from core.compact_chart import DIGNITIES, PLANET_NAMES, calc_compact_chart
+from core.nakshatra import get_nakshatra
+from core.yoga_rules import detect_yogas
+from tests.test_yoga_rules import PRABHAT_BIRTH_DATA
+
+
+def _compact(birth_data):
+    _, jd = birth_julian_day(birth_data)
+    return calc_compact_chart(jd, birth_data.latitude, birth_data.longitude)
+
+
+def test_compact_chart_matches_calculator():
+    """Arrays hold the same values the dict-based calculator returns"""
+    _, jd = birth_julian_day(PRABHAT_BIRTH_DATA)
+    compact = _compact(PRABHAT_BIRTH_DATA)
+    positions = calculator.calc_planetary_positions(jd)
+    lagna = calculator.calc_lagna(jd, PRABHAT_BIRTH_DATA.latitude, PRABHAT_BIRTH_DATA.longitude)
+
+    assert compact.lagna == lagna
+    assert list(PLANET_NAMES) == list(positions)
+    for index, name in enumerate(PLANET_NAMES):
+        position = positions[name]
+        longitude = position['longitude']
+        nakshatra = get_nakshatra(longitude)
+
+        assert compact.longitude[index] == longitude
+        assert compact.latitude[index] == position['latitude']
+        assert compact.speed[index] == position['speed']
+        assert bool(compact.retrograde[index]) == position['is_retrograde']
+        assert calculator.SIGNS[compact.sign[index]] == calculator.get_sign_from_longitude(longitude)
+        assert compact.house[index] == calculator.get_planet_house(longitude, lagna)
+        assert compact.nakshatra[index] == nakshatra['number'] - 1
+        assert compact.pada[index] == nakshatra['pada']
+        assert DIGNITIES[compact.dignity[index]] == calculator.get_planet_dignity(name, longitude)
+
+
+def test_pipeline_same_results_on_compact_chart():
+    """Yogas and ashtakavarga agree between CompactChart and ChartData"""
+    compact = _compact(PRABHAT_BIRTH_DATA)
+    chart = build_chart(PRABHAT_BIRTH_DATA)
+
+    assert detect_yogas(compact) == detect_yogas(chart)
+    assert calc_ashtakavarga(compact) == calc_ashtakavarga(chart)
+    assert chart.yogas == detect_yogas(chart)
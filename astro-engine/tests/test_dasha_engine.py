@@ -0,0 +1,143 @@
+"""
+Tests for the array-based Vimshottari dasha engine
+"""
+
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from core.dasha import calc_dasha_balance, get_antardasha, get_current_dasha, get_dasha_sequence
+from core.dasha_engine import (
+    DashaTimeline, current_periods, dasha_timeline, period_transitions, vimshottari_start, vimshottari_timeline
+)
+from core.dasha_systems import ASHTOTTARI, DASHA_SYSTEMS, YOGINI
+from core.nakshatra import DASHA_ORDER
+
+BIRTH = datetime(1994, 2, 18, 23, 7)
+MOON_LONGITUDE = 35.1234  # Krittika: Sun mahadasha at birth
+
+
+def test_mahadashas_match_legacy_sequence():
+    timeline = vimshottari_timeline(MOON_LONGITUDE, BIRTH)
+    sequence = get_dasha_sequence(BIRTH, calc_dasha_balance(MOON_LONGITUDE, BIRTH))
+
+    periods = [timeline.period_dict(0, row) for row in timeline.rows(0)]
+    assert [(p['planet'], p['start_date'], p['end_date']) for p in periods] == \
+        [(p['planet'], p['start_date'], p['end_date']) for p in sequence]
+
+    # Whole mahadashas split exactly like get_antardasha
+    second = periods[1]
+    legacy = get_antardasha(second['planet'], datetime.fromisoformat(second['start_date']), None)
+    row = timeline.rows(0)[1]
+    assert [timeline.period_dict(1, child)['end_date'] for child in range(9 * row, 9 * row + 9)] == \
+        [antar['end_date'] for antar in legacy]
+
+
+def test_first_mahadasha_is_cut_at_birth():
+    """Sub-periods of the balance mahadasha keep their place in the full period"""
+    timeline = vimshottari_timeline(MOON_LONGITUDE, BIRTH, depth=3)
+    first = timeline.rows(1, *timeline.span(0, 0))
+
+    assert first.start > 0  # earlier antardashas ended before birth
+    assert timeline.span(1, first.start)[0] == 0.0
+    assert timeline.span(1, first[-1])[1] == timeline.span(0, 0)[1]
+    # Levels tile the timeline without gaps
+    for level in timeline.levels:
+        assert level.starts[-1] == timeline.end
+        assert all(a < b for a, b in zip(level.starts, level.starts[1:]))
+
+    with pytest.raises(ValueError):
+        DashaTimeline(BIRTH, 0, 0.5, depth=6)
+
+
+def test_active_periods_match_legacy_lookup():
+    timeline = vimshottari_timeline(MOON_LONGITUDE, BIRTH)
+    sequence = get_dasha_sequence(BIRTH, calc_dasha_balance(MOON_LONGITUDE, BIRTH))
+
+    # Skip the first mahadasha, where the legacy lookup starts antardashas at birth
+    start = timeline.span(0, 1)[0]
+    moments = [start + 0.5 + step * 97.3 for step in range(400)]
+    rows = timeline.active_rows(moments + [-1.0, timeline.end])
+    for moment, vector_rows in zip(moments, rows):
+        active = timeline.active(moment)
+        assert tuple(vector_rows) == active
+
+        current = get_current_dasha(sequence, BIRTH + timedelta(days=moment))
+        names = [timeline.period_dict(level, row)['planet'] for level, row in enumerate(active)]
+        assert names == [current[level]['planet'] for level in ('mahadasha', 'antardasha', 'pratyantardasha')]
+
+    assert rows[-2].tolist() == rows[-1].tolist() == [-1, -1, -1]
+    assert timeline.active(-1.0) is None and timeline.active(timeline.end) is None
+
+
+def test_single_lookup_matches_timeline():
+    """current_periods() finds the same periods without building a timeline"""
+    timeline = vimshottari_timeline(MOON_LONGITUDE, BIRTH)
+    for step in range(300):
+        moment = 0.25 + step * 146.1
+        expected = [timeline.period_dict(level, row) for level, row in enumerate(timeline.active(moment))]
+        assert current_periods(MOON_LONGITUDE, BIRTH, BIRTH + timedelta(days=moment)) == expected
+
+    assert current_periods(MOON_LONGITUDE, BIRTH, BIRTH - timedelta(days=1)) is None
+    assert current_periods(MOON_LONGITUDE, BIRTH, timeline.to_datetime(timeline.end)) is None
+
+
+def test_tree_expands_like_the_arrays():
+    """Lazily expanded tree periods equal the eagerly generated levels"""
+    eager = vimshottari_timeline(MOON_LONGITUDE, BIRTH, depth=3)
+    tree = vimshottari_timeline(MOON_LONGITUDE, BIRTH, depth=1).tree(3, digits=9)
+
+    leaves = [leaf for maha in tree for antar in maha[3] for leaf in antar[3]]
+    rows = eager.rows(2)
+    assert [(leaf[0], leaf[1], leaf[2]) for leaf in leaves] == \
+        [(eager.levels[2].lords[row], *(round(t, 9) for t in eager.span(2, row))) for row in rows]
+
+    with pytest.raises(ValueError):
+        eager.tree(5, max_nodes=1000)
+
+
+def test_transitions_are_the_timeline_boundaries():
+    """Each period start in the window is reported once, at its highest level"""
+    timeline = vimshottari_timeline(MOON_LONGITUDE, BIRTH, depth=3)
+    start, end = timeline.span(0, 1)[0] - 400.0, timeline.span(0, 1)[0] + 900.0
+
+    expected = {}
+    for level in (2, 1, 0):
+        for row in timeline.rows(level, start, end):
+            low = timeline.span(level, row)[0]
+            if start <= low < end and low > 0:
+                expected[low] = (level, timeline.lord_path(level, row))
+    transitions = list(period_transitions(*vimshottari_start(MOON_LONGITUDE), start, end))
+
+    assert [t for t, _, _ in transitions] == sorted(expected)
+    for t, level, lords in transitions:
+        assert expected[t][0] == level
+        # A new mahadasha or antardasha also names its first sub-periods
+        assert [DASHA_ORDER[lord] for lord in lords[:level + 1]] == expected[t][1]
+        assert len(lords) == 3
+
+
+def test_other_systems_follow_their_tables():
+    """Yogini and Ashtottari start from the Moon's nakshatra (group) and tile like Vimshottari"""
+    assert YOGINI.cycle_years == 36 and ASHTOTTARI.cycle_years == 108
+    assert YOGINI.start(0.0) == (YOGINI.lords.index('Bhramari'), 0.0)
+    # Ashtottari's Rahu group runs from Uttara Bhadrapada to Bharani: Ashwini starts halfway
+    assert ASHTOTTARI.start(0.0) == (ASHTOTTARI.lords.index('Rahu'), 0.5)
+    assert ASHTOTTARI.start(5 * 40 / 3) == (ASHTOTTARI.lords.index('Sun'), 0.0)
+
+    for system in DASHA_SYSTEMS.values():
+        timeline = dasha_timeline(MOON_LONGITUDE, BIRTH, depth=3, system=system)
+        assert timeline.end >= 120 * 365.25
+        for level in timeline.levels:
+            assert level.starts[-1] == timeline.end
+            assert all(a < b for a, b in zip(level.starts, level.starts[1:]))
+
+        moment = 9000.5
+        expected = [timeline.period_dict(level, row) for level, row in enumerate(timeline.active(moment))]
+        assert current_periods(MOON_LONGITUDE, BIRTH, BIRTH + timedelta(days=moment), system=system) == expected
+        assert expected[1]['parent_planet'] == expected[0]['planet']
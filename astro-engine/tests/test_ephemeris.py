@@ -0,0 +1,115 @@
+"""
+Tests for the vectorized ephemeris series
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import calculator, ephemeris_table
+
+
+START_JD = 2449402.23  # 18 Feb 1994, reference chart
+
+
+def test_series_matches_single_instant_positions():
+    """Every column equals calc_planetary_positions at that instant"""
+    series = calculator.calc_ephemeris_series(START_JD, START_JD + 30, 3.0)
+
+    assert series['planets'] == list(calculator.PLANETS)
+    assert series['jd'].shape == (11,)
+    assert series['longitude'].shape == (9, 11)
+    assert series['longitude'][0].flags['C_CONTIGUOUS']
+
+    for column in (0, 5, 10):
+        positions = calculator.calc_planetary_positions(series['jd'][column])
+        for row, planet_name in enumerate(series['planets']):
+            expected = positions[planet_name]
+            assert series['longitude'][row, column] == expected['longitude']
+            assert series['latitude'][row, column] == expected['latitude']
+            assert series['speed'][row, column] == expected['speed']
+            assert series['is_retrograde'][row, column] == expected['is_retrograde']
+
+
+def test_ketu_opposes_rahu():
+    """Ketu is derived from Rahu for the whole series"""
+    series = calculator.calc_ephemeris_series(START_JD, START_JD + 365, 1.0)
+    rahu = series['planets'].index('Rahu')
+    ketu = series['planets'].index('Ketu')
+
+    separation = (series['longitude'][ketu] - series['longitude'][rahu]) % 360.0
+    assert np.allclose(separation, 180.0)
+    assert series['is_retrograde'][ketu].all()
+
+
+def test_table_interpolation_matches_swiss_ephemeris(tmp_path):
+    """Hermite lookups between daily nodes stay well inside 1 arcminute"""
+    from core.ephemeris_table import EphemerisTable, build_table
+
+    path = str(tmp_path / 'table.npy')
+    build_table(path, START_JD - 10, START_JD + 40, step=1.0)
+    table = EphemerisTable.load(path)
+
+    jds = START_JD + np.array([0.0, 0.37, 5.5, 12.91, 29.99])
+    interpolated = table.interpolate(jds)
+
+    for column, jd in enumerate(jds):
+        exact = calculator.calc_planetary_positions(jd)
+        point = table.positions_at(jd)
+        for row, planet_name in enumerate(interpolated['planets']):
+            error = abs((interpolated['longitude'][row, column]
+                         - exact[planet_name]['longitude'] + 180.0) % 360.0 - 180.0)
+            assert error < 0.001, f"{planet_name} off by {error}°"
+            assert point[planet_name]['longitude'] == pytest.approx(
+                interpolated['longitude'][row, column], abs=1e-9)
+            assert point[planet_name]['is_retrograde'] == exact[planet_name]['is_retrograde']
+
+    assert not table.covers(START_JD + 100)
+
+
+def test_unreadable_table_is_logged_not_printed(tmp_path, monkeypatch, caplog, capsys):
+    """A broken table file falls back to Swiss Ephemeris with a warning"""
+    broken = tmp_path / 'sidereal_table.npy'
+    broken.write_bytes(b'not a table')
+    monkeypatch.setattr(ephemeris_table, 'DEFAULT_TABLE_PATH', str(broken))
+    monkeypatch.setattr(ephemeris_table, '_table', None)
+    monkeypatch.setattr(ephemeris_table, '_load_attempted', False)
+
+    with caplog.at_level('WARNING', logger='core.ephemeris_table'):
+        assert ephemeris_table.get_table() is None
+    assert 'Ephemeris table not loaded' in caplog.text
+    assert capsys.readouterr().out == ''
+
+
+def test_endpoint_formats_agree_and_json_is_capped():
+    """Both formats carry the same samples; large JSON requests are sent to binary"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    query = {'start': '1994-02-18T00:00:00', 'end': '1994-03-20T00:00:00', 'step_days': 3, 'exact': True}
+    with TestClient(app) as client:
+        as_json = client.get('/ephemeris', params=query)
+        as_binary = client.get('/ephemeris', params={**query, 'format': 'binary'})
+        too_long = client.get('/ephemeris', params={**query, 'end': '2030-01-01T00:00:00', 'step_days': 1})
+        long_binary = client.get('/ephemeris', params={**query, 'end': '2030-01-01T00:00:00', 'step_days': 1,
+                                                       'format': 'binary'})
+
+    assert as_json.status_code == 200
+    data = as_json.json()
+    assert data['source'] == 'swisseph' and len(data['jd']) == 11
+
+    assert as_binary.headers['x-ephemeris-samples'] == '11'
+    count, planets = 11, len(data['planets'])
+    jd = np.frombuffer(as_binary.content[:8 * count], dtype='<f8')
+    longitude = np.frombuffer(as_binary.content[8 * count:8 * count * (1 + planets)], dtype='<f8')
+    assert jd.tolist() == data['jd']
+    assert longitude.reshape(planets, count).tolist() == data['longitude']
+
+    assert too_long.status_code == 400
+    assert 'format=binary' in too_long.json()['detail']
+    assert long_binary.status_code == 200
@@ -0,0 +1,76 @@
+"""
+Tests for the Markdown to flowables renderer used by PDF reports
+"""
+
+import sys
+import os
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.platypus import HRFlowable, ListFlowable, Paragraph, Preformatted, Table
+
+from core.markdown_pdf import inline_markup, markdown_to_flowables
+from core.report_theme import get_theme
+from routers.pdf import ReportRequest, create_pdf_report
+
+DOCUMENT = """# Forecast
+
+Jupiter is **strong** and *well placed*;
+snake_case_names & <tags> stay literal.
+
+- Sun
+  - exalted
+1. First
+
+| Planet | Degree |
+|:--|--:|
+| Moon | 3.4 |
+
+> Patience.
+
+```
+x < y
+```
+
+---
+"""
+
+
+def test_inline_markup_is_escaped_and_balanced():
+    assert inline_markup('**bold** and *it* and ***both***') == \
+        '<b>bold</b> and <i>it</i> and <b><i>both</i></b>'
+    assert inline_markup('`a<b` & <c> snake_case_x') == \
+        '<font face="Courier">a&lt;b</font> &amp; &lt;c&gt; snake_case_x'
+    # Unclosed delimiters stay literal, the closed pair still renders
+    assert inline_markup('**open *ok*') == '**open <i>ok</i>'
+    assert inline_markup('5 * 3 * 2') == '5 * 3 * 2'
+    assert inline_markup('[docs](https://x.io/?a=1&b=2)') == \
+        '<link href="https://x.io/?a=1&amp;b=2"><u>docs</u></link>'
+    assert inline_markup('[click](javascript:alert(1))') == '[click](javascript:alert(1))'
+
+
+def test_blocks_become_flowables():
+    story = markdown_to_flowables(DOCUMENT, get_theme('classic'), 451)
+    kinds = [type(flowable) for flowable in story]
+
+    assert kinds == [Paragraph, Paragraph, ListFlowable, ListFlowable, Table, Paragraph,
+                     Preformatted, HRFlowable]
+    assert story[0].style.name == 'classic-SectionTitle'
+    assert story[1].text.startswith('Jupiter is <b>strong</b> and <i>well placed</i>; snake_case')
+    assert [cell.style.name for cell in story[4]._cellvalues[1]] == \
+        ['classic-TableCell', 'classic-TableCell-right']
+    assert story[5].style.name == 'classic-Quote'
+    assert story[6].lines == ['x < y']
+
+
+def test_malformed_input_renders_in_linear_time():
+    """Inputs that make naive parsers quadratic (or raise) render quickly"""
+    content = '*a _b **c ~~d `e [f ' * 20000
+    started = time.perf_counter()
+    inline_markup(content)
+    assert time.perf_counter() - started < 2.0
+
+    pdf = create_pdf_report(ReportRequest(title='A & <B>', content='**x* __y_ `z\n\n' * 50 + content[:5000]))
+    assert pdf.getvalue().startswith(b'%PDF')
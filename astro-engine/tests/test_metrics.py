@@ -0,0 +1,72 @@
+"""
+Tests for stage spans, counters and the /metrics endpoint
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from core import metrics
+from core.chart_builder import build_chart
+from main import app
+from tests.test_api import PRABHAT_BIRTH_JSON
+from tests.test_yoga_rules import PRABHAT_BIRTH_DATA
+
+
+def test_spans_and_counts_need_a_collector():
+    """Outside a request nothing is recorded; a pool job returns its spans"""
+    with metrics.span('idle'):
+        metrics.count('swisseph_calls')
+
+    chart, spans, counts = metrics.traced_call(build_chart, 0.0, PRABHAT_BIRTH_DATA)
+
+    stages = [stage for stage, _ in spans]
+    assert chart.lagna.sign == 'Libra'
+    assert stages[0] == 'queue'
+    assert stages[-1] == 'build_chart'
+    assert {'ephemeris', 'lagna', 'yogas', 'ashtakavarga', 'dasha', 'models'} <= set(stages)
+    assert all(seconds >= 0.0 for _, seconds in spans)
+    # 8 planets, houses and ayanamsha
+    assert counts == {'swisseph_calls': 10}
+
+
+def test_histogram_renders_cumulative_buckets():
+    """Prometheus buckets are cumulative and end with +Inf = count"""
+    histogram = metrics.Histogram('test_seconds', 'Test', ('stage',), (0.1, 1.0))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(('a"b',), value)
+
+    lines = list(histogram.render())
+
+    assert 'test_seconds_bucket{stage="a\\"b",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="a\\"b",le="1.0"} 2' in lines
+    assert 'test_seconds_bucket{stage="a\\"b",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="a\\"b"} 3' in lines
+
+
+def test_metrics_endpoint_and_server_timing(monkeypatch):
+    """Chart requests show up in /metrics and, when enabled, in Server-Timing"""
+    monkeypatch.setattr(metrics, 'SERVER_TIMING', True)
+    payload = dict(PRABHAT_BIRTH_JSON, name="Metrics test", birth_time="05:41:00")
+
+    with TestClient(app) as client:
+        response = client.post("/chart", json=payload)
+        scrape = client.get("/metrics")
+
+    assert response.status_code == 200
+    timing = response.headers["Server-Timing"]
+    assert "build_chart;dur=" in timing
+    assert "serialize;dur=" in timing
+
+    assert scrape.status_code == 200
+    assert scrape.headers["content-type"].startswith("text/plain")
+    text = scrape.text
+    assert 'astro_request_duration_seconds_count{method="POST",route="/chart",status="200"}' in text
+    assert 'astro_stage_duration_seconds_count{stage="yogas"}' in text
+    assert 'astro_swisseph_calls_total' in text
+    assert 'astro_pool_queue_depth{pool="compute"} 0' in text
+    assert 'astro_chart_cache_misses_total' in text
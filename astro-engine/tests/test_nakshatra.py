@@ -0,0 +1,54 @@
+"""
+Tests for the arithmetic nakshatra, pada and sign lookups
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from core import calculator
+from core.nakshatra import (
+    NAKSHATRA_NAMES, NAKSHATRA_SPAN, get_nakshatra, nakshatra_at, nakshatra_indices,
+    pada_index, pada_indices, sign_at, sign_indices
+)
+
+
+def test_boundaries_use_exact_span():
+    """Boundaries sit at multiples of 40/3°, not 13.333333°"""
+    # 13.3333333 was Bharani with the six-decimal table; it is still Ashwini
+    assert nakshatra_at(13.3333333).name == 'Ashwini'
+    assert nakshatra_at(NAKSHATRA_SPAN).name == 'Bharani'
+    assert nakshatra_at(40.0) == ('Rohini', 4, 'Moon', 1, 40.0, 40.0 + NAKSHATRA_SPAN)
+    assert nakshatra_at(359.99999999999994).pada == 4
+    assert nakshatra_at(-0.5).name == 'Revati'
+    assert pada_index(120.0) == 36
+    assert sign_at(29.999999999999996).name == 'Aries'
+    assert sign_at(30.0) == (1, 'Taurus', 'Venus')
+
+
+def test_records_are_shared_and_dicts_compatible():
+    assert nakshatra_at(41.0) is nakshatra_at(42.0)
+    info = get_nakshatra(41.0)
+    assert info == nakshatra_at(41.0)._asdict()
+    # Callers may modify the dict they get without affecting later lookups
+    info['name'] = 'changed'
+    assert get_nakshatra(41.0)['name'] == 'Rohini'
+
+
+def test_vectorized_lookups_match_scalar():
+    longitudes = np.concatenate([
+        np.random.default_rng(27).uniform(-360.0, 720.0, 20000),
+        np.arange(0.0, 360.0, 10.0 / 3.0),
+        [0.0, 40.0, 359.99999999999994],
+    ])
+    padas = pada_indices(longitudes)
+    assert padas.dtype == np.uint8
+    assert padas.tolist() == [pada_index(value) for value in longitudes]
+    assert [NAKSHATRA_NAMES[i] for i in nakshatra_indices(longitudes)] == \
+        [nakshatra_at(value).name for value in longitudes]
+    assert [calculator.SIGNS[i] for i in sign_indices(longitudes.reshape(-1, 1)).ravel()] == \
+        [sign_at(value).name for value in longitudes]
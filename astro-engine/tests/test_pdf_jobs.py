@@ -0,0 +1,155 @@
+"""
+Tests for the queued PDF job API
+"""
+
+import asyncio
+import sys
+import os
+import time
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from core.executor import ComputePool, PoolSaturatedError, pdf_job_pool
+from core.pdf_jobs import DONE, FAILED, PdfJobStore, pdf_jobs, private_directory
+from main import app
+
+REPORT_JSON = {
+    'title': 'Saturn Return',
+    'content': '## Overview\nSaturn returns to its natal sign this year.\n- Discipline\n- Delays'
+}
+
+
+def _wait_for(client, job_id, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        status = client.get(f'/pdf/jobs/{job_id}').json()
+        if status['status'] != 'pending' or time.monotonic() > deadline:
+            return status
+        time.sleep(0.1)
+
+
+def test_job_renders_downloads_and_dedupes(tmp_path, monkeypatch):
+    """A job finishes on disk; the same request again returns the same job"""
+    monkeypatch.setattr(pdf_jobs, 'directory', str(tmp_path))
+
+    with TestClient(app) as client:
+        response = client.post('/pdf/jobs', json=REPORT_JSON)
+        assert response.status_code == 202
+        job_id = response.json()['id']
+        assert response.headers['location'] == f'/pdf/jobs/{job_id}'
+
+        status = _wait_for(client, job_id)
+        assert status['status'] == DONE, status
+        assert status['download_url'] == f'/pdf/jobs/{job_id}/download'
+
+        submitted = pdf_jobs.submitted
+        again = client.post('/pdf/jobs', json=REPORT_JSON)
+        assert again.json()['id'] == job_id
+        assert again.json()['status'] == DONE
+        assert pdf_jobs.submitted == submitted
+
+        download = client.get(f'/pdf/jobs/{job_id}/download')
+
+    assert download.status_code == 200
+    assert download.content.startswith(b'%PDF')
+    assert int(download.headers['content-length']) == status['size'] == len(download.content)
+    assert download.headers['content-disposition'] == 'attachment; filename="Saturn_Return.pdf"'
+    assert os.listdir(tmp_path) == [f'{job_id}.pdf']
+
+
+def test_unknown_and_malformed_ids_are_404():
+    with TestClient(app) as client:
+        assert client.get('/pdf/jobs/' + '0' * 64).status_code == 404
+        assert client.get('/pdf/jobs/..%2F..%2Fetc%2Fpasswd/download').status_code == 404
+
+
+def test_expired_files_are_swept(tmp_path):
+    """Files past the TTL are neither served nor kept"""
+    store = PdfJobStore(str(tmp_path), ttl=60.0, pool=pdf_job_pool)
+    job_id = 'a' * 64
+    path = tmp_path / f'{job_id}.pdf'
+    path.write_bytes(b'%PDF-1.4')
+
+    assert store.get(job_id).status == DONE
+
+    partial = tmp_path / f'{job_id}.pdf.k3j_x9.tmp'
+    unrelated = tmp_path / 'notes.txt'
+    partial.write_bytes(b'%PDF')
+    unrelated.write_text('not ours')
+
+    old = time.time() - 120
+    for stale in (path, partial, unrelated):
+        os.utime(stale, (old, old))
+    assert store.get(job_id) is None
+    assert store.sweep(force=True) == 2
+    assert not path.exists() and not partial.exists()
+    # Files the store did not write are left alone
+    assert unrelated.exists()
+
+
+def test_job_directory_is_private(tmp_path):
+    """Job files live in a 0700 directory; shared or foreign directories are refused"""
+    default = PdfJobStore(None, ttl=60.0, pool=pdf_job_pool).directory
+    assert os.stat(default).st_mode & 0o077 == 0
+
+    configured = private_directory(str(tmp_path / 'jobs'))
+    assert os.stat(configured).st_mode & 0o077 == 0
+
+    shared = tmp_path / 'shared'
+    shared.mkdir()
+    shared.chmod(0o777)
+    with pytest.raises(PermissionError):
+        private_directory(str(shared))
+
+    link = tmp_path / 'link'
+    link.symlink_to(configured)
+    with pytest.raises(PermissionError):
+        private_directory(str(link))
+
+
+def _slow_write(out):
+    time.sleep(0.2)
+    out.write(b'%PDF-1.4')
+
+
+def test_burst_is_rejected_at_submit(tmp_path):
+    """Submits beyond the pool's capacity raise at once instead of failing later"""
+    pool = ComputePool('test_jobs', max_workers=1, max_queue=1, kind='thread')
+    store = PdfJobStore(str(tmp_path), ttl=60.0, pool=pool)
+
+    async def burst():
+        jobs = [store.submit('a' * 64, 'a.pdf', _slow_write), store.submit('b' * 64, 'b.pdf', _slow_write)]
+        with pytest.raises(PoolSaturatedError):
+            store.submit('c' * 64, 'c.pdf', _slow_write)
+        await asyncio.gather(*(job.task for job in jobs))
+        return jobs
+
+    try:
+        jobs = asyncio.run(burst())
+    finally:
+        pool.shutdown()
+    assert [job.status for job in jobs] == [DONE, DONE]
+    assert pool.in_flight == 0
+
+
+def test_cancelled_before_start_releases_slot(tmp_path):
+    pool = ComputePool('test_jobs', max_workers=1, max_queue=0, kind='thread')
+    store = PdfJobStore(str(tmp_path), ttl=60.0, pool=pool)
+
+    async def cancel_unstarted():
+        job = store.submit('a' * 64, 'a.pdf', _slow_write)
+        job.task.cancel()
+        await asyncio.sleep(0)
+        return job
+
+    try:
+        job = asyncio.run(cancel_unstarted())
+    finally:
+        pool.shutdown()
+    assert job.status == FAILED
+    assert pool.in_flight == 0
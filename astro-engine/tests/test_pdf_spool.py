@@ -0,0 +1,95 @@
+"""
+Tests for spooling rendered PDFs to disk and streaming them back
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from core.executor import ComputePool
+from core.pdf_spool import PdfSpool, run_spooled
+from main import app
+from routers.pdf import ReportRequest, spooled_pdf_response, write_pdf_report
+
+REPORT = ReportRequest(
+    title='Annual Forecast',
+    content='## Career\n' + 'Jupiter transits the tenth house this year.\n' * 40
+)
+
+
+def test_spool_moves_to_disk_past_threshold():
+    """Small output stays in memory, larger output ends up in a temp file"""
+    small = PdfSpool(threshold=1024)
+    small.write(b'x' * 1000)
+    assert small.close() == (1000, b'x' * 1000, None)
+
+    large = PdfSpool(threshold=1024)
+    large.write(b'a' * 1000)
+    large.write(b'b' * 1000)
+    pdf = large.close()
+    assert pdf.data is None and pdf.size == 2000
+    with open(pdf.path, 'rb') as f:
+        assert f.read() == b'a' * 1000 + b'b' * 1000
+    os.remove(pdf.path)
+
+
+def test_spooled_report_is_streamed_and_removed():
+    """A report spooled to disk streams back whole and leaves no temp file"""
+    spool = PdfSpool(threshold=1024)
+    write_pdf_report(REPORT, spool)
+    pdf = spool.close()
+    assert pdf.path is not None
+
+    response = spooled_pdf_response(pdf, {'Content-Disposition': 'inline; filename="a.pdf"'})
+    assert not os.path.exists(pdf.path)
+
+    async def read_body():
+        return [chunk async for chunk in response.body_iterator]
+
+    body = b''.join(asyncio.run(read_body()))
+    assert len(body) == pdf.size == int(response.headers['content-length'])
+    assert body.startswith(b'%PDF') and body.rstrip().endswith(b'%%EOF')
+
+
+def test_report_endpoint_returns_pdf():
+    with TestClient(app) as client:
+        response = client.post('/pdf/report', json=REPORT.model_dump())
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/pdf'
+    assert response.headers['content-disposition'] == 'attachment; filename="Annual_Forecast.pdf"'
+    assert int(response.headers['content-length']) == len(response.content)
+    assert response.content.startswith(b'%PDF')
+
+
+def _slow_spooled_render(directory):
+    time.sleep(0.3)
+    spool = PdfSpool(threshold=0, directory=directory)
+    spool.write(b'%PDF-1.4')
+    return spool.close()
+
+
+def test_cancelled_request_removes_spooled_file(tmp_path):
+    """A render that finishes after its request was cancelled leaves no temp file"""
+    pool = ComputePool('test_pdf', max_workers=1, max_queue=0, kind='thread')
+
+    async def cancel_while_rendering():
+        request = asyncio.ensure_future(run_spooled(pool, _slow_spooled_render, str(tmp_path)))
+        await asyncio.sleep(0.1)
+        request.cancel()
+        await asyncio.sleep(0.5)
+        return request
+
+    try:
+        request = asyncio.run(cancel_while_rendering())
+    finally:
+        pool.shutdown()
+    assert request.cancelled()
+    assert os.listdir(tmp_path) == []
+    assert pool.in_flight == 0
@@ -0,0 +1,109 @@
+"""
+Tests for the on-demand sampling profiler
+"""
+
+import sys
+import os
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core import calculator, profiler
+from main import app
+from routers import admin
+
+
+def _spin(seconds):
+    """Burn CPU for a while"""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        sum(range(1000))
+
+
+def test_sample_stacks_sees_busy_threads_only():
+    """A busy thread shows up with its frames; a waiting thread is idle"""
+    event = threading.Event()
+    busy = threading.Thread(target=_spin, args=(0.5,), name='busy')
+    waiting = threading.Thread(target=event.wait, name='waiting')
+    busy.start()
+    waiting.start()
+    try:
+        stacks = profiler.sample_stacks(0.2, interval=0.002, root='test')
+    finally:
+        event.set()
+        busy.join()
+        waiting.join()
+
+    assert stacks
+    assert all(stack.startswith('test;') for stack in stacks)
+    assert any(stack.startswith('test;busy;') and '_spin (tests/test_profiler.py:' in stack for stack in stacks)
+    assert not any(';waiting;' in stack for stack in stacks)
+
+    text = profiler.render_collapsed(stacks)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in text.splitlines())
+
+
+def test_profile_with_sampler_includes_pool_workers():
+    """Workers that installed the hook send back their own stacks"""
+    executor = ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=profiler.install_worker_hook,
+        initargs=(profiler.request_path(),),
+    )
+    try:
+        executor.submit(calculator.ensure_swe_configured).result()
+        job = executor.submit(calculator.calc_ephemeris_series, 2451545.0, 2452545.0, 0.25)
+        collapsed = profiler.profile_with_sampler(0.3, interval=0.002)
+        job.result()
+    finally:
+        executor.shutdown()
+
+    worker_stacks = [line for line in collapsed.splitlines() if line.startswith('SpawnProcess')]
+    assert any('calc_ephemeris_series (core/calculator.py:' in line for line in worker_stacks)
+
+
+def test_request_file_is_in_a_private_directory():
+    """Workers read profile requests from a 0700 mkdtemp directory, not a guessable /tmp name"""
+    directory = os.path.dirname(profiler.request_path())
+    assert profiler.request_path() == profiler.request_path()
+    assert os.stat(directory).st_mode & 0o077 == 0
+
+
+def test_profile_endpoint_requires_configured_token(monkeypatch):
+    """With PROFILER_TOKEN set, only requests carrying it get a profile"""
+    admin_app = FastAPI()
+    admin_app.include_router(admin.router)
+    params = {"seconds": 0.2, "mode": "sampler"}
+
+    with TestClient(admin_app) as client:
+        # Mounted without a token configured: still closed
+        unconfigured = client.post("/admin/profile", params=params, headers={"X-Admin-Token": ""})
+        monkeypatch.setattr('routers.admin.PROFILER_TOKEN', 'let-me-in')
+        denied = client.post("/admin/profile", params=params)
+        allowed = client.post("/admin/profile", params=params, headers={"X-Admin-Token": "let-me-in"})
+        too_long = client.post("/admin/profile", params={"seconds": 3600},
+                               headers={"X-Admin-Token": "let-me-in"})
+
+    assert unconfigured.status_code == 403
+    assert denied.status_code == 403
+    assert allowed.status_code == 200
+    assert allowed.headers["X-Profile-Mode"] == "sampler"
+    assert allowed.headers["content-type"].startswith("text/plain")
+    assert 'attachment; filename="profile-' in allowed.headers["content-disposition"]
+    assert too_long.status_code == 422
+
+
+def test_profile_endpoint_not_mounted_without_token():
+    """The API only serves /admin/profile when PROFILER_TOKEN is set"""
+    assert profiler.PROFILER_ENABLED == bool(os.getenv("PROFILER_TOKEN"))
+    if not profiler.PROFILER_ENABLED:
+        with TestClient(app) as client:
+            assert client.post("/admin/profile", params={"seconds": 0.2}).status_code == 404
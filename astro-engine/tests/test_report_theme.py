@@ -0,0 +1,43 @@
+"""
+Tests for the shared PDF report themes
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+from core.report_theme import ReportTheme, get_theme, register_theme, theme_names
+from main import app
+from routers.pdf import ReportRequest, create_pdf_report
+
+
+def test_themes_are_shared_and_named():
+    """Every lookup returns the same prebuilt styles; unknown names raise"""
+    assert {'classic', 'print'} <= set(theme_names())
+    assert get_theme('classic').styles['Body'] is get_theme('classic').styles['Body']
+    assert get_theme().name == 'classic'
+    with pytest.raises(ValueError):
+        get_theme('neon')
+
+
+def test_custom_theme_renders():
+    """A registered branding theme is usable by name"""
+    register_theme(ReportTheme('test-brand', primary='#003366', accent='#ff6600', text='#222222',
+                               footer='Test Brand'))
+    pdf = create_pdf_report(ReportRequest(title='Brand', content='## Heading\n- item', theme='test-brand'))
+    assert pdf.getvalue().startswith(b'%PDF')
+
+
+def test_unknown_theme_is_400():
+    with TestClient(app) as client:
+        themes = client.get('/pdf/themes').json()
+        response = client.post('/pdf/report', json={'title': 'T', 'content': 'x', 'theme': 'neon'})
+
+    assert 'print' in themes['themes'] and themes['default'] == 'classic'
+    assert response.status_code == 400
+    assert 'neon' in response.json()['detail']
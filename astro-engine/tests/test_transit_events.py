@@ -0,0 +1,84 @@
+"""
+Tests for the transit event search
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import calculator
+from core.transit_events import find_transit_events
+
+
+START_JD = 2461041.5  # 1 Jan 2026 00:00 UT
+
+
+def _longitude(planet_name, jd):
+    return calculator.calc_planetary_positions(jd)[planet_name]['longitude']
+
+
+def test_ingresses_match_sign_changes():
+    """Every refined ingress sits on a sign boundary, in the reported signs"""
+    events = find_transit_events(START_JD, START_JD + 120, event_types=['ingress'])
+
+    assert events
+    assert [e['jd'] for e in events] == sorted(e['jd'] for e in events)
+    for event in events:
+        before = _longitude(event['planet'], event['jd'] - 1e-3)
+        after = _longitude(event['planet'], event['jd'] + 1e-3)
+        assert calculator.get_sign_from_longitude(before) == event['from_sign']
+        assert calculator.get_sign_from_longitude(after) == event['to_sign']
+
+
+def test_moon_nakshatra_changes_are_all_found():
+    """The Moon changes nakshatra about once a day; none are skipped"""
+    events = find_transit_events(
+        START_JD, START_JD + 27.3, planets=['Moon'], event_types=['nakshatra']
+    )
+
+    assert len(events) in (27, 28)
+    names = [e['to_nakshatra'] for e in events]
+    for previous, event in zip(events, events[1:]):
+        assert event['from_nakshatra'] == previous['to_nakshatra']
+    assert len(set(names)) == 27
+
+
+def test_stations_have_zero_speed():
+    """Mercury stations come in retrograde/direct pairs at zero speed"""
+    events = find_transit_events(
+        START_JD, START_JD + 365, planets=['Mercury'], event_types=['station']
+    )
+
+    assert len(events) >= 6
+    assert [e['direction'] for e in events[:2]] == ['retrograde', 'direct']
+    for event in events:
+        speed = calculator.calc_planetary_positions(event['jd'])['Mercury']['speed']
+        assert abs(speed) < 1e-4
+
+
+def test_exact_aspects_to_natal_point():
+    """Exact aspects fall at the requested separation from the natal point"""
+    natal_moon = 35.1
+    events = find_transit_events(
+        START_JD, START_JD + 60,
+        natal_points={'Moon': natal_moon},
+        planets=['Sun'],
+        event_types=['aspect']
+    )
+
+    assert {e['aspect_type'] for e in events} <= {'square', 'trine', 'sextile', 'conjunction', 'opposition'}
+    for event in events:
+        separation = (_longitude('Sun', event['jd']) - natal_moon) % 360
+        assert min(abs(separation - angle) for angle in (0, 60, 90, 120, 180, 240, 270, 300, 360)) < 1e-3
+
+
+def test_rejects_unknown_filters():
+    """Unknown planets or event types raise ValueError"""
+    with pytest.raises(ValueError):
+        find_transit_events(START_JD, START_JD + 10, planets=['Pluto'])
+    with pytest.raises(ValueError):
+        find_transit_events(START_JD, START_JD + 10, event_types=['eclipse'])
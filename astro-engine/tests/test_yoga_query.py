@@ -0,0 +1,47 @@
+"""
+Tests for memoized yoga detection and filtering
+"""
+
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chart_builder import build_chart
+from core.yoga_query import chart_fingerprint, detect_yogas_cached, filter_yogas, summarize_yogas
+from core.yoga_rules import detect_yogas
+from tests.test_yoga_rules import PRABHAT_BIRTH_DATA, _move_planet
+
+
+def test_fingerprint_tracks_yoga_inputs():
+    """The fingerprint ignores the name but changes when a planet moves"""
+    chart = build_chart(PRABHAT_BIRTH_DATA)
+    renamed = chart.model_copy(update={
+        'birth_info': PRABHAT_BIRTH_DATA.model_copy(update={'name': 'Someone else'})
+    })
+
+    assert chart_fingerprint(chart) == chart_fingerprint(renamed)
+    assert chart_fingerprint(chart) != chart_fingerprint(_move_planet(chart, 'Moon', 200.0))
+
+
+def test_cached_detection_is_reused():
+    """A second lookup returns the memoized list"""
+    chart = build_chart(PRABHAT_BIRTH_DATA)
+
+    first = detect_yogas_cached(chart)
+    assert first == detect_yogas(chart)
+    assert detect_yogas_cached(chart.model_copy()) is first
+
+
+def test_filters_compose():
+    """Filters combine with AND; planets/houses match any involved"""
+    yogas = detect_yogas(build_chart(PRABHAT_BIRTH_DATA))
+
+    benefic_moon = filter_yogas(yogas, benefic=True, planets=['Moon'])
+    assert benefic_moon == [y for y in yogas if y.benefic and 'Moon' in y.planets_involved]
+    assert filter_yogas(yogas, types=['no_such_type']) == []
+
+    summary = summarize_yogas(yogas, group_by='benefic')
+    assert summary['counts']['benefic'] == len(summary['groups'].get('benefic', []))
+    assert summary['counts']['malefic'] == len(summary['groups'].get('malefic', []))
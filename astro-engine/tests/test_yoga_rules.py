@@ -0,0 +1,74 @@
+"""
+Tests for the yoga rule registry and incremental detection
+"""
+
+import sys
+import os
+from datetime import date, time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import calculator
+from core.chart_builder import build_chart
+from core.yoga_rules import YOGA_RULES, YogaDetector, detect_yogas
+from schemas.birth_data import BirthData
+
+
+PRABHAT_BIRTH_DATA = BirthData(
+    name="Prabhat Tiwari",
+    birth_date=date(1994, 2, 18),
+    birth_time=time(23, 7, 0),
+    latitude=21.14,
+    longitude=81.38,
+    timezone="Asia/Kolkata"
+)
+
+
+def _move_planet(chart, planet_name, longitude):
+    """Copy of chart with one planet moved (as a transit overlay would)"""
+    lagna = chart.lagna.longitude
+    planets = [
+        p.model_copy(update={
+            'longitude': longitude,
+            'sign': calculator.get_sign_from_longitude(longitude),
+            'sign_lord': calculator.SIGN_LORDS[calculator.get_sign_from_longitude(longitude)],
+            'house': calculator.get_planet_house(longitude, lagna),
+            'dignity': calculator.get_planet_dignity(planet_name, longitude),
+        }) if p.name == planet_name else p
+        for p in chart.planets
+    ]
+    return chart.model_copy(update={'planets': planets})
+
+
+def test_rule_names_are_unique():
+    """Every registered rule has a distinct name and declared dependencies"""
+    names = [rule.name for rule in YOGA_RULES]
+    assert len(names) == len(set(names))
+    assert all(rule.depends for rule in YOGA_RULES)
+
+
+def test_update_matches_full_detection():
+    """Re-detecting after moving one planet equals detecting from scratch"""
+    chart = build_chart(PRABHAT_BIRTH_DATA)
+    detector = YogaDetector(chart)
+    detector.detect_all()
+
+    for planet_name, longitude in [('Jupiter', 40.0), ('Moon', 200.0), ('Venus', 355.0)]:
+        moved = _move_planet(chart, planet_name, longitude)
+        evaluated_before = detector.rules_evaluated
+
+        assert detector.update(moved) == detect_yogas(moved)
+        assert detector.rules_evaluated - evaluated_before < len(YOGA_RULES)
+
+        chart = moved
+
+
+def test_update_with_unchanged_chart_runs_no_rules():
+    """An identical chart re-uses every cached rule result"""
+    chart = build_chart(PRABHAT_BIRTH_DATA)
+    detector = YogaDetector(chart)
+    yogas = detector.detect_all()
+
+    assert detector.update(chart.model_copy()) == yogas
+    assert detector.rules_evaluated == len(YOGA_RULES)